@@ -0,0 +1,115 @@
+"""
+Request throughput of SKYAPIClient against a local mock server, by connection pool
+size, for sizing pool_maxsize to the number of worker threads.
+
+Threads that find the pool empty open a connection of their own, which is closed
+after the request instead of being kept, so an undersized pool shows up as
+connections being opened over and over. The mock server delays new connections by
+--connect-latency to stand in for the TCP and TLS handshakes with the SKY API.
+
+    python benchmarks/bench_pool_size.py [--workers N] [--requests N] [--latency S]
+        [--connect-latency S] [--sizes N [N ...]]
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from blackbaud.authentication.managers import MemoryCredentialManager
+from blackbaud.client import SKYAPIClient
+
+# The mock server speaks plain HTTP.
+os.environ.setdefault("OAUTHLIB_INSECURE_TRANSPORT", "1")
+
+BODY = b'{"count": 1, "value": [{"id": 1, "name": "Upper School"}]}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+    connect_latency = 0.05
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+        time.sleep(self.connect_latency)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _client(pool_maxsize: int) -> SKYAPIClient:
+    credential_manager = MemoryCredentialManager()
+    credential_manager.update_token(
+        {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+    )
+    return SKYAPIClient(
+        "client id",
+        "client secret",
+        "subscription key",
+        "http://localhost/callback",
+        credential_manager=credential_manager,
+        token_refresh_disabled=True,
+        # Only the connection pool should hold requests back.
+        rate_limits=(),
+        cache_backend="memory",
+        cache_default_expiry=0,
+        coalesce_requests=False,
+        pool_maxsize=pool_maxsize,
+    )
+
+
+def _run(url: str, pool_maxsize: int, workers: int, requests: int) -> tuple:
+    client = _client(pool_maxsize)
+    _Handler.connections = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(lambda n: client.request("GET", url), range(requests)))
+    return requests / (time.perf_counter() - started), _Handler.connections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=800)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20, 40, 80]
+    )
+    args = parser.parse_args()
+
+    _Handler.latency = args.latency
+    _Handler.connect_latency = args.connect_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/school/v1/levels"
+
+    print(
+        f"{args.workers} workers, {args.requests} requests, "
+        f"{args.latency * 1000:.0f}ms server latency, "
+        f"{args.connect_latency * 1000:.0f}ms to connect\n"
+    )
+    print(f"{'pool_maxsize':>12}{'requests/s':>14}{'connections':>14}")
+    for size in args.sizes:
+        throughput, connections = _run(url, size, args.workers, args.requests)
+        print(f"{size:>12}{throughput:>14.0f}{connections:>14}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Encode and decode throughput of the JSON codec on SKY API sized payloads, with the
+standard library and with orjson (if it is installed).
+
+    python benchmarks/bench_serialization.py [--repeat N]
+"""
+import argparse
+import json
+import random
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from blackbaud.client import serialization
+
+random.seed(0)
+
+FIRST_NAMES = ["Ava", "Liam", "Noah", "Émilie", "Zoë", "Mateo", "Chloé", "Arjun"]
+LAST_NAMES = ["Tremblay", "Gagnon", "Roy", "Côté", "Bouchard", "Singh", "Nguyen"]
+
+
+def users_extended_page(count: int = 1000) -> dict:
+    """
+    A page of users/extended, about 0.6 MB.
+    """
+    users = []
+    for user_id in range(1, count + 1):
+        first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+        users.append(
+            {
+                "id": 3000000 + user_id,
+                "first_name": first,
+                "last_name": last,
+                "preferred_name": first,
+                "email": f"{first}.{last}{user_id}@example.org".lower(),
+                "birth_date": f"{random.randint(2005, 2015)}-0{random.randint(1, 9)}"
+                f"-1{random.randint(0, 9)}T00:00:00+00:00",
+                "deceased": False,
+                "gender": random.choice(["M", "F", "X"]),
+                "host_id": f"S{user_id:06}",
+                "lost": False,
+                "roles": [
+                    {"id": 14, "name": "Student"},
+                    {"id": 40, "name": "Athlete"},
+                ],
+                "student_info": {
+                    "grade_level": f"Grade {random.randint(1, 12)}",
+                    "grad_year": str(random.randint(2025, 2036)),
+                    "student_id": f"S{user_id:06}",
+                },
+                "phones": [
+                    {
+                        "id": user_id,
+                        "number": f"(604) 555-{user_id % 10000:04}",
+                        "type": "Cell",
+                        "primary": True,
+                    }
+                ],
+                "addresses": [
+                    {
+                        "id": user_id,
+                        "line_one": f"{user_id} Main St",
+                        "city": "Vancouver",
+                        "state": "BC",
+                        "postal_code": "V6B 1A1",
+                        "country": "Canada",
+                        "type": "Home",
+                        "shared": True,
+                    }
+                ],
+            }
+        )
+    return {"count": count, "next_link": None, "value": users}
+
+
+def advanced_list_page(count: int = 1000) -> dict:
+    """
+    A page of an advanced list with twelve columns per row.
+    """
+    rows = []
+    for user_id in range(1, count + 1):
+        rows.append(
+            {
+                "columns": [
+                    {"name": "user_id", "value": str(3000000 + user_id)},
+                    {"name": "first_name", "value": random.choice(FIRST_NAMES)},
+                    {"name": "last_name", "value": random.choice(LAST_NAMES)},
+                    {"name": "grad_year", "value": str(random.randint(2025, 2036))},
+                    {"name": "section_id", "value": str(random.randint(1, 900))},
+                    {"name": "course", "value": "Mathematics 10"},
+                    {"name": "teacher", "value": random.choice(LAST_NAMES)},
+                    {"name": "room", "value": f"B{random.randint(100, 250)}"},
+                    {"name": "block", "value": random.choice("ABCDEFGH")},
+                    {"name": "term", "value": "Semester 1"},
+                    {"name": "grade", "value": str(random.randint(50, 100))},
+                    {"name": "enrolled", "value": "2023-09-05T00:00:00"},
+                ]
+            }
+        )
+    return {"count": count, "page": 1, "results": {"rows": rows}}
+
+
+def user_bodies(count: int = 1000) -> list:
+    """
+    Request bodies like the ones sent by create_user and update_user, with the
+    date, datetime and Decimal values callers pass in.
+    """
+    birth_date = datetime(2010, 1, 1)
+    return [
+        {
+            "first_name": random.choice(FIRST_NAMES),
+            "last_name": random.choice(LAST_NAMES),
+            "birth_date": birth_date + timedelta(days=user_id),
+            "enroll_date": date(2023, 9, 5),
+            "tuition_balance": Decimal("1234.50"),
+            "custom_field_one": f"value {user_id}",
+        }
+        for user_id in range(count)
+    ]
+
+
+def _stdlib_dumps(value):
+    return json.dumps(
+        value, default=serialization._default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _codecs():
+    codecs = {"json": (_stdlib_dumps, json.loads)}
+    if serialization.orjson is not None:
+        codecs["orjson"] = (serialization.dumps, serialization.loads)
+    return codecs
+
+
+def _measure(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "users/extended page": users_extended_page(),
+        "advanced list page": advanced_list_page(),
+        "user request bodies": user_bodies(),
+    }
+    codecs = _codecs()
+    if "orjson" not in codecs:
+        print("orjson is not installed, only measuring the standard library.\n")
+
+    print(f"{'payload':<22}{'codec':<8}{'size':>10}{'encode':>14}{'decode':>14}")
+    for name, payload in payloads.items():
+        for codec, (dumps, loads) in codecs.items():
+            encoded = dumps(payload)
+            megabytes = len(encoded) / 1e6
+            encode = _measure(lambda: dumps(payload), args.repeat)
+            decode = _measure(lambda: loads(encoded), args.repeat)
+            print(
+                f"{name:<22}{codec:<8}{megabytes:>8.2f}MB"
+                f"{megabytes / encode:>10.0f}MB/s{megabytes / decode:>10.0f}MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
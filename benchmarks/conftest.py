@@ -0,0 +1,54 @@
+"""
+Fixtures for the pytest-benchmark suite. Requests are served in-process by a
+MockTransport, so the timings are of the client and not of a network.
+"""
+import pytest
+
+from blackbaud.authentication.managers import MemoryCredentialManager
+from blackbaud.client import BaseSolutionClient, SKYAPIClient
+from blackbaud.testing import MockSKYAPI, MockTransport, SchoolData
+
+STUDENTS = 2000
+
+
+@pytest.fixture(scope="session")
+def api() -> MockSKYAPI:
+    return MockSKYAPI(SchoolData(students=STUDENTS))
+
+
+@pytest.fixture
+def make_client(api, tmp_path):
+    """
+    Make a client served by the mock. Rate limits are off and responses are cached
+    in memory unless the arguments say otherwise.
+    """
+
+    def make(**kwargs) -> SKYAPIClient:
+        credential_manager = MemoryCredentialManager()
+        credential_manager.update_token(
+            {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+        )
+        kwargs.setdefault("rate_limits", ())
+        kwargs.setdefault("cache_backend", "memory")
+        kwargs.setdefault("cache_name", str(tmp_path / "cache"))
+        kwargs.setdefault("adapter", MockTransport(api))
+        return SKYAPIClient(
+            "client id",
+            "client secret",
+            "subscription key",
+            "http://localhost/callback",
+            credential_manager=credential_manager,
+            token_refresh_disabled=True,
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def uncached_school(make_client) -> BaseSolutionClient:
+    """
+    A school client that stores nothing in its cache, so that every request goes
+    to the mock.
+    """
+    return BaseSolutionClient(make_client(cache_default_expiry=0), "school", "v1")
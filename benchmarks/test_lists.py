@@ -0,0 +1,48 @@
+"""
+Speed and memory of turning advanced list rows into dicts and into ListRow
+objects.
+"""
+import tracemalloc
+
+import pytest
+
+from blackbaud.client import ListRow, serialization
+from blackbaud.client.resources import BlackbaudPage
+from blackbaud.client.streaming import LIST_ROW_ITEMS
+from blackbaud.school.endpoints import core
+
+
+@pytest.fixture
+def advanced_list(uncached_school) -> dict:
+    return core.get_full_list_contents(uncached_school, 1)
+
+
+def _peak_memory(func, *args) -> int:
+    """
+    The most memory func allocated at once, in bytes, including its result.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_convert_advanced_list_to_dicts(benchmark, advanced_list):
+    rows = benchmark(core.convert_advanced_list_to_dicts, advanced_list)
+    benchmark.extra_info["rows"] = len(rows)
+    benchmark.extra_info["peak_bytes"] = _peak_memory(
+        core.convert_advanced_list_to_dicts, advanced_list
+    )
+
+
+def test_list_rows(benchmark, advanced_list):
+    text = serialization.dumps(advanced_list)
+
+    def load() -> list:
+        return list(BlackbaudPage("lists/advanced/1", text, ListRow, LIST_ROW_ITEMS))
+
+    rows = benchmark(load)
+    benchmark.extra_info["rows"] = len(rows)
+    benchmark.extra_info["peak_bytes"] = _peak_memory(load)
@@ -0,0 +1,37 @@
+"""
+Throughput of fetching every page of next_link, marker and list page paginated
+endpoints.
+"""
+from blackbaud.client import BlackbaudCollection, User
+from blackbaud.school.endpoints import core, users
+
+from conftest import STUDENTS
+
+STUDENT_ROLE = 14
+
+
+def test_paginated_response(benchmark, uncached_school):
+    response = benchmark(users.get_users_by_roles, uncached_school, [STUDENT_ROLE])
+    assert response.full_json["count"] == STUDENTS
+    benchmark.extra_info["items"] = STUDENTS
+    benchmark.extra_info["pages"] = len(response.pages)
+
+
+def test_marker_collection(benchmark, uncached_school):
+    def iterate() -> int:
+        students = BlackbaudCollection(
+            users.get_users_by_roles_detailed.__wrapped__,
+            uncached_school,
+            [STUDENT_ROLE],
+            paging="marker",
+            item_type=User,
+        )
+        return sum(1 for _ in students)
+
+    assert benchmark(iterate) == STUDENTS
+    benchmark.extra_info["items"] = STUDENTS
+
+
+def test_get_full_list_contents(benchmark, uncached_school):
+    advanced_list = benchmark(core.get_full_list_contents, uncached_school, 1)
+    benchmark.extra_info["items"] = advanced_list["count"]
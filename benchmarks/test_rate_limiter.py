@@ -0,0 +1,49 @@
+"""
+The cost of taking a rate limit slot, alone and with several threads contending
+for the limiter.
+"""
+import itertools
+import threading
+
+import pytest
+from limits import parse_many
+
+THREADS = 8
+SLOTS_PER_THREAD = 200
+
+# Generous enough that no request waits, so only the bookkeeping is measured.
+LIMITS = "100000/second"
+
+_keys = itertools.count()
+
+
+def _client(make_client):
+    # A subscription key of its own, so that earlier rounds do not fill its window.
+    client = make_client(rate_limits=parse_many(LIMITS))
+    client._subscription_key = f"benchmark-{next(_keys)}"
+    return client
+
+
+def test_take_slot(benchmark, make_client):
+    client = _client(make_client)
+    benchmark(client._wait_for_rate_limits)
+
+
+@pytest.mark.parametrize("threads", [1, THREADS])
+def test_take_slots_under_contention(benchmark, make_client, threads):
+    def setup():
+        return (_client(make_client),), {}
+
+    def take_slots(client) -> None:
+        def worker():
+            for _ in range(SLOTS_PER_THREAD):
+                client._wait_for_rate_limits()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for worker_thread in workers:
+            worker_thread.start()
+        for worker_thread in workers:
+            worker_thread.join()
+
+    benchmark.pedantic(take_slots, setup=setup, rounds=5)
+    benchmark.extra_info["slots"] = threads * SLOTS_PER_THREAD
@@ -0,0 +1,38 @@
+"""
+A workload recorded against the mock server and served back by ReplayTransport, so
+that every run sees the same requests and responses.
+"""
+import pytest
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.school.endpoints import core, users
+from blackbaud.testing import MockSKYAPI, RecordingTransport, ReplayTransport
+
+
+def _sync(school: BaseSolutionClient) -> int:
+    students = users.get_users_by_roles(school, [14]).full_json["count"]
+    rows = core.convert_advanced_list_to_dicts(core.get_full_list_contents(school, 1))
+    return students + len(rows)
+
+
+@pytest.fixture
+def recording(api, make_client, tmp_path) -> tuple:
+    path = str(tmp_path / "sync.jsonl.gz")
+    transport = RecordingTransport(path)
+    with MockSKYAPI(api.data) as server:
+        # The replayed requests have to go to the same URLs as the recorded ones.
+        client_kwargs = server.client_kwargs()
+        client = make_client(adapter=transport, **client_kwargs)
+        _sync(BaseSolutionClient(client, "school", "v1"))
+    transport.close()
+    return path, client_kwargs
+
+
+def test_replay(benchmark, make_client, recording):
+    def replay() -> int:
+        # A new client each round, so that nothing is served from its cache.
+        path, client_kwargs = recording
+        client = make_client(adapter=ReplayTransport(path, speed=None), **client_kwargs)
+        return _sync(BaseSolutionClient(client, "school", "v1"))
+
+    benchmark.extra_info["items"] = benchmark(replay)
@@ -0,0 +1,44 @@
+"""
+The overhead SKYAPIClient.request adds to each request, and cache hit and miss
+latency per cache backend.
+"""
+import itertools
+
+import pytest
+
+from blackbaud.client import MetricsCollector
+from blackbaud.client.settings import BASE_URL
+
+URL = f"{BASE_URL}/school/v1/levels"
+BACKENDS = ["memory", "sqlite", "filesystem"]
+
+
+def test_uncached_request(benchmark, make_client):
+    client = make_client(cache_default_expiry=0)
+    response = benchmark(client.request, "GET", URL)
+    assert response.status_code == 200
+
+
+def test_uncached_request_with_metrics(benchmark, make_client):
+    client = make_client(cache_default_expiry=0)
+    MetricsCollector().register(client.hooks)
+    benchmark(client.request, "GET", URL)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_cache_hit(benchmark, make_client, backend):
+    client = make_client(cache_backend=backend)
+    client.request("GET", URL)
+    response = benchmark(client.request, "GET", URL)
+    assert response.from_cache
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_cache_miss(benchmark, make_client, backend):
+    client = make_client(cache_backend=backend)
+    # A new query string every time, so that every request misses and is stored.
+    counter = itertools.count()
+    response = benchmark(
+        lambda: client.request("GET", URL, params={"n": next(counter)})
+    )
+    assert not response.from_cache
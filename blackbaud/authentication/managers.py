@@ -1,3 +1,5 @@
+import json
+import os
 from oauthlib.oauth2 import OAuth2Token
 from typing import Optional
 
@@ -26,3 +28,40 @@ class MemoryCredentialManager(object):
         Get the token. Should return None if no token is available.
         """
         return self._token
+
+
+class FileCredentialManager(object):
+    """
+    Credential manager that stores credentials in a JSON file.
+
+    The file is read again every time the token is requested, so several processes
+    pointed at the same file (for instance the workers of a ShardedRunner) all see a
+    token as soon as any one of them persists it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize with the path of the file, which does not have to exist yet.
+        """
+        self._path = path
+
+    def update_token(self, token: OAuth2Token) -> None:
+        """
+        Persist new credentials after a refresh. The file is replaced atomically so
+        readers never see a partially written token.
+        """
+        temporary_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(dict(token), f)
+        os.replace(temporary_path, self._path)
+
+    @property
+    def token(self) -> Optional[OAuth2Token]:
+        """
+        Get the token. Returns None if no token has been persisted yet.
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return OAuth2Token(json.load(f))
+        except FileNotFoundError:
+            return None
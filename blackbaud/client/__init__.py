@@ -1,3 +1,43 @@
-from .client import SKYAPIClient, BaseSolutionClient, paginated_response
+from .client import (
+    SKYAPIClient,
+    BaseSolutionClient,
+    collection_values,
+    iterate_marker_pages,
+    paginated_response,
+)
+from .circuit_breaker import CircuitBreaker
+from .concurrency import AdaptiveConcurrencyLimiter
+from .hooks import Hooks
+from .metrics import MetricsCollector
+from .quota import QuotaTracker
+from .resources import (
+    BlackbaudCollection,
+    BlackbaudList,
+    BlackbaudObject,
+    BlackbaudPage,
+    Enrollment,
+    ListRow,
+    Section,
+    User,
+)
 
-__all__ = ["SKYAPIClient", "BaseSolutionClient", "paginated_response"]
+__all__ = [
+    "SKYAPIClient",
+    "BaseSolutionClient",
+    "collection_values",
+    "iterate_marker_pages",
+    "paginated_response",
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "Hooks",
+    "MetricsCollector",
+    "QuotaTracker",
+    "BlackbaudCollection",
+    "BlackbaudList",
+    "BlackbaudObject",
+    "BlackbaudPage",
+    "Enrollment",
+    "ListRow",
+    "Section",
+    "User",
+]
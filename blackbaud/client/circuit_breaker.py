@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from blackbaud.client.hooks import endpoint_template
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "opened_at", "probes", "probe_successes")
+
+    def __init__(self, window_size: int):
+        self.state = CLOSED
+        # True for each recent success, False for each recent failure.
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a host, or to one of its endpoints, while it is
+    failing, so that callers fail fast instead of each waiting for a timeout.
+
+    Every request counts towards two circuits: one for its host and one for its
+    endpoint template (e.g. "school/v1/users/{id}"). A circuit opens once at least
+    minimum_requests of its last window_size requests have completed and
+    failure_threshold of them failed, i.e. got a 5xx response, a connection error or
+    a timeout. A 429 is left to the rate limiter and does not count either way.
+
+    While a circuit is open its requests are not sent: SKYAPIClient serves them from
+    the cache if there is a response for them, even an expired one, or raises
+    CircuitOpenError. After reset_timeout seconds the circuit is half open and lets
+    up to half_open_probes requests through; once that many succeed it closes again,
+    and if one fails it opens for another reset_timeout.
+
+    :param failure_threshold: The share of failed requests that opens a circuit.
+    :param minimum_requests: How many requests a circuit needs to have seen before
+        it can open.
+    :param window_size: How many of the most recent requests the failure share is
+        worked out over.
+    :param reset_timeout: How many seconds a circuit stays open before it is probed.
+    :param half_open_probes: How many requests probe a half-open circuit, and how
+        many of them have to succeed for it to close.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        minimum_requests: int = 10,
+        window_size: int = 20,
+        reset_timeout: float = 15.0,
+        half_open_probes: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.minimum_requests = minimum_requests
+        self.window_size = window_size
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def circuit_names(url: str) -> Tuple[str, str]:
+        """
+        The names of the circuits a URL belongs to: its host, and its host and
+        endpoint template.
+        """
+        host = urlsplit(url).netloc
+        return host, f"{host}/{endpoint_template(url)}"
+
+    def _get(self, names: Iterable[str]) -> List[_Circuit]:
+        circuits = []
+        for name in names:
+            circuit = self._circuits.get(name)
+            if circuit is None:
+                circuit = self._circuits[name] = _Circuit(self.window_size)
+            circuits.append(circuit)
+        return circuits
+
+    def _can_pass(self, circuit: _Circuit, now: float) -> bool:
+        if circuit.state == OPEN and now - circuit.opened_at >= self.reset_timeout:
+            circuit.state = HALF_OPEN
+            circuit.probes = circuit.probe_successes = 0
+        if circuit.state == OPEN:
+            return False
+        if circuit.state == HALF_OPEN:
+            return circuit.probes < self.half_open_probes - circuit.probe_successes
+        return True
+
+    def allow(self, url: str) -> bool:
+        """
+        Whether a request to url may be sent now. A request that is allowed has to
+        be followed by a call to record once it completes.
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuits = self._get(self.circuit_names(url))
+            if not all([self._can_pass(circuit, now) for circuit in circuits]):
+                return False
+            for circuit in circuits:
+                if circuit.state == HALF_OPEN:
+                    circuit.probes += 1
+            return True
+
+    def record(self, url: str, success: Optional[bool]) -> None:
+        """
+        Count the outcome of a request that was allowed: True if it succeeded, False
+        if it failed, or None if it says nothing about the health of the API (e.g.
+        it was served from the cache).
+        """
+        now = time.monotonic()
+        with self._lock:
+            for circuit in self._get(self.circuit_names(url)):
+                if circuit.state == HALF_OPEN:
+                    circuit.probes = max(circuit.probes - 1, 0)
+                    if success is False:
+                        self._open(circuit, now)
+                    elif success:
+                        circuit.probe_successes += 1
+                        if circuit.probe_successes >= self.half_open_probes:
+                            circuit.state = CLOSED
+                            circuit.outcomes.clear()
+                elif circuit.state == CLOSED and success is not None:
+                    circuit.outcomes.append(success)
+                    completed = len(circuit.outcomes)
+                    failures = completed - sum(circuit.outcomes)
+                    if (
+                        not success
+                        and completed >= self.minimum_requests
+                        and failures >= self.failure_threshold * completed
+                    ):
+                        self._open(circuit, now)
+                # Requests still completing after a circuit opened are ignored.
+
+    def _open(self, circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+
+    def retry_after(self, url: str) -> float:
+        """
+        How many seconds until the circuits of url let a probe through, or 0 if
+        they are not open.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return max(
+                [
+                    self.reset_timeout - (now - circuit.opened_at)
+                    for circuit in self._get(self.circuit_names(url))
+                    if circuit.state == OPEN
+                ],
+                default=0.0,
+            )
+
+    def states(self) -> Dict[str, str]:
+        """
+        The state of every circuit, by name.
+        """
+        with self._lock:
+            return {name: circuit.state for name, circuit in self._circuits.items()}
@@ -1,19 +1,59 @@
+import copy
+import functools
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Any, Iterable, Literal, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
 from limits import RateLimitItem
 from limits.strategies import MovingWindowRateLimiter, RateLimiter
 from requests_cache.backends import BackendSpecifier
-from oauthlib.oauth2 import TokenExpiredError
+from oauthlib.oauth2 import OAuth2Token, TokenExpiredError
 
+from blackbaud.authentication.exceptions import CredentialsNotRefreshableError
 from blackbaud.authentication.managers import MemoryCredentialManager
 from blackbaud.authentication.protocols import CredentialManager
 from blackbaud.authentication.settings import AUTHORIZATION_URL, TOKEN_URL
+from blackbaud.client.circuit_breaker import CircuitBreaker
+from blackbaud.client.concurrency import AdaptiveConcurrencyLimiter, SingleFlight
+from blackbaud.client.exceptions import CircuitOpenError
+from blackbaud.client.hooks import (
+    AFTER_RESPONSE,
+    BEFORE_REQUEST,
+    ON_CACHE_HIT,
+    ON_CIRCUIT_OPEN,
+    ON_CONCURRENCY_LIMIT_CHANGE,
+    ON_RATE_LIMIT_WAIT,
+    ON_RETRY,
+    ON_TOKEN_REFRESH,
+    Hooks,
+    endpoint_template,
+)
 from blackbaud.client.rate_limiters.default import DEFAULT_STORAGE, STANDARD_TIER
+from blackbaud.client.serialization import response_json
 from blackbaud.client.session import CachedOAuth2Session
-from blackbaud.client.settings import BASE_URL
+from blackbaud.client.quota import QuotaTracker
+from blackbaud.client.rate_limiters.lanes import PriorityLanes
+from blackbaud.client.settings import (
+    BASE_URL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    PRIORITY_INTERACTIVE,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -29,16 +69,28 @@ class SKYAPIClient:
             redirect_uri=self._redirect_uri,
             token=self._credential_manager.token,
             state=self._state,
-            auto_refresh_url=TOKEN_URL if not self._token_refresh_disabled else None,
+            auto_refresh_url=(
+                self._token_url if not self._token_refresh_disabled else None
+            ),
             auto_refresh_kwargs={
                 "client_id": self._client_id,
                 "client_secret": self._client_secret,
             } if not self._token_refresh_disabled else None,
-            token_updater=self._credential_manager.update_token,
+            token_updater=self._update_refreshed_token,
             cache_name=self._cache_name,
             backend=self._cache_backend,
             expire_after=self._cache_default_expiry,
         )
+        adapter = self._adapter
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+            )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not self._keep_alive:
+            self._session.headers["Connection"] = "close"
         if not self._token_refresh_disabled:
             self._state = str(self._session.new_state())
             self._authorization_url, _ = self._session.authorization_url(
@@ -69,6 +121,22 @@ class SKYAPIClient:
             hours=1
         ),
         token_refresh_disabled: bool = False,
+        hooks: Optional[Hooks] = None,
+        quota_tracker: Optional[QuotaTracker] = None,
+        priority_lanes: Optional[PriorityLanes] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        coalesce_requests: bool = True,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: Union[None, float, Tuple[float, float]] = (
+            DEFAULT_CONNECT_TIMEOUT,
+            DEFAULT_READ_TIMEOUT,
+        ),
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        base_url: str = BASE_URL,
+        token_url: str = TOKEN_URL,
+        adapter: Optional[BaseAdapter] = None,
     ):
         """
         Construct a new SKY API Client object.
@@ -97,6 +165,47 @@ class SKYAPIClient:
         :param authorization_response: A post-authorization redirect URL containing
         the authorization code. This can be used to skip the authorization step.
         :type authorization_response: str, optional
+        :param hooks: Callbacks for the events of the request lifecycle, e.g. to
+        collect metrics. Defaults to an empty set of hooks, available as .hooks.
+        :type hooks: Hooks, optional
+        :param quota_tracker: Counts requests against the daily quota, by the tag
+        passed to each request, and holds back requests that are not interactive
+        (priority=PRIORITY_BATCH) once only its reserve is left.
+        :type quota_tracker: QuotaTracker, optional
+        :param priority_lanes: Decides which waiting request gets the next free rate
+        limit slot, favouring interactive requests over batch ones. Defaults to a
+        PriorityLanes of the client's own.
+        :type priority_lanes: PriorityLanes, optional
+        :param concurrency_limiter: Caps the number of requests in flight at once,
+        adapting the cap to the latency and errors of the responses.
+        :type concurrency_limiter: AdaptiveConcurrencyLimiter, optional
+        :param coalesce_requests: Whether identical GET requests made while one of
+        them is in flight should share its response instead of being sent again.
+        :type coalesce_requests: bool, optional
+        :param circuit_breaker: Stops sending requests to a host or endpoint that
+        keeps failing, serving them from the cache, even if expired, or raising
+        CircuitOpenError until it recovers.
+        :type circuit_breaker: CircuitBreaker, optional
+        :param timeout: The default timeout of requests in seconds, as a single number
+        or a (connect, read) tuple. None waits forever. Can be overridden per request
+        with the timeout request kwarg.
+        :type timeout: float or tuple, optional
+        :param pool_connections: The number of hosts to keep connection pools for.
+        :type pool_connections: int, optional
+        :param pool_maxsize: The number of connections to keep open per host. Should
+        be at least the number of threads making requests at once.
+        :type pool_maxsize: int, optional
+        :param keep_alive: Whether to reuse connections between requests.
+        :type keep_alive: bool, optional
+        :param base_url: The root URL of the SKY API, e.g. to use a local mock
+        server instead.
+        :type base_url: str, optional
+        :param token_url: The URL of the OAuth token endpoint.
+        :type token_url: str, optional
+        :param adapter: The transport adapter to send requests with, e.g. to serve
+        them in-process in tests. Replaces the pooled HTTPAdapter, so the pool
+        options are not used.
+        :type adapter: requests.adapters.BaseAdapter, optional
 
         """
         self._client_id = client_id
@@ -114,6 +223,22 @@ class SKYAPIClient:
         self._cache_backend = cache_backend
         self._cache_default_expiry = cache_default_expiry
         self._token_refresh_disabled = token_refresh_disabled
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.quota_tracker = quota_tracker
+        self.priority_lanes = (
+            priority_lanes if priority_lanes is not None else PriorityLanes()
+        )
+        self.concurrency_limiter = concurrency_limiter
+        self._coalesce_requests = coalesce_requests
+        self._in_flight_gets = SingleFlight()
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
+        self.base_url = base_url.rstrip("/")
+        self._token_url = token_url
+        self._adapter = adapter
 
         has_token = self._credential_manager.token is not None
         has_auth_code = bool(authorization_code or authorization_response)
@@ -132,21 +257,17 @@ class SKYAPIClient:
 
         if has_token:
             if not self._token_refresh_disabled:
-                self._credential_manager.update_token(
-                    self._session.refresh_token(
-                        token_url=TOKEN_URL,
-                        refresh_token=self._credential_manager.token["refresh_token"],
-                    )
-                )
+                self.refresh_token()
         elif has_auth_code:
             # Initial authorization_code -> token exchange is a *fetch*, not a *refresh*,
             # so it is allowed regardless of token_refresh_disabled.
             self._credential_manager.update_token(
                 self._session.fetch_token(
-                    TOKEN_URL,
+                    self._token_url,
                     code=authorization_code,
                     authorization_response=authorization_response,
                     client_secret=self._client_secret,
+                    timeout=self.timeout,
                 )
             )
 
@@ -164,13 +285,43 @@ class SKYAPIClient:
             raise ValueError("Either a code or an authorization response is required.")
 
         token = self._session.fetch_token(
-            TOKEN_URL,
+            self._token_url,
             code=code,
             authorization_response=authorization_response,
             client_secret=self._client_secret,
+            timeout=self.timeout,
         )
         self._credential_manager.update_token(token)
 
+    def refresh_token(self) -> None:
+        """
+        Exchange the current refresh token for a new token, and persist it using the
+        credential manager.
+        """
+        if self._token_refresh_disabled:
+            raise CredentialsNotRefreshableError(
+                "This client was created with token_refresh_disabled=True."
+            )
+
+        self._update_refreshed_token(
+            self._session.refresh_token(
+                token_url=self._token_url,
+                refresh_token=self._credential_manager.token["refresh_token"],
+                timeout=self.timeout,
+            )
+        )
+
+    def _update_refreshed_token(self, token: OAuth2Token) -> None:
+        self._credential_manager.update_token(token)
+        self.hooks.emit(ON_TOKEN_REFRESH, token=token)
+
+    def uncache(self, *urls: str) -> None:
+        """
+        Drop the cached GET responses for urls, e.g. once a write has made them out
+        of date.
+        """
+        self._session.cache.delete(urls=urls)
+
     def request(
         self,
         method: str,
@@ -191,9 +342,18 @@ class SKYAPIClient:
         :type data: dict, optional
         :param headers: The headers to send with the request.
         :type headers: dict, optional
+        :param priority: PRIORITY_INTERACTIVE (the default) or PRIORITY_BATCH, for
+        requests that can be held back in favour of interactive ones.
+        :type priority: str, optional
+        :param tag: A name for the caller, which the quota tracker counts usage by.
+        :type tag: str, optional
         :return: The response from the SKY API.
         :rtype: dict
         """
+        priority = kwargs.pop("priority", PRIORITY_INTERACTIVE)
+        tag = kwargs.pop("tag", None)
+        kwargs.setdefault("timeout", self.timeout)
+
         if headers is None:
             headers = {}
 
@@ -204,13 +364,223 @@ class SKYAPIClient:
             }
         )
 
-        # if this request is not cached, then we need to rate limit it
-        if not self._session.cache.contains(
-            request=requests.Request(method, url, headers=headers, data=data)
-        ):
-            for limit in self._rate_limits:
-                self._rate_limiter.hit(limit, self._subscription_key)
+        # Only worked out when something is listening, as this runs on every request.
+        endpoint = endpoint_template(url) if self.hooks else None
+        self.hooks.emit(BEFORE_REQUEST, method=method, url=url, endpoint=endpoint)
+
+        cache_key = self._session.cache.create_key(
+            requests.Request(
+                method, url, headers=headers, data=data, params=kwargs.get("params")
+            )
+        )
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow(url):
+            return self._serve_open_circuit(method, url, endpoint, cache_key)
+
+        args = (method, url, headers, data, withhold_token, endpoint)
+        coalesced = False
+        try:
+            # if this request is not cached, then we need to rate limit it
+            if not kwargs.get("force_refresh") and self._session.cache.contains(
+                key=cache_key
+            ):
+                response, duration = self._timed_send(None, *args, **kwargs)
+            elif (
+                self._coalesce_requests
+                and method.upper() == "GET"
+                and not kwargs.get("stream")
+            ):
+                # Identical GETs made while this one is in flight wait for it and share
+                # its response, rather than each using up a rate limit slot of its own.
+                started = time.perf_counter()
+                (response, duration), coalesced = self._in_flight_gets.do(
+                    cache_key,
+                    functools.partial(
+                        self._send_uncached, priority, tag, *args, **kwargs
+                    ),
+                )
+                if coalesced:
+                    duration = time.perf_counter() - started
+                    # Each caller gets a response object of its own to annotate.
+                    response = copy.copy(response)
+            else:
+                response, duration = self._send_uncached(priority, tag, *args, **kwargs)
+        except Exception as error:
+            if breaker is not None:
+                failed = isinstance(error, (requests.ConnectionError, requests.Timeout))
+                breaker.record(url, False if failed else None)
+            raise
+        if breaker is not None:
+            # Only responses that actually came from the API say how it is doing, and
+            # 429s are left to the rate limiter.
+            sent = not (coalesced or getattr(response, "from_cache", False))
+            counts = sent and response.status_code != 429
+            breaker.record(url, response.status_code < 500 if counts else None)
+
+        if self.hooks:
+            from_cache = getattr(response, "from_cache", False)
+            if from_cache:
+                self.hooks.emit(
+                    ON_CACHE_HIT,
+                    method=method,
+                    url=url,
+                    endpoint=endpoint,
+                    response=response,
+                )
+            self.hooks.emit(
+                AFTER_RESPONSE,
+                method=method,
+                url=url,
+                endpoint=endpoint,
+                response=response,
+                duration=duration,
+                from_cache=from_cache,
+                coalesced=coalesced,
+            )
+        return response
+
+    def _serve_open_circuit(
+        self, method: str, url: str, endpoint: Optional[str], cache_key: str
+    ) -> requests.Response:
+        """
+        Serve a request whose circuit is open from the cache, even if the cached
+        response has expired, or raise CircuitOpenError if there is none.
+        """
+        response = self._session.cache.get_response(cache_key)
+        self.hooks.emit(
+            ON_CIRCUIT_OPEN,
+            method=method,
+            url=url,
+            endpoint=endpoint,
+            stale=response is not None,
+        )
+        if response is None:
+            raise CircuitOpenError(url, self.circuit_breaker.retry_after(url))
+        return response
+
+    def _send_uncached(
+        self,
+        priority: str,
+        tag: Optional[str],
+        method: str,
+        url: str,
+        headers: dict,
+        data: Optional[dict],
+        withhold_token: bool,
+        endpoint: Optional[str],
+        **kwargs,
+    ) -> Tuple[requests.Response, float]:
+        """
+        Reserve the quota, then wait for a concurrency slot and the rate limits and
+        send a request. Returns the response and how long sending took. The quota is
+        released again if the request fails without a response.
+        """
+        reservation = None
+        if self.quota_tracker is not None:
+            reservation = self.quota_tracker.acquire(
+                self._subscription_key, priority, tag
+            )
+            if reservation.waited:
+                self.hooks.emit(
+                    ON_RATE_LIMIT_WAIT,
+                    method=method,
+                    url=url,
+                    endpoint=endpoint,
+                    duration=reservation.waited,
+                    reason="quota",
+                    priority=PriorityLanes.lane(priority),
+                )
+        limiter = self.concurrency_limiter
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                waited = self._wait_for_rate_limits(priority)
+                if waited:
+                    self.hooks.emit(
+                        ON_RATE_LIMIT_WAIT,
+                        method=method,
+                        url=url,
+                        endpoint=endpoint,
+                        duration=waited,
+                        reason="rate_limit",
+                        priority=PriorityLanes.lane(priority),
+                    )
+            except BaseException:
+                # Nothing was sent, so the slot goes back without a say in the limit.
+                if limiter is not None:
+                    limiter.cancel()
+                raise
+            return self._timed_send(
+                limiter, method, url, headers, data, withhold_token, endpoint, **kwargs
+            )
+        except BaseException:
+            # No response came back, so the request is not counted against the quota.
+            if reservation is not None:
+                self.quota_tracker.release(reservation)
+            raise
+
+    def _timed_send(
+        self,
+        limiter: Optional[AdaptiveConcurrencyLimiter],
+        method: str,
+        url: str,
+        headers: dict,
+        data: Optional[dict],
+        withhold_token: bool,
+        endpoint: Optional[str],
+        **kwargs,
+    ) -> Tuple[requests.Response, float]:
+        """
+        Send a request, releasing its concurrency slot if it holds one. Returns the
+        response and how long sending took.
+        """
+        started = time.perf_counter()
+        try:
+            response = self._send(
+                method, url, headers, data, withhold_token, endpoint, **kwargs
+            )
+        except Exception:
+            if limiter is not None:
+                self._release_concurrency_slot(
+                    limiter, time.perf_counter() - started, None
+                )
+            raise
+        duration = time.perf_counter() - started
+        if limiter is not None:
+            self._release_concurrency_slot(limiter, duration, response.status_code)
+        return response, duration
 
+    def _release_concurrency_slot(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        duration: float,
+        status_code: Optional[int],
+    ) -> None:
+        previous = limiter.limit
+        limit = limiter.release(duration, status_code)
+        if limit != previous:
+            self.hooks.emit(
+                ON_CONCURRENCY_LIMIT_CHANGE,
+                limit=limit,
+                previous=previous,
+                in_flight=limiter.in_flight,
+            )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        data: Optional[dict],
+        withhold_token: bool,
+        endpoint: Optional[str],
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request through the session, retrying once with a new token if the
+        current one has expired.
+        """
         try:
             return self._session.request(
                 method,
@@ -228,13 +598,15 @@ class SKYAPIClient:
                 # then retry once.
                 self.create_session()
             else:
-                self._credential_manager.update_token(
-                    self._session.refresh_token(
-                        token_url=TOKEN_URL,
-                        refresh_token=self._credential_manager.token["refresh_token"],
-                    )
-                )
+                self.refresh_token()
             # Retry once with the refreshed / rebuilt session.
+            self.hooks.emit(
+                ON_RETRY,
+                method=method,
+                url=url,
+                endpoint=endpoint,
+                reason="token_expired",
+            )
             return self._session.request(
                 method,
                 url,
@@ -244,6 +616,34 @@ class SKYAPIClient:
                 **kwargs,
             )
 
+    def _wait_for_rate_limits(self, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """
+        Block until every configured rate limit has room for another request, then
+        consume a slot from each of them. Returns the number of seconds spent waiting.
+
+        This makes it safe to call request() from several threads at once: callers
+        that would exceed a limit sleep until its window resets instead of going over.
+        Callers waiting at the same time get slots in the order decided by the
+        client's priority lanes.
+        """
+        return self.priority_lanes.acquire(priority, self._take_rate_limit_slot)
+
+    def _take_rate_limit_slot(self) -> float:
+        """
+        Consume a slot from every rate limit and return 0, or return how long to
+        wait before trying again if one of them is full.
+        """
+        for limit in self._rate_limits:
+            if not self._rate_limiter.test(limit, self._subscription_key):
+                reset_time, _ = self._rate_limiter.get_window_stats(
+                    limit, self._subscription_key
+                )
+                return max(reset_time - time.time(), 0.01)
+        for limit in self._rate_limits:
+            if not self._rate_limiter.hit(limit, self._subscription_key):
+                # Another process took the slot between the test and the hit.
+                return 0.01
+        return 0
 
     @property
     def authorization_url(self) -> str:
@@ -323,7 +723,7 @@ class BaseSolutionClient:
         :return: The URL for the resource.
         :rtype: str
         """
-        return f"{BASE_URL}/{self._slug}/{self._api_version}/{path}"
+        return f"{self._client.base_url}/{self._slug}/{self._api_version}/{path}"
 
     def _make_request(
         self,
@@ -346,6 +746,12 @@ class BaseSolutionClient:
 
         return response
 
+    def _uncache(self, *paths: str) -> None:
+        """
+        Drop the cached GET responses for paths in this solution.
+        """
+        self._client.uncache(*(self.__make_url(path) for path in paths))
+
 
 def paginated_response(func):
     """
@@ -354,6 +760,7 @@ def paginated_response(func):
     automatically handle pagination and return the full response as a dict.
     """
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs) -> requests.Response:
         if not isinstance(args[0], BaseSolutionClient):
             raise TypeError(
@@ -362,23 +769,67 @@ def paginated_response(func):
             )
         initial_response = func(*args, **kwargs)
         initial_response.raise_for_status()
-        initial_response.full_json = initial_response.json()
-        initial_response.pages = [initial_response.full_json]
+        first_page = response_json(initial_response)
+        pages = [first_page]
+        full_json = dict(first_page, value=list(first_page["value"]))
 
-        while initial_response.full_json.get("next_link"):
-            subsequent_response = (
-                args[0]
-                ._make_request("GET", initial_response.full_json["next_link"])
-            )
+        while full_json.get("next_link"):
+            subsequent_response = args[0]._make_request("GET", full_json["next_link"])
             subsequent_response.raise_for_status()
-            initial_response.pages.append(subsequent_response.json())
-            initial_response.full_json["value"].extend(subsequent_response["value"])
-            initial_response.full_json["next_link"] = subsequent_response.get(
-                "next_link"
-            )
+            subsequent_json = response_json(subsequent_response)
+            pages.append(subsequent_json)
+            full_json["value"].extend(subsequent_json["value"])
+            full_json["next_link"] = subsequent_json.get("next_link")
+
+        full_json["count"] = len(full_json["value"])
+
+        # The response may be shared, with the callers of a coalesced request or
+        # through the cache, so the pages go on a copy of it.
+        response = copy.copy(initial_response)
+        response.full_json = full_json
+        response.pages = pages
+        return response
 
-        initial_response.full_json["count"] = len(initial_response.full_json["value"])
+    return wrapper
 
-        return initial_response
 
-    return wrapper
+def collection_values(payload: Any) -> list:
+    """
+    Returns the items of a collection response, which is either a bare list or an
+    object with the items under "value".
+    """
+    if isinstance(payload, dict):
+        return payload.get("value") or []
+    return payload or []
+
+
+def iterate_marker_pages(
+    func: Callable[..., requests.Response],
+    client: BaseSolutionClient,
+    *args,
+    marker: Optional[int] = None,
+    marker_key: str = "id",
+    **kwargs,
+) -> Iterator[list]:
+    """
+    Yields the items of a marker-paginated endpoint one page at a time.
+
+    Endpoints such as users/extended return a fixed number of records per call and
+    expect the ID of the last record as the marker for the next one. func is called
+    with the client, args, kwargs and the current marker until a page comes back
+    empty or the marker stops advancing.
+    """
+    while True:
+        response = func(client, *args, marker=marker, **kwargs)
+        response.raise_for_status()
+        payload = getattr(response, "full_json", None) or response_json(response)
+        values = collection_values(payload)
+        if not values:
+            return
+
+        yield values
+
+        next_marker = values[-1].get(marker_key)
+        if next_marker is None or next_marker == marker:
+            return
+        marker = next_marker
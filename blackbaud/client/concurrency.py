@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# The SKY API allows 10 calls per second on every tier, so there is little to be
+# gained from keeping more than this many requests in flight at once.
+DEFAULT_MAX_WORKERS = 10
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Apply func to every item using a pool of threads, yielding results in the same
+    order as the items.
+
+    Unlike ThreadPoolExecutor.map, items are consumed lazily: at most max_pending
+    calls (twice the worker count by default) are queued at any time, so a very large
+    or unbounded iterable does not have to be materialized up front.
+
+    Requests made from func still go through SKYAPIClient.request, so they are
+    subject to the client's rate limits and cache.
+
+    :param func: The function to call for each item.
+    :param items: The items to process.
+    :param max_workers: The number of threads to use.
+    :param max_pending: The maximum number of submitted calls that have not been
+    yielded yet.
+    :return: An iterator over the results of func, in input order.
+    """
+    if max_pending is None:
+        max_pending = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of requests in flight at once, and adjusts the limit to what
+    the API can sustain at the moment, by additive increase and multiplicative
+    decrease (AIMD):
+
+    - each successful request grows the limit by increase / limit, i.e. by about
+      increase for every limit's worth of requests, as long as latency is stable
+    - a 429 or 5xx response, a connection error or a latency spike (recent latency
+      above latency_tolerance times the long-run latency) multiplies the limit by
+      backoff, at most once per round trip so that a burst of failures from
+      requests that were already in flight only counts once
+
+    Pass one to SKYAPIClient as concurrency_limiter; threads calling request() then
+    wait for an in-flight slot before sending. Fan-out jobs can use a generous
+    max_workers and let the limiter settle how many of them are actually in flight.
+
+    :param initial: The limit to start with.
+    :param minimum: The lowest the limit goes.
+    :param maximum: The highest the limit goes.
+    :param increase: How much the limit grows per round trip without trouble.
+    :param backoff: The factor the limit is multiplied by on trouble.
+    :param latency_tolerance: How many times the long-run latency recent latency
+        may reach before it counts as a spike.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 50,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        # Exponentially weighted moving averages of the latency of successful
+        # requests: a fast one for recent latency and a slow one for the baseline.
+        self._recent_latency: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+        self._last_backoff = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """
+        Wait until there are fewer requests in flight than the limit, and count one
+        more.
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, status_code: Optional[int] = None) -> int:
+        """
+        Count a request as done, adjust the limit by how it went and return the new
+        limit. status_code is None if no response was received.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            failed = status_code is None or status_code == 429 or status_code >= 500
+            if failed:
+                self._back_off()
+            else:
+                self._observe_latency(latency)
+                spike = self.latency_tolerance * self._baseline_latency
+                if self._recent_latency > spike:
+                    self._back_off()
+                else:
+                    grown = self._limit + self.increase / self._limit
+                    self._limit = min(grown, self.maximum)
+            self._condition.notify_all()
+            return int(self._limit)
+
+    def cancel(self) -> None:
+        """
+        Give a slot back without having sent a request, leaving the limit as it is.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _observe_latency(self, latency: float) -> None:
+        if self._baseline_latency is None:
+            self._recent_latency = self._baseline_latency = latency
+            return
+        self._recent_latency += 0.3 * (latency - self._recent_latency)
+        self._baseline_latency += 0.02 * (latency - self._baseline_latency)
+
+    def _back_off(self) -> None:
+        now = time.monotonic()
+        if now - self._last_backoff < (self._recent_latency or 0):
+            return
+        self._last_backoff = now
+        self._limit = max(self._limit * self.backoff, self.minimum)
+        # Let recent latency settle back towards the baseline rather than backing
+        # off again on the same spike.
+        if self._recent_latency is not None:
+            self._recent_latency = self._baseline_latency
+
+
+class SingleFlight:
+    """
+    Lets concurrent calls with the same key share one call: the first caller makes
+    it, and callers that turn up while it is in flight wait for it and get its
+    result, or its exception, instead of making their own.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], R]) -> Tuple[R, bool]:
+        """
+        Call func, or wait for the call already in flight for key. Returns the result
+        and whether it came from another caller's call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            shared = future is not None
+            if not shared:
+                future = self._calls[key] = Future()
+        if shared:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as error:
+            self._finish(key)
+            future.set_exception(error)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result, False
+
+    def _finish(self, key: Hashable) -> None:
+        # Callers that turn up from now on make a call of their own.
+        with self._lock:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
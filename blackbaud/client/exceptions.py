@@ -0,0 +1,28 @@
+class QuotaReservedError(Exception):
+    """
+    Exception raised when a low-priority request would have to dip into the part of
+    the daily quota reserved for interactive traffic, and waiting for the quota to
+    free up would take longer than allowed.
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            "The remaining daily quota is reserved for interactive requests; "
+            f"retry in {retry_after:.0f} seconds."
+        )
+
+
+class CircuitOpenError(Exception):
+    """
+    Exception raised when a request is not sent because the API, or the endpoint it
+    is for, has been failing, and there is no cached response to serve instead.
+    """
+
+    def __init__(self, url: str, retry_after: float):
+        self.url = url
+        self.retry_after = retry_after
+        super().__init__(
+            f"Not requesting {url}: the SKY API has been failing; "
+            f"retry in {retry_after:.0f} seconds."
+        )
@@ -0,0 +1,101 @@
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlsplit
+
+_logger = logging.getLogger(__name__)
+
+# Called with method, url and endpoint before a request is sent (or served from the
+# cache).
+BEFORE_REQUEST = "before_request"
+# Called with method, url, endpoint, response, duration (in seconds), from_cache and
+# coalesced (whether the response was shared by an identical request that was already
+# in flight) once a response has been received.
+AFTER_RESPONSE = "after_response"
+# Called with method, url, endpoint and response when a response comes from the
+# cache.
+ON_CACHE_HIT = "on_cache_hit"
+# Called with method, url, endpoint, duration, reason ("rate_limit" or "quota") and
+# priority (the request's lane, "interactive" or "batch") when a request had to wait
+# before it could be sent.
+ON_RATE_LIMIT_WAIT = "on_rate_limit_wait"
+# Called with method, url, endpoint and reason when a request is sent again.
+ON_RETRY = "on_retry"
+# Called with token whenever the access token is refreshed.
+ON_TOKEN_REFRESH = "on_token_refresh"
+# Called with limit, previous and in_flight when the adaptive concurrency limiter
+# raises or lowers the number of requests allowed in flight.
+ON_CONCURRENCY_LIMIT_CHANGE = "on_concurrency_limit_change"
+# Called with method, url, endpoint and stale (whether a cached response was served
+# instead) when a request is not sent because its circuit breaker is open.
+ON_CIRCUIT_OPEN = "on_circuit_open"
+
+EVENTS = (
+    BEFORE_REQUEST,
+    AFTER_RESPONSE,
+    ON_CACHE_HIT,
+    ON_RATE_LIMIT_WAIT,
+    ON_RETRY,
+    ON_TOKEN_REFRESH,
+    ON_CONCURRENCY_LIMIT_CHANGE,
+    ON_CIRCUIT_OPEN,
+)
+
+Hook = Callable[..., Any]
+
+# Numeric IDs and GUIDs.
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})$")
+
+
+def endpoint_template(url: str) -> str:
+    """
+    The endpoint a URL belongs to, with IDs in the path replaced by {id} and the
+    query string left out, e.g. "school/v1/users/{id}/addresses".
+    """
+    segments = urlsplit(url).path.strip("/").split("/")
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments
+    )
+
+
+class Hooks:
+    """
+    Callbacks for the events of the request lifecycle, registered by event name.
+
+    Every callback is called with keyword arguments, which are listed next to the
+    event names in this module; new arguments may be added, so callbacks should
+    accept **kwargs. An exception raised by a callback is logged and does not affect
+    the request.
+    """
+
+    def __init__(self):
+        self._hooks: Dict[str, List[Hook]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, event: str, hook: Hook) -> Hook:
+        """
+        Call hook whenever event happens, and return it.
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event!r}")
+        with self._lock:
+            # Copied so that emit can go through the list without the lock.
+            self._hooks[event] = [*self._hooks.get(event, []), hook]
+        return hook
+
+    def unregister(self, event: str, hook: Hook) -> None:
+        with self._lock:
+            hooks = list(self._hooks.get(event, []))
+            hooks.remove(hook)
+            self._hooks[event] = hooks
+
+    def emit(self, event: str, **kwargs) -> None:
+        for hook in self._hooks.get(event, ()):
+            try:
+                hook(**kwargs)
+            except Exception:
+                _logger.exception("Error in %s hook %r", event, hook)
+
+    def __bool__(self) -> bool:
+        return any(self._hooks.values())
@@ -0,0 +1,318 @@
+import bisect
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+from blackbaud.client import hooks
+from blackbaud.client.settings import PRIORITY_INTERACTIVE
+
+# Upper bounds of the latency histogram buckets, in seconds.
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# How many of the most recent durations percentiles are computed from.
+DEFAULT_SAMPLE_SIZE = 1024
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    Request durations for one endpoint: cumulative bucket counts and totals for
+    export, and the most recent durations for percentiles.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._samples: Deque[float] = deque(maxlen=sample_size)
+
+    def observe(self, duration: float) -> None:
+        position = bisect.bisect_left(self.buckets, duration)
+        if position < len(self.buckets):
+            self.bucket_counts[position] += 1
+        self.count += 1
+        self.sum += duration
+        self._samples.append(duration)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        The duration below which the given percentage of recent requests completed,
+        or None if there have been none.
+        """
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        rank = max(int(round(percent / 100 * len(samples))) - 1, 0)
+        return samples[min(rank, len(samples) - 1)]
+
+
+class MetricsCollector:
+    """
+    Collects request metrics from the lifecycle hooks of one or more clients:
+
+    - request durations per endpoint template and method, as histograms
+    - requests per endpoint, method and status code
+    - cache hits and misses, coalesced requests, retries and token refreshes
+    - rate limit and quota waits per endpoint and priority lane
+    - response sizes per endpoint
+    - requests not sent because their circuit breaker was open
+    - the current limit of the adaptive concurrency limiter, as a gauge
+
+    The numbers can be read with latency_percentiles and counters, or exported in
+    the Prometheus text format with to_prometheus.
+
+    >>> metrics = MetricsCollector()
+    >>> metrics.register(client.hooks)
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        self._buckets = buckets
+        self._sample_size = sample_size
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, client_hooks: hooks.Hooks) -> None:
+        """
+        Start collecting the events of a client, e.g. metrics.register(client.hooks).
+        """
+        client_hooks.register(hooks.AFTER_RESPONSE, self._after_response)
+        client_hooks.register(hooks.ON_RATE_LIMIT_WAIT, self._on_rate_limit_wait)
+        client_hooks.register(hooks.ON_RETRY, self._on_retry)
+        client_hooks.register(hooks.ON_TOKEN_REFRESH, self._on_token_refresh)
+        client_hooks.register(
+            hooks.ON_CONCURRENCY_LIMIT_CHANGE, self._on_concurrency_limit_change
+        )
+        client_hooks.register(hooks.ON_CIRCUIT_OPEN, self._on_circuit_open)
+
+    def unregister(self, client_hooks: hooks.Hooks) -> None:
+        client_hooks.unregister(hooks.AFTER_RESPONSE, self._after_response)
+        client_hooks.unregister(hooks.ON_RATE_LIMIT_WAIT, self._on_rate_limit_wait)
+        client_hooks.unregister(hooks.ON_RETRY, self._on_retry)
+        client_hooks.unregister(hooks.ON_TOKEN_REFRESH, self._on_token_refresh)
+        client_hooks.unregister(
+            hooks.ON_CONCURRENCY_LIMIT_CHANGE, self._on_concurrency_limit_change
+        )
+        client_hooks.unregister(hooks.ON_CIRCUIT_OPEN, self._on_circuit_open)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """
+        Add to a counter, creating it if needed.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counter = self._counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set a gauge, creating it if needed.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, endpoint: str, method: str, duration: float) -> None:
+        """
+        Record the duration of a request, in seconds.
+        """
+        key = (endpoint, method)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(
+                    self._buckets, self._sample_size
+                )
+            histogram.observe(duration)
+
+    def _after_response(
+        self,
+        method: str,
+        endpoint: str,
+        response: requests.Response,
+        duration: float,
+        from_cache: bool,
+        coalesced: bool = False,
+        **kwargs,
+    ) -> None:
+        if coalesced:
+            # The request that was in flight already counted the upstream call.
+            self.increment("coalesced_requests_total", endpoint=endpoint)
+            return
+        self.observe(endpoint, method, duration)
+        self.increment(
+            "requests_total",
+            endpoint=endpoint,
+            method=method,
+            status=str(response.status_code),
+        )
+        self.increment(
+            "cache_hits_total" if from_cache else "cache_misses_total",
+            endpoint=endpoint,
+        )
+        size = _response_size(response)
+        if size is not None:
+            self.increment("response_bytes_total", size, endpoint=endpoint)
+
+    def _on_rate_limit_wait(
+        self,
+        endpoint: str,
+        duration: float,
+        reason: str = "rate_limit",
+        priority: str = PRIORITY_INTERACTIVE,
+        **kwargs,
+    ) -> None:
+        labels = {"endpoint": endpoint, "reason": reason, "priority": priority}
+        self.increment("rate_limit_waits_total", **labels)
+        self.increment("rate_limit_wait_seconds_total", duration, **labels)
+
+    def _on_retry(self, endpoint: str, reason: str, **kwargs) -> None:
+        self.increment("retries_total", endpoint=endpoint, reason=reason)
+
+    def _on_token_refresh(self, **kwargs) -> None:
+        self.increment("token_refreshes_total")
+
+    def _on_concurrency_limit_change(self, limit: int, **kwargs) -> None:
+        self.set_gauge("concurrency_limit", limit)
+        self.increment("concurrency_limit_changes_total")
+
+    def _on_circuit_open(self, endpoint: str, stale: bool, **kwargs) -> None:
+        self.increment(
+            "circuit_open_total", endpoint=endpoint, stale=str(stale).lower()
+        )
+
+    def counters(self) -> Dict[str, Dict[Labels, float]]:
+        """
+        A copy of every counter, by name and then by labels.
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._counters.items()}
+
+    def gauges(self) -> Dict[str, Dict[Labels, float]]:
+        """
+        A copy of every gauge, by name and then by labels.
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._gauges.items()}
+
+    def latency_percentiles(
+        self, percents: Iterable[float] = (50, 95, 99)
+    ) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Recent latency percentiles in seconds, by (endpoint, method), e.g.
+        {("school/v1/users/{id}", "GET"): {"p50": 0.12, "p95": 0.4, "p99": 0.9}}.
+        """
+        percents = list(percents)
+        with self._lock:
+            return {
+                key: {
+                    f"p{percent:g}": histogram.percentile(percent)
+                    for percent in percents
+                }
+                for key, histogram in self._histograms.items()
+            }
+
+    def slowest_endpoints(self, percent: float = 95, limit: int = 10) -> List[tuple]:
+        """
+        (endpoint, method, duration) for the endpoints with the highest latency at
+        the given percentile, slowest first.
+        """
+        rows = [
+            (endpoint, method, values[f"p{percent:g}"])
+            for (endpoint, method), values in self.latency_percentiles(
+                [percent]
+            ).items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def to_prometheus(self, prefix: str = "blackbaud_") -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            name = f"{prefix}request_duration_seconds"
+            lines.append(f"# HELP {name} Duration of SKY API requests.")
+            lines.append(f"# TYPE {name} histogram")
+            for (endpoint, method), histogram in sorted(self._histograms.items()):
+                key: Labels = (("endpoint", endpoint), ("method", method))
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    labels = _format_labels(key + (("le", f"{bound:g}"),))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(key + (("le", "+Inf"),))
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}"
+                )
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+            for counter_name, values in sorted(self._counters.items()):
+                name = f"{prefix}{counter_name}"
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(values.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for gauge_name, values in sorted(self._gauges.items()):
+                name = f"{prefix}{gauge_name}"
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in sorted(values.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _response_size(response: requests.Response) -> Optional[int]:
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    # The body of a streamed response may not have been read yet, and reading it
+    # here would take it away from the caller.
+    content = getattr(response, "_content", False)
+    return len(content) if isinstance(content, bytes) else None
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
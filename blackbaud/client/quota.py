@@ -0,0 +1,266 @@
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, NamedTuple, Optional
+
+from limits import RateLimitItem
+
+from blackbaud.client.exceptions import QuotaReservedError
+from blackbaud.client.settings import PRIORITY_INTERACTIVE
+
+# Usage is counted in buckets of this many seconds.
+BUCKET_SECONDS = 60
+
+# Burn rates are measured over this much recent usage by default.
+DEFAULT_BURN_RATE_WINDOW = timedelta(minutes=15)
+
+
+class QuotaStatus(NamedTuple):
+    limit: int
+    used: int
+    remaining: int
+    reserve: int
+    # Requests per second over the recent burn rate window.
+    burn_rate: float
+    # When the quota will run out at the current burn rate, if it is being used.
+    exhausted_at: Optional[datetime]
+    used_by_tag: Dict[Optional[str], int]
+
+
+class QuotaReservation(NamedTuple):
+    subscription_key: str
+    tag: Optional[str]
+    cost: int
+    # The start of the bucket the request was counted in.
+    bucket_start: float
+    # How many seconds the request waited for the quota before it was counted.
+    waited: float
+
+
+class _Bucket:
+    __slots__ = ("start", "total", "tags")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.total = 0
+        self.tags: Counter = Counter()
+
+
+class QuotaTracker:
+    """
+    Keeps count of the requests made against the daily quota of each subscription
+    key, over a moving window like the one the rate limiter uses, and per caller tag.
+
+    Requests are tagged with the tag request kwarg (e.g. tag="attendance-sync"), so
+    the usage of each job can be told apart. Requests with a priority other than
+    interactive (e.g. priority=PRIORITY_BATCH) are held back once only the reserve
+    is left, so that interactive traffic can still get through: they wait for usage
+    to age out of the window, or raise QuotaReservedError if that would take longer
+    than max_wait seconds.
+
+    Counts are kept in memory, so they only cover the requests of this process.
+
+    :param limit: The number of requests allowed per window.
+    :param window: The length of the window, one day for SKY API quotas.
+    :param reserve: How many requests to keep for interactive traffic. A float
+        below 1 is a fraction of the limit.
+    :param max_wait: How long a low-priority request may wait for the quota to free
+        up before QuotaReservedError is raised. None waits as long as needed.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: timedelta = timedelta(days=1),
+        reserve: float = 0.1,
+        max_wait: Optional[float] = None,
+    ):
+        self.limit = limit
+        self.window = window
+        self.reserve = int(reserve * limit) if reserve < 1 else int(reserve)
+        self.max_wait = max_wait
+        self._buckets: Dict[str, Deque[_Bucket]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rate_limits(
+        cls, rate_limits: Iterable[RateLimitItem], **kwargs
+    ) -> "QuotaTracker":
+        """
+        Build a tracker for the longest of a set of rate limits, e.g. the daily
+        quota of STANDARD_TIER.
+        """
+        quota = max(rate_limits, key=lambda limit: limit.get_expiry())
+        return cls(quota.amount, timedelta(seconds=quota.get_expiry()), **kwargs)
+
+    def _prune(self, buckets: Deque[_Bucket], now: float) -> None:
+        cutoff = now - self.window.total_seconds()
+        while buckets and buckets[0].start + BUCKET_SECONDS <= cutoff:
+            buckets.popleft()
+
+    def _count(
+        self, buckets: Deque[_Bucket], now: float, tag: Optional[str], cost: int
+    ) -> float:
+        """
+        Add a request to the current bucket, with the lock held, and return the
+        bucket's start.
+        """
+        start = now - now % BUCKET_SECONDS
+        if not buckets or buckets[-1].start != start:
+            buckets.append(_Bucket(start))
+        buckets[-1].total += cost
+        buckets[-1].tags[tag] += cost
+        return start
+
+    def record(
+        self, subscription_key: str, tag: Optional[str] = None, cost: int = 1
+    ) -> None:
+        """
+        Count a request made with a subscription key.
+        """
+        now = time.time()
+        with self._lock:
+            buckets = self._buckets.setdefault(subscription_key, deque())
+            self._prune(buckets, now)
+            self._count(buckets, now, tag, cost)
+
+    def used(self, subscription_key: str) -> int:
+        with self._lock:
+            buckets = self._buckets.get(subscription_key, deque())
+            self._prune(buckets, time.time())
+            return sum(bucket.total for bucket in buckets)
+
+    def remaining(self, subscription_key: str) -> int:
+        return max(self.limit - self.used(subscription_key), 0)
+
+    def used_by_tag(self, subscription_key: str) -> Dict[Optional[str], int]:
+        with self._lock:
+            buckets = self._buckets.get(subscription_key, deque())
+            self._prune(buckets, time.time())
+            used: Counter = Counter()
+            for bucket in buckets:
+                used.update(bucket.tags)
+            return dict(used)
+
+    def burn_rate(
+        self,
+        subscription_key: str,
+        over: timedelta = DEFAULT_BURN_RATE_WINDOW,
+        tag: Optional[str] = None,
+    ) -> float:
+        """
+        Requests per second over the given stretch of recent time, for all the
+        requests of a subscription key or only those with a tag.
+        """
+        now = time.time()
+        since = now - over.total_seconds()
+        with self._lock:
+            buckets = [
+                bucket
+                for bucket in self._buckets.get(subscription_key, ())
+                if bucket.start + BUCKET_SECONDS > since
+            ]
+        if not buckets:
+            return 0.0
+        count = sum(
+            bucket.total if tag is None else bucket.tags[tag] for bucket in buckets
+        )
+        # Usage only started partway through the stretch.
+        elapsed = min(now - buckets[0].start, over.total_seconds())
+        return count / max(elapsed, 1.0)
+
+    def forecast_exhaustion(
+        self, subscription_key: str, over: timedelta = DEFAULT_BURN_RATE_WINDOW
+    ) -> Optional[datetime]:
+        """
+        When the quota will run out if requests keep being made at the current burn
+        rate, or None if no requests are being made.
+
+        This ignores usage ageing out of the window, so it errs on the early side.
+        """
+        rate = self.burn_rate(subscription_key, over)
+        if not rate:
+            return None
+        seconds = self.remaining(subscription_key) / rate
+        return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+    def status(
+        self, subscription_key: str, over: timedelta = DEFAULT_BURN_RATE_WINDOW
+    ) -> QuotaStatus:
+        used = self.used(subscription_key)
+        return QuotaStatus(
+            limit=self.limit,
+            used=used,
+            remaining=max(self.limit - used, 0),
+            reserve=self.reserve,
+            burn_rate=self.burn_rate(subscription_key, over),
+            exhausted_at=self.forecast_exhaustion(subscription_key, over),
+            used_by_tag=self.used_by_tag(subscription_key),
+        )
+
+    def _retry_after(self, buckets: Deque[_Bucket], now: float, cost: int) -> float:
+        """
+        How long until a low-priority request can be made without dipping into the
+        reserve, or 0 if it can be made now. Called with the lock held.
+        """
+        allowed = self.limit - self.reserve
+        excess = sum(bucket.total for bucket in buckets) + cost - allowed
+        if excess <= 0:
+            return 0.0
+        # Wait for the oldest buckets to leave the window.
+        for bucket in buckets:
+            excess -= bucket.total
+            if excess <= 0:
+                expires = bucket.start + BUCKET_SECONDS
+                return max(expires + self.window.total_seconds() - now, 0.01)
+        return self.window.total_seconds()
+
+    def acquire(
+        self,
+        subscription_key: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        tag: Optional[str] = None,
+        cost: int = 1,
+    ) -> QuotaReservation:
+        """
+        Count a request against the quota before it is made. A request that is not
+        interactive is first blocked for as long as making it would dip into the
+        reserve; QuotaReservedError is raised if that would take longer than
+        max_wait.
+
+        The check and the count happen under one lock, so requests made at the same
+        time cannot all see room for one more and go over the reserve together. A
+        request that ends up not being sent should be handed back with release.
+        """
+        waited = 0.0
+        while True:
+            now = time.time()
+            with self._lock:
+                buckets = self._buckets.setdefault(subscription_key, deque())
+                self._prune(buckets, now)
+                delay = (
+                    0.0
+                    if priority == PRIORITY_INTERACTIVE
+                    else self._retry_after(buckets, now, cost)
+                )
+                if not delay:
+                    start = self._count(buckets, now, tag, cost)
+                    return QuotaReservation(subscription_key, tag, cost, start, waited)
+            if self.max_wait is not None and waited + delay > self.max_wait:
+                raise QuotaReservedError(delay)
+            time.sleep(delay)
+            waited += delay
+
+    def release(self, reservation: QuotaReservation) -> None:
+        """
+        Stop counting a reserved request that was not sent after all.
+        """
+        with self._lock:
+            for bucket in self._buckets.get(reservation.subscription_key, ()):
+                if bucket.start == reservation.bucket_start:
+                    bucket.total -= reservation.cost
+                    bucket.tags[reservation.tag] -= reservation.cost
+                    if not bucket.tags[reservation.tag]:
+                        del bucket.tags[reservation.tag]
+                    return
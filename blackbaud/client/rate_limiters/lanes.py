@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+from blackbaud.client.settings import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+LANES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+# The share of the slots batch requests get while interactive requests are waiting.
+DEFAULT_MIN_BATCH_SHARE = 0.2
+
+# How many of the most recent slots shares are worked out over.
+DEFAULT_SHARE_HISTORY = 50
+
+
+class LaneStats:
+    __slots__ = ("requests", "waited", "wait_seconds", "max_wait_seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PriorityLanes:
+    """
+    Decides which waiting request gets the next free rate limit slot.
+
+    Requests queue up in one lane per priority, first come first served within a
+    lane. While interactive requests are waiting they get the next slot, except that
+    batch requests are guaranteed min_batch_share of the recent slots so that they
+    are never starved. With only one lane waiting, it gets every slot.
+
+    A PriorityLanes object coordinates the threads of one process; clients that
+    share a subscription key in the same process should share it too.
+
+    :param min_batch_share: The share of slots batch requests get when both lanes
+        are waiting, between 0 and 1.
+    :param share_history: How many of the most recent slots the share is measured
+        over.
+    """
+
+    def __init__(
+        self,
+        min_batch_share: float = DEFAULT_MIN_BATCH_SHARE,
+        share_history: int = DEFAULT_SHARE_HISTORY,
+    ):
+        self.min_batch_share = min_batch_share
+        self._condition = threading.Condition()
+        self._queues: Dict[str, Deque[object]] = {lane: deque() for lane in LANES}
+        self._recent: Deque[str] = deque(maxlen=share_history)
+        self._stats = {lane: LaneStats() for lane in LANES}
+
+    @staticmethod
+    def lane(priority: str) -> str:
+        """
+        The lane of a priority: anything that is not interactive is batch.
+        """
+        if priority == PRIORITY_INTERACTIVE:
+            return PRIORITY_INTERACTIVE
+        return PRIORITY_BATCH
+
+    def _next_lane(self) -> str:
+        interactive, batch = (self._queues[lane] for lane in LANES)
+        if not batch:
+            return PRIORITY_INTERACTIVE
+        if not interactive:
+            return PRIORITY_BATCH
+        batch_slots = sum(lane == PRIORITY_BATCH for lane in self._recent)
+        if batch_slots < self.min_batch_share * max(len(self._recent), 1):
+            return PRIORITY_BATCH
+        return PRIORITY_INTERACTIVE
+
+    def acquire(self, priority: str, take_slot: Callable[[], float]) -> float:
+        """
+        Wait for the turn of a request, then for a rate limit slot, and return the
+        number of seconds spent waiting.
+
+        take_slot is called on the request's turn. It takes a slot and returns 0,
+        or returns how many seconds to wait before trying again if none is free.
+        """
+        lane = self.lane(priority)
+        queue = self._queues[lane]
+        ticket = object()
+        started = time.monotonic()
+
+        with self._condition:
+            queue.append(ticket)
+            try:
+                while True:
+                    if queue[0] is ticket and self._next_lane() == lane:
+                        delay = take_slot()
+                        if not delay:
+                            break
+                        # A request with a higher claim may turn up meanwhile.
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+            # Shares only count while both lanes are waiting, so a lane that has had
+            # the limiter to itself does not get a burst of slots afterwards.
+            if any(waiting for other, waiting in self._queues.items() if other != lane):
+                self._recent.append(lane)
+            waited = time.monotonic() - started
+            stats = self._stats[lane]
+            stats.requests += 1
+            if waited >= 0.001:
+                stats.waited += 1
+                stats.wait_seconds += waited
+                stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        return waited
+
+    def waiting(self) -> Dict[str, int]:
+        """
+        The number of requests waiting in each lane.
+        """
+        with self._condition:
+            return {lane: len(queue) for lane, queue in self._queues.items()}
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        For each lane: how many requests got a slot, how many of them had to wait,
+        and the total and longest waits in seconds.
+        """
+        with self._condition:
+            return {lane: stats.as_dict() for lane, stats in self._stats.items()}
@@ -1,8 +1,42 @@
-from typing import Iterator
+import bisect
+import inspect
+import itertools
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from sys import intern
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import requests
+
+from blackbaud.client.client import BaseSolutionClient
+from blackbaud.client.serialization import loads
+from blackbaud.client.streaming import LIST_ROW_ITEMS, VALUE_ITEMS
+
+DEFAULT_PAGE_CACHE_SIZE = 8
+
+PagingMode = Literal["next_link", "marker", "page"]
+T = TypeVar("T", bound="BlackbaudObject")
 
 
 class BlackbaudResource(object):
-    ...
+    __slots__ = ()
 
 
 class BlackbaudObject(BlackbaudResource):
@@ -10,43 +44,306 @@ class BlackbaudObject(BlackbaudResource):
     Base class for any Blackbaud object, such as a constituent, a grade level, etc.
 
     BlackbaudCollection > BlackbaudPage > BlackbaudObject
+
+    Subclasses declare the fields they expect in __slots__, so each object stores
+    its values in fixed slots rather than in a dict of its own. Fields that are
+    missing from the JSON read as None. Fields that are not declared are kept in a dict
+    and can still be read as attributes, so nothing the API returns is lost.
+
+    Fields named in _nested hold objects (or lists of objects) of the given types
+    instead of dicts.
     """
 
-    ...
+    __slots__ = ("_extra",)
 
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+    _nested: Dict[str, Type["BlackbaudObject"]] = {}
 
-class BlackbaudPage(BlackbaudResource):
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        fields = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get("__slots__", ()):
+                if not name.startswith("_") and name not in fields:
+                    fields.append(name)
+        cls._fields = tuple(fields)
+        cls._field_set = frozenset(fields)
+
+    def __init__(self, /, **fields: Any) -> None:
+        self._load(fields)
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        fields = self._field_set
+        nested = self._nested
+        extra = None
+        for name, value in data.items():
+            if type(value) is str:
+                # Values such as role names, grade levels and cities repeat across
+                # thousands of records; this way they share a single string.
+                value = intern(value)
+            elif name in nested and value is not None:
+                item_type = nested[name]
+                if isinstance(value, list):
+                    value = item_type.from_json_items(value)
+                elif isinstance(value, dict):
+                    value = item_type.from_json(value)
+            if name in fields:
+                setattr(self, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        self._extra = extra
+
+    @classmethod
+    def from_json(cls: Type[T], data: Dict[str, Any]) -> T:
+        """
+        Build an object from a decoded JSON object.
+        """
+        obj = cls.__new__(cls)
+        obj._load(data)
+        return obj
+
+    @classmethod
+    def from_json_items(cls: Type[T], items: Iterable[Any]) -> List[T]:
+        """
+        Build objects from the decoded items of a collection response.
+        """
+        return [cls.from_json(item) for item in items]
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for fields that were not set, and for names that are not
+        # fields at all, which may be among the undeclared fields.
+        if name in self._field_set:
+            return None
+        if name != "_extra" and self._extra and name in self._extra:
+            return self._extra[name]
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The object as a dict, leaving out fields that are None.
+        """
+        data = {name: _to_json(getattr(self, name)) for name in self._fields}
+        data = {k: v for k, v in data.items() if v is not None}
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BlackbaudObject):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+
+class Role(BlackbaudObject):
+    __slots__ = ("id", "name")
+
+
+class StudentInfo(BlackbaudObject):
+    __slots__ = ("grade_level", "grad_year", "student_id")
+
+
+class Phone(BlackbaudObject):
+    __slots__ = ("id", "number", "type", "primary", "links")
+
+
+class Address(BlackbaudObject):
+    __slots__ = (
+        "id",
+        "type",
+        "line_one",
+        "line_two",
+        "line_three",
+        "city",
+        "state",
+        "postal_code",
+        "country",
+        "region",
+        "mailing_address",
+        "primary",
+        "shared",
+        "links",
+    )
+
+
+class User(BlackbaudObject):
+    """
+    A user, as returned by users/{user_id}, users/extended and similar endpoints.
     """
-    A page of results from any Blackbaud API endpoint.
 
-    BlackbaudCollection > BlackbaudPage > BlackbaudObject
+    __slots__ = (
+        "id",
+        "host_id",
+        "prefix",
+        "first_name",
+        "preferred_name",
+        "middle_name",
+        "last_name",
+        "preferred_last_name",
+        "maiden_name",
+        "suffix",
+        "greeting",
+        "gender",
+        "pronouns",
+        "birth_date",
+        "deceased",
+        "email",
+        "email_active",
+        "lost",
+        "display",
+        "roles",
+        "student_info",
+        "phones",
+        "addresses",
+    )
+
+    _nested = {
+        "roles": Role,
+        "student_info": StudentInfo,
+        "phones": Phone,
+        "addresses": Address,
+    }
+
+
+class Teacher(BlackbaudObject):
+    __slots__ = ("id", "name", "first_name", "last_name", "head", "coordinator")
+
+
+class Section(BlackbaudObject):
+    """
+    An academic section, as returned by academics/sections and similar endpoints.
     """
-    def __init__(self, url, text) -> None:
-        ...
 
-    def __iter__(self) -> Iterator[BlackbaudObject]:
-        ...
+    __slots__ = (
+        "id",
+        "name",
+        "section_identifier",
+        "course_id",
+        "course_code",
+        "course_title",
+        "course_description",
+        "department",
+        "school_year",
+        "block",
+        "room",
+        "duration",
+        "offering",
+        "lead_section_id",
+        "current_enrollment",
+        "max_enrollment",
+        "teachers",
+    )
 
-    def __next__(self) -> BlackbaudObject:
-        ...
-    
-    def __getitem__(self, index) -> BlackbaudObject:
-        ...
+    _nested = {"teachers": Teacher}
 
 
-class BlackbaudCollection(BlackbaudResource):
+class Enrollment(BlackbaudObject):
+    """
+    A section a student is enrolled in, as returned by academics/enrollments.
     """
-    A collection of Blackbaud objects, split into pages.
 
-    BlackbaudCollection > BlackbaudPage > BlackbaudObject
+    __slots__ = (
+        "id",
+        "section_id",
+        "course_code",
+        "course_title",
+        "block",
+        "room",
+        "school_year",
+        "dropped",
+        "enrollment_date",
+        "departure_date",
+    )
+
+
+class _ListColumns:
+    """
+    The column names of list rows, shared by all the rows that have the same ones.
+    """
+
+    __slots__ = ("names", "positions")
+
+    def __init__(self, names: Tuple[str, ...]) -> None:
+        self.names = names
+        self.positions = {name: position for position, name in enumerate(names)}
+
+
+class ListRow(BlackbaudObject, Mapping):
     """
+    A row of a basic or advanced list, read like a read-only dict of column names
+    to values.
+
+    Rows only hold a tuple of their values; the column names are stored once and
+    shared by every row of a page.
+    """
+
+    __slots__ = ("_columns", "_values")
+
+    def __init__(self, /, **values: Any) -> None:
+        self._extra = None
+        self._columns = _ListColumns(tuple(values))
+        self._values = tuple(values.values())
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ListRow":
+        return cls.from_json_items([data])[0]
 
-    ...
+    @classmethod
+    def from_json_items(cls, items: Iterable[Any]) -> List["ListRow"]:
+        rows = []
+        shared: Dict[Tuple[str, ...], _ListColumns] = {}
+        columns = None
+        for item in items:
+            names = tuple(column["name"] for column in item["columns"])
+            if columns is None or names != columns.names:
+                columns = shared.setdefault(names, _ListColumns(names))
+            row = cls.__new__(cls)
+            row._extra = None
+            row._columns = columns
+            row._values = tuple(
+                intern(value) if type(value) is str else value
+                for value in (column.get("value") for column in item["columns"])
+            )
+            rows.append(row)
+        return rows
 
+    def __getitem__(self, name: str) -> Any:
+        return self._values[self._columns.positions[name]]
 
-class BlackbaudList(BlackbaudResource):
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns.names)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns.positions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._columns.names, self._values))
+
+
+class BlackbaudList(BlackbaudObject):
     """
-    A basic or advanced list in Blackbaud.
+    A basic or advanced list in Blackbaud, as returned by lists.
     {
       "id": 2,
       "name": "List Two",
@@ -57,10 +354,441 @@ class BlackbaudList(BlackbaudResource):
       "created": "2021-08-08T00:00:00Z",
       "last_modified": "2021-08-08T00:00:00Z"
     }
-    If any part of the list is ever fetched, its columns attribute will be populated.
-    Will have a .columns attribute which will list the columns.
-    Will have a .results attribute which will be a generator that yields
-    BlackbaudListItems.
+    Its rows are ListRow objects, read with core.get_list_page and BlackbaudPage, or
+    through the list once bind(client) has been called: .results is a generator
+    that yields them, and .columns lists the columns once any part of the list has
+    been fetched.
     """
 
-    ...
+    __slots__ = (
+        "id",
+        "name",
+        "type",
+        "description",
+        "category",
+        "created_by",
+        "created",
+        "last_modified",
+        "_rows",
+        "_columns",
+    )
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        self._rows: Optional[BlackbaudCollection] = None
+        self._columns: Optional[Tuple[str, ...]] = None
+        super()._load(data)
+
+    def bind(
+        self, client: BaseSolutionClient, page_size: int = 1000
+    ) -> "BlackbaudList":
+        """
+        Read the rows of the list with client from now on, a page at a time, and
+        return the list.
+        """
+        # Imported here, as the endpoints import the client package.
+        from blackbaud.school.endpoints.core import get_list_page
+
+        self._rows = BlackbaudCollection(
+            get_list_page,
+            client,
+            self.id,
+            paging="page",
+            item_type=ListRow,
+            item_path=LIST_ROW_ITEMS,
+            page_size=page_size,
+        )
+        self._columns = None
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The names of the columns of the list, empty until a row has been read.
+        """
+        return list(self._columns or ())
+
+    @property
+    def results(self) -> Iterator[ListRow]:
+        """
+        A generator over the rows of the list, fetching its pages as it goes.
+        """
+        if self._rows is None:
+            raise ValueError("The list is not bound to a client; call bind() first.")
+        return self._iter_results(self._rows)
+
+    def _iter_results(self, rows: "BlackbaudCollection") -> Iterator[ListRow]:
+        for row in rows:
+            if self._columns is None:
+                self._columns = tuple(row)
+            yield row
+
+
+class BlackbaudPage(BlackbaudResource):
+    """
+    A page of results from any Blackbaud API endpoint.
+
+    BlackbaudCollection > BlackbaudPage > BlackbaudObject
+
+    The body is kept as it was received until the page is first read from. It is
+    then decoded, the items found under item_path are turned into item_type
+    objects, and the rest of the document is released.
+
+    :param url: The URL the page was fetched from.
+    :param text: The body of the response, as text or bytes.
+    :param item_type: The BlackbaudObject subclass to build the items with.
+    :param item_path: The keys under which the items are found, ("value",) for
+        collection responses and ("results", "rows") for list pages. An empty path
+        means the body itself is the array of items.
+    """
+
+    __slots__ = ("url", "item_type", "item_path", "_text", "_items", "_count", "_next")
+
+    def __init__(
+        self,
+        url: Optional[str],
+        text: Union[str, bytes],
+        item_type: Type[BlackbaudObject] = BlackbaudObject,
+        item_path: Sequence[str] = VALUE_ITEMS,
+    ) -> None:
+        self.url = url
+        self.item_type = item_type
+        self.item_path = tuple(item_path)
+        self._text: Optional[Union[str, bytes]] = text
+        self._items: Optional[List[BlackbaudObject]] = None
+        self._count: Optional[int] = None
+        self._next: Optional[str] = None
+
+    @classmethod
+    def from_response(
+        cls,
+        response: requests.Response,
+        item_type: Type[BlackbaudObject] = BlackbaudObject,
+        item_path: Sequence[str] = VALUE_ITEMS,
+    ) -> "BlackbaudPage":
+        """
+        Build a page from the response of a GET request, raising for error statuses.
+        """
+        response.raise_for_status()
+        return cls(response.url, response.content, item_type, item_path)
+
+    def _load(self) -> List[BlackbaudObject]:
+        if self._items is None:
+            document = loads(self._text) if self._text else None
+            items = document
+            for key in self.item_path:
+                items = items.get(key) if isinstance(items, dict) else None
+            items = items or []
+            self._items = self.item_type.from_json_items(items)
+            if isinstance(document, dict):
+                self._count = document.get("count")
+                self._next = document.get("next_link")
+            self._text = None
+        return self._items
+
+    @property
+    def count(self) -> int:
+        """
+        The count the API reported for the page, or the number of items in it.
+        """
+        items = self._load()
+        return len(items) if self._count is None else self._count
+
+    @property
+    def next_link(self) -> Optional[str]:
+        """
+        The link to the next page, for endpoints that paginate with next_link.
+        """
+        self._load()
+        return self._next
+
+    def __iter__(self) -> Iterator[BlackbaudObject]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @overload
+    def __getitem__(self, index: int) -> BlackbaudObject:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BlackbaudObject]:
+        ...
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __repr__(self) -> str:
+        state = "not decoded" if self._items is None else f"{len(self._items)} items"
+        return f"<{type(self).__name__} {self.url} ({state})>"
+
+
+class BlackbaudCollection(BlackbaudResource):
+    """
+    A collection of Blackbaud objects, split into pages.
+
+    BlackbaudCollection > BlackbaudPage > BlackbaudObject
+
+    Pages are fetched from the API only when they are needed: reading an item
+    fetches the page it is on, and iterating fetches one page at a time. The most
+    recently used pages are kept in memory; the way to request every page that has
+    been seen (its page number, marker or next_link) is kept for good, so going
+    back to one does not mean walking the collection from the start again.
+
+    Where the position of a page cannot be computed (next_link and marker paging),
+    reaching it means fetching the pages before it once. With page number paging
+    any page can be fetched directly.
+
+    len() is known without fetching anything more once the last page has been seen,
+    or straight away with count_is_total for endpoints that report the total number
+    of items in "count". Otherwise it fetches the remaining pages.
+
+    :param func: The endpoint function, e.g. users.get_users_by_roles_detailed. It
+        is called without any paginated_response decorator it may have.
+    :param client: The client to make requests with.
+    :param paging: How the endpoint paginates: "next_link", "marker" (the ID of the
+        last item of a page is the marker for the next) or "page" (page and
+        page_size parameters, as basic and advanced lists do).
+    :param item_type: The BlackbaudObject subclass to build the items with.
+    :param item_path: The keys under which the items of a page are found.
+    :param marker_key: The field of the last item used as the next marker.
+    :param count_is_total: Whether "count" in the first page is the total number of
+        items, rather than the number of items in the page.
+    :param cache_size: How many pages to keep in memory.
+
+    Any other arguments are passed to func.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., requests.Response],
+        client: BaseSolutionClient,
+        *args,
+        paging: PagingMode = "next_link",
+        item_type: Type[BlackbaudObject] = BlackbaudObject,
+        item_path: Sequence[str] = VALUE_ITEMS,
+        marker_key: str = "id",
+        count_is_total: bool = False,
+        cache_size: int = DEFAULT_PAGE_CACHE_SIZE,
+        **kwargs,
+    ) -> None:
+        if paging not in ("next_link", "marker", "page"):
+            raise ValueError(f"Unknown paging mode: {paging!r}")
+
+        self._func = getattr(func, "__wrapped__", func)
+        self._client = client
+        self._args = args
+        self._kwargs = kwargs
+        self.paging = paging
+        self.item_type = item_type
+        self.item_path = tuple(item_path)
+        self.marker_key = marker_key
+        self.count_is_total = count_is_total
+        self.cache_size = cache_size
+
+        self.page_size: Optional[int] = None
+        if paging == "page":
+            parameters = inspect.signature(self._func).parameters
+            self.page_size = kwargs.pop("page_size", parameters["page_size"].default)
+            first_cursor = kwargs.pop("page", 1)
+        elif paging == "marker":
+            first_cursor = kwargs.pop("marker", None)
+        else:
+            first_cursor = None
+
+        # How to request each page that can be reached so far (its marker or
+        # next_link), or the number of the first page with page number paging.
+        self._cursors: List[Any] = [first_cursor]
+        # The index of the first item of each page reached so far, followed by the
+        # number of items in all of them. Not used with page number paging, where
+        # every page but the last has page_size items.
+        self._offsets: List[int] = [0]
+        # With page number paging, the number of pages known to be full.
+        self._full_pages = 0
+        self._last_page: Optional[int] = None
+        self._total: Optional[int] = None
+        self._pages: "OrderedDict[int, BlackbaudPage]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def count(self) -> Optional[int]:
+        """
+        The number of items in the collection, if it is known without fetching any
+        more pages.
+        """
+        return self._total
+
+    def get_page(self, index: int) -> BlackbaudPage:
+        """
+        Return a page of the collection by its index, counting from 0, fetching it
+        (and, where it cannot be requested directly, the pages before it) if it is
+        not in memory. Raises IndexError past the last page.
+        """
+        with self._lock:
+            if index < 0:
+                self._fetch_remaining()
+                index += self._last_page + 1
+                if index < 0:
+                    raise IndexError("Page index out of range.")
+            if self.paging != "page":
+                while index >= len(self._cursors):
+                    if self._last_page is not None:
+                        raise IndexError("Page index out of range.")
+                    self._load(len(self._cursors) - 1)
+            return self._load(index)
+
+    def _load(self, index: int) -> BlackbaudPage:
+        if self._last_page is not None and index > self._last_page:
+            raise IndexError("Page index out of range.")
+
+        page = self._pages.get(index)
+        if page is None:
+            page = BlackbaudPage.from_response(
+                self._request(index), self.item_type, self.item_path
+            )
+            if index == 0 and self.count_is_total:
+                self._total = page.count
+            self._pages[index] = page
+            while len(self._pages) > max(self.cache_size, 1):
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(index)
+
+        if not page and index > 0:
+            # Marker and page number paging return an empty page past the end.
+            del self._pages[index]
+            if self.paging == "marker":
+                self._end(index - 1, self._offsets[index])
+            raise IndexError("Page index out of range.")
+
+        if self.paging == "page":
+            if len(page) < self.page_size:
+                self._end(index, index * self.page_size + len(page))
+            else:
+                self._full_pages = max(self._full_pages, index + 1)
+        elif index == len(self._offsets) - 1:
+            self._offsets.append(self._offsets[index] + len(page))
+            next_cursor = self._next_cursor(index, page)
+            if next_cursor is None:
+                self._end(index, self._offsets[-1])
+            else:
+                self._cursors.append(next_cursor)
+        return page
+
+    def _request(self, index: int) -> requests.Response:
+        if self.paging == "page":
+            return self._func(
+                self._client,
+                *self._args,
+                page=self._cursors[0] + index,
+                page_size=self.page_size,
+                **self._kwargs,
+            )
+        cursor = self._cursors[index]
+        if self.paging == "marker":
+            return self._func(self._client, *self._args, marker=cursor, **self._kwargs)
+        if cursor is None:
+            return self._func(self._client, *self._args, **self._kwargs)
+        return self._client._make_request("GET", cursor)
+
+    def _next_cursor(self, index: int, page: BlackbaudPage) -> Any:
+        if self.paging == "marker":
+            if not page:
+                return None
+            marker = getattr(page[-1], self.marker_key, None)
+            return None if marker == self._cursors[index] else marker
+        return page.next_link
+
+    def _end(self, last_page: int, total: int) -> None:
+        self._last_page = last_page
+        self._total = total
+
+    def _fetch_remaining(self) -> None:
+        if self.paging == "page":
+            index = self._full_pages
+            while self._last_page is None:
+                try:
+                    self._load(index)
+                except IndexError:
+                    # The page before was full and also the last one.
+                    self._end(index - 1, index * self.page_size)
+                index += 1
+        else:
+            while self._last_page is None:
+                try:
+                    self._load(len(self._offsets) - 1)
+                except IndexError:
+                    # An empty page past the end, after which _last_page is set.
+                    pass
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """
+        The page an item is on and its position on that page.
+        """
+        if self.paging == "page":
+            return divmod(index, self.page_size)
+        while index >= self._offsets[-1]:
+            if self._last_page is not None:
+                raise IndexError("Collection index out of range.")
+            self._load(len(self._offsets) - 1)
+        page_index = bisect.bisect_right(self._offsets, index) - 1
+        return page_index, index - self._offsets[page_index]
+
+    def _iter_from(self, index: int) -> Iterator[BlackbaudObject]:
+        try:
+            page_index, position = self._locate(index)
+        except IndexError:
+            return
+        while True:
+            try:
+                page = self.get_page(page_index)
+            except IndexError:
+                return
+            yield from itertools.islice(page, position, None)
+            if page_index == self._last_page:
+                return
+            page_index += 1
+            position = 0
+
+    def __iter__(self) -> Iterator[BlackbaudObject]:
+        return self._iter_from(0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._total is None:
+                self._fetch_remaining()
+            return self._total
+
+    @overload
+    def __getitem__(self, index: int) -> BlackbaudObject:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BlackbaudObject]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.start or 0, index.stop, index.step or 1
+            if step < 0 or start < 0 or (stop is not None and stop < 0):
+                return [self[i] for i in range(*index.indices(len(self)))]
+            count = None if stop is None else max(stop - start, 0)
+            return list(itertools.islice(self._iter_from(start), 0, count, step))
+
+        if index < 0:
+            index += len(self)
+            if index < 0:
+                raise IndexError("Collection index out of range.")
+        with self._lock:
+            page_index, position = self._locate(index)
+            page = self.get_page(page_index)
+        if position >= len(page):
+            raise IndexError("Collection index out of range.")
+        return page[position]
+
+    def __repr__(self) -> str:
+        total = "unknown" if self._total is None else self._total
+        return (
+            f"<{type(self).__name__} {getattr(self._func, '__name__', self._func)} "
+            f"(items: {total}, pages in memory: {len(self._pages)})>"
+        )
@@ -0,0 +1,59 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # As a string, since a float could not hold every Decimal exactly.
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as UTF-8 JSON, ready to be sent as a request body.
+
+    Uses orjson when it is installed (pip install blackbaud[fast]) and the standard
+    library otherwise; both give equivalent output. Dates and datetimes are written
+    in ISO 8601 format like .isoformat(), Decimals as strings with their exact value
+    and Enum members as their value. Dict keys that are not strings are converted
+    the way the standard library converts them, e.g. 1 to "1" and True to "true".
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        value, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def response_json(response: requests.Response) -> Any:
+    """
+    Decode the body of a response, like Response.json() but with the faster decoder
+    when it is available.
+    """
+    return loads(response.content)
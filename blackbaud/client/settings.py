@@ -1 +1,16 @@
 BASE_URL = "https://api.sky.blackbaud.com"
+
+# Seconds to wait for a connection to the SKY API, and then for each read from it.
+# Some list and extended endpoints take a good while to start responding.
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+# The number of hosts to keep connection pools for, and the number of connections
+# each pool keeps open. The pool should be at least as large as the number of
+# threads making requests at once, or they queue for a connection.
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 20
+
+# Request priorities, passed to requests as priority=...
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
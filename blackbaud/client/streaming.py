@@ -0,0 +1,170 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Sequence
+
+import requests
+
+from blackbaud.client.client import BaseSolutionClient
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Items of a collection response ({"count": ..., "value": [...]}).
+VALUE_ITEMS = ("value",)
+
+# Rows of an advanced list page ({"count": ..., "results": {"rows": [...]}}).
+LIST_ROW_ITEMS = ("results", "rows")
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARACTERS = "0123456789+-.eE"
+_decoder = json.JSONDecoder()
+
+
+class _TextBuffer:
+    """
+    Decoded text from a stream of byte chunks, read through a cursor. Text before
+    the cursor is discarded once it is no longer needed.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def read_more(self) -> bool:
+        """
+        Append the next chunk. Returns False if the stream has ended.
+        """
+        for chunk in self._chunks:
+            if chunk:
+                self.text = self.text[self.pos :] + self._decoder.decode(chunk)
+                self.pos = 0
+                return True
+        if not self.exhausted:
+            self.exhausted = True
+            self.text = self.text[self.pos :] + self._decoder.decode(b"", final=True)
+            self.pos = 0
+        return False
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it, or ""
+        at the end of the stream.
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(
+                f"Expected one of {characters!r} in JSON stream, got {character!r}."
+            )
+        self.pos += 1
+        return character
+
+    def decode_value(self) -> Any:
+        """
+        Decode the complete JSON value at the cursor, reading more chunks for as
+        long as it is incomplete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.read_more():
+                    continue
+                raise
+            # A number that runs up to the end of the buffer (e.g. "1" of "1.5e3")
+            # may continue in the next chunk.
+            if (
+                not self.exhausted
+                and not self.text[end:].strip(_NUMBER_CHARACTERS)
+                and self.read_more()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(
+    chunks: Iterable[bytes], path: Sequence[str] = VALUE_ITEMS
+) -> Iterator[Any]:
+    """
+    Incrementally decode the array found under the given keys of a JSON document,
+    yielding its items as soon as each one has been received.
+
+    Only the array being read and the item being decoded are held in memory. Values
+    that come before the array and are not on the path are decoded and discarded;
+    anything after the array is never read. An empty path means the document
+    itself is the array.
+    """
+    buffer = _TextBuffer(chunks)
+
+    for key in path:
+        buffer.expect("{")
+        while True:
+            if buffer.peek() == "}":
+                return
+            name = buffer.decode_value()
+            buffer.expect(":")
+            if name == key:
+                break
+            buffer.decode_value()
+            if buffer.expect(",}") == "}":
+                return
+
+    if buffer.peek() != "[":
+        # The key is there, but holds null or something other than an array.
+        return
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        return
+    while True:
+        yield buffer.decode_value()
+        if buffer.expect(",]") == "]":
+            return
+
+
+def iter_response_items(
+    response: requests.Response,
+    path: Sequence[str] = VALUE_ITEMS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Yield the items of a response made with stream=True as they arrive, instead of
+    waiting for the whole body and parsing it with Response.json(). The response is
+    closed once the items have been read or the iterator is discarded.
+    """
+    try:
+        yield from iter_json_items(response.iter_content(chunk_size), path)
+    finally:
+        response.close()
+
+
+def stream_request(
+    client: BaseSolutionClient,
+    path: str,
+    item_path: Sequence[str] = VALUE_ITEMS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **request_kwargs,
+) -> Iterator[Any]:
+    """
+    Make a GET request through a BaseSolutionClient and stream the items under
+    item_path out of the response.
+
+    The response bypasses the cache (with expire_after=0, which requests-cache
+    treats as "do not store"), because storing it would mean buffering the whole
+    body before the first item can be read.
+    """
+    request_kwargs.setdefault("expire_after", 0)
+    response = client._make_request("GET", path, stream=True, **request_kwargs)
+    response.raise_for_status()
+    yield from iter_response_items(response, item_path, chunk_size)
@@ -0,0 +1,29 @@
+from .exceptions import ShardFailedError
+from .job import SyncJob
+from .sharding import (
+    ShardedRunner,
+    WorkerClientFactory,
+    shard_by_role,
+    shard_by_school_level,
+    shard_by_user_hash,
+    user_shard,
+)
+from .stores import (
+    JSONFileCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+
+__all__ = [
+    "ShardFailedError",
+    "ShardedRunner",
+    "SyncJob",
+    "WorkerClientFactory",
+    "shard_by_role",
+    "shard_by_school_level",
+    "shard_by_user_hash",
+    "user_shard",
+    "JSONFileCheckpointStore",
+    "MemoryCheckpointStore",
+    "SQLiteCheckpointStore",
+]
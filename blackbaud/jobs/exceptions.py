@@ -0,0 +1,15 @@
+from typing import Dict
+
+
+class ShardFailedError(Exception):
+    """
+    Exception raised when one or more shards of a sharded run fail. The records of
+    the shards that succeeded have already been passed to the writer.
+    """
+
+    def __init__(self, errors: Dict[int, str]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} shard(s) failed: "
+            + "; ".join(f"shard {index}: {error}" for index, error in errors.items())
+        )
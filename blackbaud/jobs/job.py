@@ -0,0 +1,196 @@
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from requests import Response
+
+from blackbaud.client import BaseSolutionClient, collection_values
+from blackbaud.client.concurrency import DEFAULT_MAX_WORKERS, map_concurrently
+from blackbaud.client.serialization import response_json
+from blackbaud.jobs.protocols import CheckpointStore
+from blackbaud.jobs.stores import MemoryCheckpointStore
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class SyncJob:
+    """
+    A long-running job whose progress survives restarts.
+
+    Work is split into named units (a per-user fetch, a paginated endpoint, ...).
+    Every finished unit, and every page of a paginated unit, is recorded in a
+    checkpoint store. Running a job again with the same job_id and store skips the
+    units that are already done and resumes paginated units from the saved next_link
+    or marker instead of starting over.
+
+    Checkpoints are written after a page or result has been handed to the caller,
+    so a crash can at worst replay the page that was being processed.
+    """
+
+    def __init__(
+        self,
+        client: BaseSolutionClient,
+        job_id: str,
+        store: Optional[CheckpointStore] = None,
+    ):
+        """
+        Construct a new SyncJob object.
+
+        :param client: The solution client to make requests with.
+        :type client: BaseSolutionClient
+        :param job_id: A name for the job, unique within the store.
+        :type job_id: str
+        :param store: Where to keep checkpoints. Defaults to an in-memory store, which
+        only helps within a single process.
+        :type store: CheckpointStore, optional
+        """
+        self.client = client
+        self.job_id = job_id
+        self._store = store if store is not None else MemoryCheckpointStore()
+
+    def is_done(self, unit_id: str) -> bool:
+        state = self._store.load(self.job_id, unit_id)
+        return bool(state and state.get("done"))
+
+    def mark_done(self, unit_id: str, result: Any = None) -> None:
+        self._store.save(self.job_id, unit_id, {"done": True, "result": result})
+
+    def get_result(self, unit_id: str) -> Any:
+        """
+        Returns what was saved with a finished unit, or None.
+        """
+        state = self._store.load(self.job_id, unit_id)
+        return state.get("result") if state else None
+
+    def reset(self) -> None:
+        """
+        Forget all progress, so that the next run starts from scratch.
+        """
+        self._store.clear(self.job_id)
+
+    def run_unit(self, unit_id: str, func: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Call func unless the unit has already been done, in which case the result
+        saved with it is returned. func's return value is saved with the checkpoint,
+        so it must be JSON serializable.
+        """
+        state = self._store.load(self.job_id, unit_id)
+        if state and state.get("done"):
+            return state.get("result")
+
+        result = func(*args, **kwargs)
+        self.mark_done(unit_id, result)
+        return result
+
+    def run_units(
+        self,
+        items: Iterable[T],
+        func: Callable[[T], R],
+        unit_id: Callable[[T], str] = str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        save_results: bool = False,
+    ) -> Iterator[Tuple[T, R]]:
+        """
+        Call func for each item that has not been done yet, concurrently, and yield
+        (item, result) pairs as they finish, in input order. Each item is marked done
+        once the caller has received its result.
+
+        :param items: The items to process, for instance user IDs.
+        :param func: The function to call for each item.
+        :param unit_id: Turns an item into its unit ID.
+        :param max_workers: How many calls to make at once.
+        :param save_results: Whether to save each result with its checkpoint. Results
+        must then be JSON serializable.
+        """
+        pending = (item for item in items if not self.is_done(unit_id(item)))
+
+        def call(item):
+            return item, func(item)
+
+        for item, result in map_concurrently(call, pending, max_workers=max_workers):
+            yield item, result
+            self.mark_done(unit_id(item), result if save_results else None)
+
+    def paginate(
+        self, unit_id: str, func: Callable[..., Response], *args, **kwargs
+    ) -> Iterator[list]:
+        """
+        Yield the items of a next_link-paginated endpoint one page at a time,
+        resuming from the last saved next_link if the unit was interrupted.
+
+        func is an endpoint function such as core.get_custom_fields. If it is wrapped
+        in paginated_response, the undecorated function is used so that pages are
+        fetched one at a time.
+        """
+        state = self._store.load(self.job_id, unit_id) or {}
+        if state.get("done"):
+            return
+
+        pages = state.get("pages", 0)
+        next_link = state.get("next_link")
+        if pages and not next_link:
+            return
+
+        if pages:
+            response = self.client._make_request("GET", next_link)
+        else:
+            func = getattr(func, "__wrapped__", func)
+            response = func(self.client, *args, **kwargs)
+
+        while True:
+            response.raise_for_status()
+            payload = response_json(response)
+            next_link = payload.get("next_link") if isinstance(payload, dict) else None
+
+            yield collection_values(payload)
+
+            pages += 1
+            if not next_link:
+                break
+            self._store.save(
+                self.job_id, unit_id, {"pages": pages, "next_link": next_link}
+            )
+            response = self.client._make_request("GET", next_link)
+
+        self._store.save(self.job_id, unit_id, {"done": True, "pages": pages})
+
+    def paginate_by_marker(
+        self,
+        unit_id: str,
+        func: Callable[..., Response],
+        *args,
+        marker_key: str = "id",
+        **kwargs,
+    ) -> Iterator[list]:
+        """
+        Yield the items of a marker-paginated endpoint such as
+        users.get_users_by_roles_detailed one page at a time, resuming from the last
+        saved marker if the unit was interrupted.
+        """
+        state = self._store.load(self.job_id, unit_id) or {}
+        if state.get("done"):
+            return
+
+        marker = state.get("marker", kwargs.pop("marker", None))
+        pages = state.get("pages", 0)
+        while True:
+            response = func(self.client, *args, marker=marker, **kwargs)
+            response.raise_for_status()
+            payload = getattr(response, "full_json", None) or response_json(
+                response
+            )
+            values = collection_values(payload)
+            if not values:
+                break
+
+            yield values
+
+            pages += 1
+            next_marker = values[-1].get(marker_key)
+            if next_marker is None or next_marker == marker:
+                break
+            marker = next_marker
+            self._store.save(
+                self.job_id, unit_id, {"pages": pages, "marker": marker}
+            )
+
+        self._store.save(self.job_id, unit_id, {"done": True, "pages": pages})
@@ -0,0 +1,33 @@
+from abc import abstractmethod
+from typing import Optional, Protocol
+
+
+class CheckpointStore(Protocol):
+    """
+    A protocol for checkpoint stores.
+
+    A checkpoint store remembers how far a job got, so that a restarted job can skip
+    the work it already finished. This could involve a file, a database, or just a
+    variable in memory. Implementations must be safe to call from several threads.
+    """
+
+    @abstractmethod
+    def load(self, job_id: str, unit_id: str) -> Optional[dict]:
+        """
+        Get the saved state of a unit of work, or None if nothing has been saved.
+        """
+        ...
+
+    @abstractmethod
+    def save(self, job_id: str, unit_id: str, state: dict) -> None:
+        """
+        Durably persist the state of a unit of work, replacing any previous state.
+        """
+        ...
+
+    @abstractmethod
+    def clear(self, job_id: str) -> None:
+        """
+        Forget every saved state of a job.
+        """
+        ...
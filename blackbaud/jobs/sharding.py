@@ -0,0 +1,324 @@
+import os
+import queue
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import timedelta
+from multiprocessing import Manager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from limits import RateLimitItem
+from limits.storage import MemoryStorage, storage_from_string
+from limits.strategies import MovingWindowRateLimiter
+
+from blackbaud.authentication.managers import FileCredentialManager
+from blackbaud.client import BaseSolutionClient, SKYAPIClient
+from blackbaud.client.rate_limiters.default import STANDARD_TIER
+from blackbaud.jobs.exceptions import ShardFailedError
+
+ShardTask = Callable[[BaseSolutionClient, Any], Iterable[Any]]
+
+# Access tokens are valid for 60 minutes; refresh comfortably before that.
+DEFAULT_TOKEN_REFRESH_INTERVAL = timedelta(minutes=45)
+
+# Set in each worker process by _initialize_worker.
+_worker_client: Optional[BaseSolutionClient] = None
+
+
+def shard_by_role(role_ids: Iterable[int]) -> List[List[int]]:
+    """
+    One shard per role, each a single-element list of role IDs.
+    """
+    return [[role_id] for role_id in role_ids]
+
+
+def shard_by_school_level(school_level_ids: Iterable[int]) -> List[int]:
+    """
+    One shard per school level.
+    """
+    return list(school_level_ids)
+
+
+def user_shard(user_id: int, shard_count: int) -> int:
+    """
+    The shard a user belongs to. Stable across processes and runs, unlike hash().
+    """
+    return user_id % shard_count
+
+
+def shard_by_user_hash(user_ids: Iterable[int], shard_count: int) -> List[List[int]]:
+    """
+    Split user IDs into shard_count lists using user_shard.
+    """
+    shards: List[List[int]] = [[] for _ in range(shard_count)]
+    for user_id in user_ids:
+        shards[user_shard(user_id, shard_count)].append(user_id)
+    return shards
+
+
+class WorkerClientFactory:
+    """
+    Builds a BaseSolutionClient in each worker process of a ShardedRunner, such that
+    all workers share one rate limit budget, one token and one cache:
+
+    - The token lives in a file read through a FileCredentialManager. Workers never
+      refresh it themselves; the runner's token_refresher does, and workers pick the
+      new token up from the file.
+    - Rate limits are enforced in the storage behind rate_limit_storage_uri (for
+      instance "redis://localhost:6379"). Without one, each worker gets an equal
+      slice of every limit, which keeps the total within budget, so every limit has
+      to allow at least one request per process.
+    - The cache backend is shared as long as it is not in-memory. The default SQLite
+      cache file works across processes.
+
+    Instances must be picklable, so pass backends by name rather than as objects.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        subscription_key: str,
+        redirect_uri: str,
+        token_path: str,
+        slug: str = "school",
+        api_version: str = "v1",
+        processes: int = os.cpu_count() or 1,
+        rate_limits: Iterable[RateLimitItem] = STANDARD_TIER,
+        rate_limit_storage_uri: Optional[str] = None,
+        **client_kwargs,
+    ):
+        """
+        :param token_path: The token file shared with the runner's token_refresher.
+        :param processes: The number of worker processes, used to split the rate
+        limits when there is no shared rate limit storage. A ShardedRunner given
+        this factory starts this many processes.
+        :param client_kwargs: Any other SKYAPIClient argument, such as cache_name.
+        :raises ValueError: If there is no shared rate limit storage and a rate
+        limit is too small to split between the processes.
+        """
+        rate_limits = list(rate_limits)
+        if rate_limit_storage_uri is None:
+            too_small = [limit for limit in rate_limits if limit.amount < processes]
+            if too_small:
+                raise ValueError(
+                    f"Cannot split {too_small[0]} between {processes} processes; "
+                    "use fewer processes or a shared rate_limit_storage_uri."
+                )
+        self._client_kwargs = dict(
+            client_id=client_id,
+            client_secret=client_secret,
+            subscription_key=subscription_key,
+            redirect_uri=redirect_uri,
+            **client_kwargs,
+        )
+        self._token_path = token_path
+        self._slug = slug
+        self._api_version = api_version
+        self.processes = processes
+        self._rate_limits = rate_limits
+        self._rate_limit_storage_uri = rate_limit_storage_uri
+
+    def __call__(self) -> BaseSolutionClient:
+        if self._rate_limit_storage_uri is not None:
+            storage = storage_from_string(self._rate_limit_storage_uri)
+            rate_limits = self._rate_limits
+        else:
+            storage = MemoryStorage()
+            rate_limits = [
+                type(limit)(
+                    limit.amount // self.processes,
+                    limit.multiples,
+                    limit.namespace,
+                )
+                for limit in self._rate_limits
+            ]
+
+        client = SKYAPIClient(
+            credential_manager=FileCredentialManager(self._token_path),
+            rate_limiter=MovingWindowRateLimiter(storage=storage),
+            rate_limits=rate_limits,
+            token_refresh_disabled=True,
+            **self._client_kwargs,
+        )
+        return BaseSolutionClient(client, self._slug, self._api_version)
+
+
+def _initialize_worker(client_factory: Callable[[], BaseSolutionClient]) -> None:
+    global _worker_client
+    _worker_client = client_factory()
+
+
+def _run_shard(
+    task: ShardTask,
+    index: int,
+    shard: Any,
+    results: Any,
+    batch_size: int,
+    cancelled: Any,
+) -> None:
+    count = 0
+    batch = []
+    try:
+        if cancelled.is_set():
+            return
+        for record in task(_worker_client, shard):
+            batch.append(record)
+            count += 1
+            if len(batch) >= batch_size:
+                # cancelled is a manager proxy, so checking it is a round trip to
+                # the manager process: it is only checked once per batch.
+                if cancelled.is_set():
+                    return
+                results.put(("records", index, batch))
+                batch = []
+        if batch:
+            results.put(("records", index, batch))
+        results.put(("done", index, count))
+    except Exception:
+        results.put(("failed", index, traceback.format_exc()))
+
+
+class ShardedRunner:
+    """
+    Runs a sync across a pool of processes, one shard at a time per process, and
+    streams every record back to a single writer in the parent process.
+
+    A task is a module-level function taking the worker's client and a shard (see
+    shard_by_role, shard_by_school_level and shard_by_user_hash) and yielding
+    records. Records are sent to the parent in batches through a bounded queue, so a
+    slow writer slows the workers down instead of piling records up in memory.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], BaseSolutionClient],
+        processes: Optional[int] = None,
+        batch_size: int = 500,
+        max_queued_batches: int = 64,
+        token_refresher: Optional[SKYAPIClient] = None,
+        token_refresh_interval: timedelta = DEFAULT_TOKEN_REFRESH_INTERVAL,
+    ):
+        """
+        :param client_factory: A picklable callable that builds a client, called
+        once in every worker process. See WorkerClientFactory.
+        :param processes: The number of worker processes. Defaults to the processes
+        of client_factory if it has them (as WorkerClientFactory does), and to the
+        number of CPUs otherwise.
+        :param batch_size: How many records a worker sends to the writer at once.
+        :param max_queued_batches: How many batches may wait for the writer before
+        workers block.
+        :param token_refresher: A client in the parent process, sharing its token
+        file with the workers, that keeps the token fresh during long runs.
+        :param token_refresh_interval: How often token_refresher refreshes.
+        """
+        factory_processes = getattr(client_factory, "processes", None)
+        if processes is None:
+            processes = factory_processes or os.cpu_count() or 1
+        elif factory_processes is not None and processes != factory_processes:
+            raise ValueError(
+                f"processes is {processes} but the client factory splits its rate "
+                f"limits between {factory_processes} processes."
+            )
+        self._client_factory = client_factory
+        self._processes = processes
+        self._batch_size = batch_size
+        self._max_queued_batches = max_queued_batches
+        self._token_refresher = token_refresher
+        self._token_refresh_interval = token_refresh_interval.total_seconds()
+
+    def run(
+        self,
+        task: ShardTask,
+        shards: Iterable[Any],
+        writer: Callable[[list], None],
+    ) -> Dict[int, int]:
+        """
+        Run task on every shard and pass each batch of records to writer as it
+        arrives. Returns the number of records produced by each shard, by index.
+
+        If writer raises, the workers are stopped and the exception is raised
+        once they have.
+
+        :raises ShardFailedError: If any shard raised. Records from the other
+        shards have all been written by then.
+        """
+        shards = list(shards)
+        counts: Dict[int, int] = {}
+        errors: Dict[int, str] = {}
+        last_refresh = time.monotonic()
+
+        with Manager() as manager:
+            results = manager.Queue(maxsize=self._max_queued_batches)
+            cancelled = manager.Event()
+            with ProcessPoolExecutor(
+                max_workers=self._processes,
+                initializer=_initialize_worker,
+                initargs=(self._client_factory,),
+            ) as executor:
+                futures = {
+                    index: executor.submit(
+                        _run_shard,
+                        task,
+                        index,
+                        shard,
+                        results,
+                        self._batch_size,
+                        cancelled,
+                    )
+                    for index, shard in enumerate(shards)
+                }
+
+                try:
+                    while len(counts) + len(errors) < len(shards):
+                        if (
+                            self._token_refresher is not None
+                            and time.monotonic() - last_refresh
+                            > self._token_refresh_interval
+                        ):
+                            self._token_refresher.refresh_token()
+                            last_refresh = time.monotonic()
+
+                        try:
+                            kind, index, payload = results.get(timeout=1)
+                        except queue.Empty:
+                            # A worker that died outright never reports back.
+                            for index, future in futures.items():
+                                if (
+                                    future.done()
+                                    and future.exception() is not None
+                                    and index not in errors
+                                ):
+                                    errors[index] = repr(future.exception())
+                            continue
+
+                        if kind == "records":
+                            writer(payload)
+                        elif kind == "done":
+                            counts[index] = payload
+                        else:
+                            errors[index] = payload
+                except BaseException:
+                    self._stop_workers(list(futures.values()), results, cancelled)
+                    raise
+
+        if errors:
+            raise ShardFailedError(errors)
+
+        return counts
+
+    @staticmethod
+    def _stop_workers(futures: List[Future], results: Any, cancelled: Any) -> None:
+        """
+        Stop the shards that have not started, have the running ones return, and
+        keep emptying the queue until they have, so that none is left blocked on a
+        full queue and the pool can shut down.
+        """
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+        while not all(future.done() for future in futures):
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
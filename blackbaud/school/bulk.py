@@ -0,0 +1,513 @@
+import math
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from time import sleep
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import requests
+from requests import Response
+
+from blackbaud.client import BaseSolutionClient, collection_values
+from blackbaud.client.concurrency import DEFAULT_MAX_WORKERS, map_concurrently
+from blackbaud.client.serialization import response_json
+from blackbaud.school.endpoints import academics, attendance
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+INVALID = "invalid"
+DUPLICATE = "duplicate"
+
+
+@dataclass(frozen=True)
+class GroupResult:
+    """
+    Placeholder for a keyword argument of a WriteOperation that is only known once
+    an earlier operation in the same group has run, such as the ID returned by
+    create_user, which the following create_user_phone calls need.
+
+    Resolves to the decoded JSON body of the operation at position in the group
+    (the first one by default), passed through transform if given.
+    """
+
+    position: int = 0
+    transform: Optional[Callable[[Any], Any]] = None
+
+    def resolve(self, history: List[Any]) -> Any:
+        value = history[self.position]
+        return self.transform(value) if self.transform else value
+
+
+@dataclass
+class WriteOperation:
+    """
+    A single call to a write endpoint function, e.g.
+    WriteOperation(users.create_user_phone, {"user_id": 1, ...}, group=1).
+
+    Operations that share a group run one after another in the order they were
+    given; if one fails, the rest of its group is skipped. Operations in different
+    groups, or without a group, run concurrently.
+    """
+
+    func: Callable[..., Response]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    group: Optional[Hashable] = None
+
+
+@dataclass
+class WriteResult:
+    index: int
+    operation: WriteOperation
+    status: str
+    response: Optional[Response] = None
+    value: Any = None
+    error: Optional[str] = None
+    history: List[Any] = field(default_factory=list, repr=False)
+
+
+@dataclass
+class BulkWriteReport:
+    results: List[WriteResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[WriteResult]:
+        return [result for result in self.results if result.status == SUCCEEDED]
+
+    @property
+    def failed(self) -> List[WriteResult]:
+        return [result for result in self.results if result.status == FAILED]
+
+    @property
+    def skipped(self) -> List[WriteResult]:
+        return [result for result in self.results if result.status == SKIPPED]
+
+    def by_status(self, status: str) -> List[WriteResult]:
+        return [result for result in self.results if result.status == status]
+
+
+def write_in_bulk(
+    client: BaseSolutionClient,
+    operations: Iterable[WriteOperation],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_pending: Optional[int] = None,
+    **request_kwargs,
+) -> BulkWriteReport:
+    """
+    Runs a stream of write operations concurrently, within the client's rate limits,
+    and returns a report of every operation's outcome in input order.
+
+    Operations are consumed lazily, with at most max_pending (twice max_workers by
+    default) in flight or waiting, so the stream can be arbitrarily long. Ordering
+    is only guaranteed within a group; see WriteOperation.
+
+    A failure never stops the run: an operation fails when its function raises or
+    returns an error status, and is then recorded in the report together with the
+    operations of its group that were skipped as a result.
+
+    Any other keyword arguments are passed to every operation's function, e.g.
+    priority or timeout, unless the operation sets them itself.
+    """
+    if max_pending is None:
+        max_pending = max_workers * 2
+
+    report = BulkWriteReport()
+    last_in_group: Dict[Hashable, Future] = {}
+
+    def collect(future: Future) -> None:
+        result = future.result()
+        group = result.operation.group
+        if last_in_group.get(group) is future:
+            del last_in_group[group]
+        report.results.append(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def after(previous: Future, index: int, operation: WriteOperation) -> Future:
+            # Submitted once the previous operation of its group is done, rather than
+            # tying up a worker thread waiting for it.
+            future: Future = Future()
+
+            def submit(done: Future) -> None:
+                chained = executor.submit(
+                    _execute, client, index, operation, done.result(), request_kwargs
+                )
+                chained.add_done_callback(lambda ran: future.set_result(ran.result()))
+
+            previous.add_done_callback(submit)
+            return future
+
+        pending: Deque[Future] = deque()
+        for index, operation in enumerate(operations):
+            previous = (
+                last_in_group.get(operation.group)
+                if operation.group is not None
+                else None
+            )
+            if previous is None:
+                future = executor.submit(
+                    _execute, client, index, operation, None, request_kwargs
+                )
+            else:
+                future = after(previous, index, operation)
+            if operation.group is not None:
+                last_in_group[operation.group] = future
+            pending.append(future)
+            if len(pending) >= max_pending:
+                collect(pending.popleft())
+
+        while pending:
+            collect(pending.popleft())
+
+    return report
+
+
+def _execute(
+    client: BaseSolutionClient,
+    index: int,
+    operation: WriteOperation,
+    previous_result: Optional[WriteResult],
+    request_kwargs: Dict[str, Any],
+) -> WriteResult:
+    history: List[Any] = []
+    if previous_result is not None:
+        if previous_result.status != SUCCEEDED:
+            return WriteResult(
+                index,
+                operation,
+                SKIPPED,
+                error=f"An earlier operation in group {operation.group!r} did not "
+                "succeed.",
+            )
+        history = previous_result.history
+
+    try:
+        kwargs = dict(request_kwargs)
+        kwargs.update(
+            (name, value.resolve(history) if isinstance(value, GroupResult) else value)
+            for name, value in operation.kwargs.items()
+        )
+        response = operation.func(client, **kwargs)
+    except Exception as e:
+        return WriteResult(index, operation, FAILED, error=repr(e))
+
+    if not response.ok:
+        return WriteResult(
+            index,
+            operation,
+            FAILED,
+            response=response,
+            error=f"{response.status_code} {response.reason}: {response.text}",
+        )
+
+    try:
+        value = response_json(response) if response.content else None
+    except ValueError:
+        value = response.text
+    return WriteResult(
+        index,
+        operation,
+        SUCCEEDED,
+        response=response,
+        value=value,
+        history=history + [value],
+    )
+
+
+# Conservative defaults for a single academics/sections/students request: the
+# number of enrollments it creates, and the length of each comma-separated ID list.
+DEFAULT_MAX_ENROLLMENTS_PER_REQUEST = 1000
+DEFAULT_MAX_IDS_PER_REQUEST = 200
+
+# How often a block that failed with a 429, a 5xx or a connection error is sent
+# again, and how many seconds to wait before the first retry.
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 1.0
+
+
+@dataclass
+class BulkEnrollmentReport:
+    enrolled: Set[Tuple[int, int]] = field(default_factory=set)
+    failed: Dict[Tuple[int, int], str] = field(default_factory=dict)
+    requests: int = 0
+
+
+def enroll_students_in_bulk(
+    client: BaseSolutionClient,
+    duration_id: int,
+    enrollment_date: datetime,
+    section_ids: Iterable[int],
+    user_ids: Iterable[int],
+    max_enrollments_per_request: int = DEFAULT_MAX_ENROLLMENTS_PER_REQUEST,
+    max_ids_per_request: int = DEFAULT_MAX_IDS_PER_REQUEST,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    **request_kwargs,
+) -> BulkEnrollmentReport:
+    """
+    Enrolls every user into every section, like enroll_students_into_sections, but
+    for arbitrarily large batches.
+
+    The section x user grid is cut into the fewest blocks that respect the
+    per-request limits, and the blocks are submitted concurrently. A block that is
+    rejected (a 4xx other than 429) is split in half along its longer side and each
+    half retried, down to single enrollments, so that a bad ID only fails the
+    enrollments it is part of. A block that fails for a reason that may pass (a 429,
+    a 5xx or a connection error) is sent again as it is, up to max_retries times,
+    after the response's Retry-After or else retry_backoff seconds, doubled after
+    every attempt. The report lists the (section_id, user_id) pairs that were
+    enrolled and the reason each remaining pair failed.
+
+    Any other keyword arguments are passed to every request, e.g. priority or
+    timeout.
+    """
+    section_ids = list(dict.fromkeys(section_ids))
+    user_ids = list(dict.fromkeys(user_ids))
+    report = BulkEnrollmentReport()
+    if not section_ids or not user_ids:
+        return report
+
+    sections_per_block, users_per_block = _enrollment_block_size(
+        len(section_ids),
+        len(user_ids),
+        max_enrollments_per_request,
+        max_ids_per_request,
+    )
+    blocks = [
+        (
+            section_ids[i : i + sections_per_block],
+            user_ids[j : j + users_per_block],
+        )
+        for i in range(0, len(section_ids), sections_per_block)
+        for j in range(0, len(user_ids), users_per_block)
+    ]
+    lock = threading.Lock()
+
+    def send(sections: List[int], users: List[int]) -> Tuple[Optional[str], bool]:
+        """
+        Enroll a block, retrying transient failures. Returns the error, if any, and
+        whether the block was rejected for its contents.
+        """
+        for attempt in range(max_retries + 1):
+            delay = retry_backoff * 2**attempt
+            try:
+                response = academics.enroll_students_into_sections(
+                    client,
+                    duration_id,
+                    enrollment_date,
+                    sections,
+                    users,
+                    **request_kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = repr(e)
+            except Exception as e:
+                return repr(e), False
+            else:
+                with lock:
+                    report.requests += 1
+                if response.ok:
+                    return None, False
+                error = f"{response.status_code} {response.reason}: {response.text}"
+                if response.status_code < 500 and response.status_code != 429:
+                    return error, True
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+            if attempt < max_retries:
+                sleep(delay)
+        return error, False
+
+    def submit(block: Tuple[List[int], List[int]]) -> None:
+        sections, users = block
+        error, rejected = send(sections, users)
+        single = len(sections) == 1 and len(users) == 1
+        if error is None or not rejected or single:
+            with lock:
+                if error is None:
+                    report.enrolled.update((s, u) for s in sections for u in users)
+                else:
+                    report.failed.update(
+                        ((s, u), error) for s in sections for u in users
+                    )
+            return
+
+        if len(sections) >= len(users):
+            middle = len(sections) // 2
+            halves = [(sections[:middle], users), (sections[middle:], users)]
+        else:
+            middle = len(users) // 2
+            halves = [(sections, users[:middle]), (sections, users[middle:])]
+        for half in halves:
+            submit(half)
+
+    for _ in map_concurrently(submit, blocks, max_workers=max_workers):
+        pass
+
+    return report
+
+
+def _enrollment_block_size(
+    section_count: int,
+    user_count: int,
+    max_enrollments: int,
+    max_ids: int,
+) -> Tuple[int, int]:
+    """
+    Returns the (sections, users) block size that covers the grid in the fewest
+    requests without exceeding either limit.
+    """
+    best = (1, 1)
+    best_requests = section_count * user_count
+    for sections in range(1, min(section_count, max_ids, max_enrollments) + 1):
+        users = min(user_count, max_ids, max_enrollments // sections)
+        requests = math.ceil(section_count / sections) * math.ceil(user_count / users)
+        if requests < best_requests:
+            best, best_requests = (sections, users), requests
+    return best
+
+
+ATTENDANCE_RECORD_FIELDS = (
+    "user_id",
+    "start_date",
+    "end_date",
+    "specify_time",
+    "excuse_type",
+    "excuse_comment",
+)
+
+
+def attendance_key(user_id: Any, day: date) -> Hashable:
+    """
+    The default identity of an attendance record: one record per student per day.
+    """
+    return (int(user_id), day)
+
+
+def submit_attendance_records(
+    client: BaseSolutionClient,
+    records: Iterable[dict],
+    school_level_id: Optional[int] = None,
+    offering_type: Optional[int] = None,
+    key: Callable[[Any, date], Hashable] = attendance_key,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    **request_kwargs,
+) -> BulkWriteReport:
+    """
+    Creates many attendance records at once and reports the outcome of each one, in
+    input order.
+
+    records is an iterable of create_attendance_record keyword arguments, or a
+    pandas DataFrame with those columns. Before anything is sent:
+
+    - records with missing, unknown or inconsistent fields are reported as invalid;
+    - repeats within records are reported as duplicates;
+    - when school_level_id and offering_type are given, the existing records of
+      every day involved are fetched, and records that already exist are reported
+      as duplicates too.
+
+    Two records are the same when key(user_id, day) is equal; by default that is
+    one record per student per day. The rest are submitted concurrently through
+    write_in_bulk.
+
+    Any other keyword arguments are passed to every request, e.g. priority or
+    timeout.
+    """
+    if hasattr(records, "to_dict"):
+        # Drop the NaN/NaT cells pandas uses for missing values (they are the only
+        # values not equal to themselves).
+        records = [
+            {name: value for name, value in row.items() if value == value}
+            for row in records.to_dict("records")
+        ]
+    records = list(records)
+
+    results: Dict[int, WriteResult] = {}
+    candidates = []
+    for index, record in enumerate(records):
+        operation = WriteOperation(attendance.create_attendance_record, dict(record))
+        error = _validate_attendance_record(record)
+        if error is not None:
+            results[index] = WriteResult(index, operation, INVALID, error=error)
+        else:
+            candidates.append((index, operation))
+
+    seen = set()
+    if school_level_id is not None and offering_type is not None:
+        days = sorted({op.kwargs["start_date"].date() for _, op in candidates})
+
+        def fetch_existing(day: date) -> List[Hashable]:
+            response = attendance.get_attendance_records(
+                client,
+                school_level_id,
+                datetime.combine(day, time()),
+                offering_type,
+                **request_kwargs,
+            )
+            response.raise_for_status()
+            keys = []
+            for row in collection_values(response_json(response)):
+                user_id = row.get("student_user_id", row.get("user_id"))
+                # A row without a student cannot match any record.
+                if user_id is not None:
+                    keys.append(key(user_id, day))
+            return keys
+
+        for existing in map_concurrently(fetch_existing, days, max_workers=max_workers):
+            seen.update(existing)
+
+    to_submit = []
+    for index, operation in candidates:
+        record_key = key(
+            operation.kwargs["user_id"], operation.kwargs["start_date"].date()
+        )
+        if record_key in seen:
+            results[index] = WriteResult(
+                index, operation, DUPLICATE, error="Attendance already recorded."
+            )
+        else:
+            seen.add(record_key)
+            to_submit.append((index, operation))
+
+    submitted = write_in_bulk(
+        client,
+        (operation for _, operation in to_submit),
+        max_workers=max_workers,
+        **request_kwargs,
+    )
+    for (index, _), result in zip(to_submit, submitted.results):
+        result.index = index
+        results[index] = result
+
+    return BulkWriteReport([results[index] for index in range(len(records))])
+
+
+def _validate_attendance_record(record: dict) -> Optional[str]:
+    unknown_fields = set(record) - set(ATTENDANCE_RECORD_FIELDS)
+    if unknown_fields:
+        return f"Unknown fields: {', '.join(sorted(unknown_fields))}"
+    if record.get("user_id") is None:
+        return "user_id is required."
+    if not isinstance(record.get("start_date"), datetime):
+        return "start_date must be a datetime."
+    end_date = record.get("end_date")
+    if end_date is not None:
+        if not isinstance(end_date, datetime):
+            return "end_date must be a datetime."
+        if end_date < record["start_date"]:
+            return "end_date must not be before start_date."
+    return None
@@ -1,9 +1,26 @@
-from datetime import datetime
-from typing import Iterable, Literal, Optional
+import json
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Tuple,
+)
 
 from requests import Response
 
-from blackbaud.client import BaseSolutionClient
+from blackbaud.client import BaseSolutionClient, collection_values
+from blackbaud.client.concurrency import DEFAULT_MAX_WORKERS, map_concurrently
+from blackbaud.client.serialization import response_json
+
+# The enrollment changes endpoint silently truncates anything longer than this.
+ENROLLMENT_CHANGES_MAX_WINDOW = timedelta(days=30)
+# The field of an enrollment change that holds when the change was made.
+ENROLLMENT_CHANGE_DATE_FIELD = "change_date"
 
 
 def get_assignments_by_section(
@@ -332,13 +349,84 @@ def get_enrollment_changes(
         "GET",
         "academics/enrollments/changes",
         params={
-            "start_date": start_date,
-            "end_date": end_date,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat() if end_date else None,
         },
         **request_kwargs,
     )
 
 
+def scan_enrollment_changes(
+    client: BaseSolutionClient,
+    start_date: datetime,
+    end_date: Optional[datetime] = None,
+    key: Optional[Callable[[dict], Hashable]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    date_field: str = ENROLLMENT_CHANGE_DATE_FIELD,
+    **request_kwargs,
+) -> Iterator[dict]:
+    """
+    Yields every enrollment change between start_date and end_date (or now), however
+    long the range is.
+
+    The range is split into windows no longer than the 30 days get_enrollment_changes
+    accepts, the windows are fetched concurrently, and records are yielded window by
+    window in chronological order. Within a window, records are sorted by the time
+    in date_field, as the API returns them in no particular order; records without
+    a readable time come last, in the order they were returned. Records that appear
+    in more than one window (the boundaries are inclusive) are only yielded once; by
+    default two records are the same if all their fields are equal, pass key to
+    deduplicate on something else.
+    """
+    if end_date is None:
+        end_date = datetime.now(tz=start_date.tzinfo)
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date.")
+    if key is None:
+        key = _record_key
+
+    windows = []
+    window_start = start_date
+    while True:
+        window_end = min(window_start + ENROLLMENT_CHANGES_MAX_WINDOW, end_date)
+        windows.append((window_start, window_end))
+        if window_end >= end_date:
+            break
+        window_start = window_end
+
+    def fetch_window(window):
+        response = get_enrollment_changes(client, *window, **request_kwargs)
+        response.raise_for_status()
+        records = collection_values(response_json(response))
+        return sorted(records, key=lambda record: _change_time(record, date_field))
+
+    seen = set()
+    for records in map_concurrently(fetch_window, windows, max_workers=max_workers):
+        for record in records:
+            record_key = key(record)
+            if record_key in seen:
+                continue
+            seen.add(record_key)
+            yield record
+
+
+def _record_key(record: Any) -> Hashable:
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+def _change_time(record: dict, date_field: str) -> Tuple[int, float]:
+    value = record.get(date_field)
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            # fromisoformat only reads the Z suffix from Python 3.11.
+            value = value[:-1] + "+00:00"
+        try:
+            return 0, datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return 1, 0.0
+
+
 def get_students_by_section(
     client: BaseSolutionClient,
     section_id: int,
@@ -1,9 +1,14 @@
+import itertools
+from datetime import date as date_type
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple, Union
 
 from requests import Response
+from requests_cache import NEVER_EXPIRE
 
-from blackbaud.client import BaseSolutionClient
+from blackbaud.client import BaseSolutionClient, collection_values
+from blackbaud.client.concurrency import DEFAULT_MAX_WORKERS, map_concurrently
+from blackbaud.client.serialization import response_json
 
 
 def get_attendance_records(
@@ -31,6 +36,64 @@ def get_attendance_records(
     )
 
 
+class AttendanceQuery(NamedTuple):
+    """
+    The parameters of the get_attendance_records call a record came from.
+    """
+
+    school_level_id: int
+    date: Union[datetime, date_type]
+    offering_type: int
+
+
+def iterate_attendance_records(
+    client: BaseSolutionClient,
+    school_level_ids: Iterable[int],
+    dates: Iterable[Union[datetime, date_type]],
+    offering_types: Iterable[int],
+    excuse_type: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    **request_kwargs,
+) -> Iterator[Tuple[AttendanceQuery, dict]]:
+    """
+    Fetches the attendance records of every combination of school level, date and
+    offering type concurrently, and yields (query, record) pairs in the order of
+    the combinations.
+
+    Attendance for days before today does not change, so those responses are
+    cached without expiry and repeated reports over the same days cost nothing.
+    """
+    today = date_type.today()
+    queries = [
+        AttendanceQuery(school_level_id, day, offering_type)
+        for school_level_id, day, offering_type in itertools.product(
+            school_level_ids, dates, offering_types
+        )
+    ]
+
+    def fetch(query: AttendanceQuery) -> list:
+        day = query.date.date() if isinstance(query.date, datetime) else query.date
+        kwargs = dict(request_kwargs)
+        if day < today:
+            kwargs.setdefault("expire_after", NEVER_EXPIRE)
+        response = get_attendance_records(
+            client,
+            query.school_level_id,
+            query.date,
+            query.offering_type,
+            excuse_type=excuse_type,
+            **kwargs,
+        )
+        response.raise_for_status()
+        return collection_values(response_json(response))
+
+    for query, records in zip(
+        queries, map_concurrently(fetch, queries, max_workers=max_workers)
+    ):
+        for record in records:
+            yield query, record
+
+
 def create_attendance_record(
     client: BaseSolutionClient,
     user_id: int,
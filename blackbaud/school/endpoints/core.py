@@ -1,8 +1,11 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
 from requests import Response
 
 from blackbaud.client import BaseSolutionClient, paginated_response
+from blackbaud.client.serialization import response_json
+from blackbaud.client.streaming import LIST_ROW_ITEMS, stream_request
 
 
 @paginated_response
@@ -178,7 +181,61 @@ def get_list_page_contents(
     get_list_page, but returns the contents of the page instead of the response object.
     https://developer.sky.blackbaud.com/docs/services/school/operations/V1ListsAdvancedByList_idGet
     """
-    return get_list_page(client, list_id, page, page_size, **request_kwargs).json()
+    response = get_list_page(client, list_id, page, page_size, **request_kwargs)
+    return response_json(response)
+
+
+def iterate_list_pages(
+    client: BaseSolutionClient,
+    list_id: int,
+    page: int = 1,
+    page_size: int = 1000,
+    **request_kwargs,
+) -> Iterator[Tuple[int, dict]]:
+    """
+    Yields (page number, page contents) for every page of a basic or advanced list,
+    starting at page, fetching each page only when the previous one has been
+    consumed.
+    https://developer.sky.blackbaud.com/docs/services/school/operations/V1ListsAdvancedByList_idGet
+    """
+    while True:
+        response = get_list_page(client, list_id, page, page_size, **request_kwargs)
+        response.raise_for_status()
+        payload = response_json(response)
+        if not isinstance(payload, dict):
+            return
+        yield page, payload
+        if payload["count"] < page_size:
+            return
+        page += 1
+
+
+def stream_list_rows(
+    client: BaseSolutionClient,
+    list_id: int,
+    page: int = 1,
+    page_size: int = 1000,
+    **request_kwargs,
+) -> Iterator[dict]:
+    """
+    Yields every row of a basic or advanced list, one row at a time, decoding each
+    page while it is still being received rather than after it has been downloaded.
+    https://developer.sky.blackbaud.com/docs/services/school/operations/V1ListsAdvancedByList_idGet
+    """
+    while True:
+        row_count = 0
+        for row in stream_request(
+            client,
+            f"lists/advanced/{list_id}",
+            LIST_ROW_ITEMS,
+            params={"page": page, "page_size": page_size},
+            **request_kwargs,
+        ):
+            row_count += 1
+            yield row
+        if row_count < page_size:
+            return
+        page += 1
 
 
 def get_full_list_contents(
@@ -200,24 +257,12 @@ def get_full_list_contents(
         "page": page,
     }
 
-    while True:
-        response = client._make_request(
-            "GET",
-            f"lists/advanced/{list_id}",
-            params={
-                "page": full_list["page"],
-                "page_size": page_size,
-            },
-            **request_kwargs,
-        )
-        response.raise_for_status()
-        response_json = response.json()
-        if isinstance(response_json, dict):
-            full_list["count"] += response_json["count"]
-            full_list["results"]["rows"].extend(response_json["results"]["rows"])
-            if response_json["count"] < page_size:
-                break
-            full_list["page"] += 1
+    for page_number, contents in iterate_list_pages(
+        client, list_id, page, page_size, **request_kwargs
+    ):
+        full_list["page"] = page_number
+        full_list["count"] += contents["count"]
+        full_list["results"]["rows"].extend(contents["results"]["rows"])
 
     return full_list
 
@@ -232,6 +277,135 @@ def convert_advanced_list_to_dicts(advanced_list: dict) -> List[dict]:
     ]
 
 
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, str) and value.endswith("Z"):
+        # fromisoformat only reads the Z suffix from Python 3.11.
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+# Converters for the value types advanced list columns declare, by lowercase name.
+# Values of any other type are left as the strings the API returns.
+_LIST_VALUE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "int": int,
+    "int16": int,
+    "int32": int,
+    "int64": int,
+    "long": int,
+    "decimal": float,
+    "double": float,
+    "single": float,
+    "float": float,
+    "money": float,
+    "bool": lambda value: str(value).lower() in ("true", "1", "yes"),
+    "boolean": lambda value: str(value).lower() in ("true", "1", "yes"),
+    "bit": lambda value: str(value).lower() in ("true", "1", "yes"),
+    "date": _parse_datetime,
+    "datetime": _parse_datetime,
+}
+
+
+def convert_advanced_list_to_columns(
+    advanced_list: dict,
+    output: Literal["dict", "numpy", "pandas", "arrow"] = "dict",
+) -> Any:
+    """
+    Converts an advanced list response to column-oriented data: one list of values
+    per column, keyed by column name, in row order.
+
+    This avoids building a dict per row, which dominates memory use for large
+    lists. The column layout is read from the first row and reused for every row
+    with the same layout. Values are converted to the type each column declares,
+    when it declares one that is known; in such columns, empty cells and values
+    that cannot be converted become None, so each column holds a single type.
+
+    output selects the container returned: a dict of lists, a dict of NumPy
+    arrays, a pandas DataFrame or a pyarrow Table. The last three need the
+    corresponding package to be installed.
+    """
+    rows = advanced_list["results"]["rows"]
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    converters: List[Optional[Callable[[Any], Any]]] = []
+    columns: List[list] = []
+    row_count = 0
+
+    def add_column(column: dict) -> None:
+        index[column["name"]] = len(names)
+        names.append(column["name"])
+        converters.append(_LIST_VALUE_CONVERTERS.get(str(column.get("type")).lower()))
+        columns.append([None] * row_count)
+
+    for row in rows:
+        row_columns = row["columns"]
+        if [column["name"] for column in row_columns] == names:
+            for column, values, converter in zip(row_columns, columns, converters):
+                value = column.get("value")
+                values.append(
+                    value
+                    if converter is None
+                    else _convert_list_value(value, converter)
+                )
+        else:
+            for column in row_columns:
+                if column["name"] not in index:
+                    add_column(column)
+            for values in columns:
+                values.append(None)
+            for column in row_columns:
+                position = index[column["name"]]
+                columns[position][-1] = _convert_list_value(
+                    column.get("value"), converters[position]
+                )
+        row_count += 1
+
+    data = dict(zip(names, columns))
+    if output == "dict":
+        return data
+    if output == "numpy":
+        np = _import_optional("numpy")
+        return {name: _to_numpy_array(np, values) for name, values in data.items()}
+    if output == "pandas":
+        return _import_optional("pandas").DataFrame(data, columns=names)
+    if output == "arrow":
+        return _import_optional("pyarrow").table(data)
+    raise ValueError(f"Unknown output: {output!r}")
+
+
+def _convert_list_value(value: Any, converter: Optional[Callable[[Any], Any]]) -> Any:
+    if converter is None:
+        return value
+    if value is None or value == "":
+        return None
+    try:
+        return converter(value)
+    except (ValueError, TypeError):
+        return None
+
+
+
+def _to_numpy_array(np: Any, values: list) -> Any:
+    if any(value is None for value in values) and all(
+        isinstance(value, (int, float, type(None))) and not isinstance(value, bool)
+        for value in values
+    ):
+        # Missing numbers become NaN rather than forcing an object array.
+        return np.array(
+            [np.nan if value is None else value for value in values], dtype=float
+        )
+    return np.array(values)
+
+
+def _import_optional(module_name: str) -> Any:
+    try:
+        return __import__(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"{module_name} is required for this output, install it with "
+            f"`pip install {module_name}`."
+        ) from e
+
+
 def get_directories(client: BaseSolutionClient, **request_kwargs) -> Response:
     """
     Returns a collection of directories the authorized user has access to.
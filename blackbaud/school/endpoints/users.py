@@ -1,12 +1,13 @@
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-import json
-from typing import Iterable, List, Optional, Union
+import inspect
+from typing import Any, Iterable, Iterator, List, Optional, Union
 
 from requests import Response
 
-from blackbaud.client import BaseSolutionClient, paginated_response
+from blackbaud.client import BaseSolutionClient, paginated_response, serialization
+from blackbaud.client.streaming import stream_request
 
 
 def get_self(
@@ -97,6 +98,34 @@ def get_users_by_roles_detailed(
     )
 
 
+def stream_users_by_roles_detailed(
+    client: BaseSolutionClient,
+    role_ids: Iterable[int],
+    marker: Optional[int] = None,
+    **request_kwargs,
+) -> Iterator[dict]:
+    """
+    Yields the extended details of every user with the given roles, one user at a
+    time, decoding each page of 1000 users while it is still being received rather
+    than after it has been downloaded.
+    """
+    # Joined once, as role_ids may be a one-shot iterator.
+    base_role_ids = ",".join(map(str, role_ids))
+    while True:
+        last_id = None
+        for user in stream_request(
+            client,
+            "users/extended",
+            params={"base_role_ids": base_role_ids, "marker": marker},
+            **request_kwargs,
+        ):
+            last_id = user.get("id")
+            yield user
+        if last_id is None or last_id == marker:
+            return
+        marker = last_id
+
+
 def audit_users_by_role(
     client: BaseSolutionClient,
     role_id: int,
@@ -194,7 +223,7 @@ def create_user(
         "greeting": greeting,
         "gender": gender,
         "pronouns": pronouns,
-        "birth_date": birth_date.isoformat() if birth_date else None,
+        "birth_date": birth_date,
         "deceased": deceased,
         "email": email,
         "email_active": email_active,
@@ -215,7 +244,7 @@ def create_user(
     return client._make_request(
         "POST",
         "users",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
         **request_kwargs,
     )
 
@@ -272,7 +301,7 @@ def update_user(
         "greeting": greeting,
         "gender": gender,
         "pronouns": pronouns,
-        "birth_date": birth_date.isoformat() if birth_date else None,
+        "birth_date": birth_date,
         "deceased": deceased,
         "email": email,
         "email_active": email_active,
@@ -291,12 +320,105 @@ def update_user(
         "fields_to_delete": fields_to_delete,
     }
 
-    return client._make_request(
+    response = client._make_request(
         "PATCH",
         "users",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
         **request_kwargs,
     )
+    if response.ok:
+        # Cached copies of the user no longer match it.
+        client._uncache(f"users/{user_id}", f"users/extended/{user_id}")
+    return response
+
+
+# update_user keyword arguments whose API field names differ from the argument name.
+_USER_FIELD_NAMES = {"preferred_last_name": "preferred_lastname"}
+
+# The keyword arguments of update_user that describe the user.
+USER_FIELDS = tuple(
+    name
+    for name in inspect.signature(update_user).parameters
+    if name not in ("client", "user_id", "fields_to_delete", "request_kwargs")
+)
+
+
+def diff_user(last_known: dict, **fields) -> dict:
+    """
+    Compares the desired values of a user's fields, given as update_user keyword
+    arguments, with a record of the user as returned by the API (or a mirror of
+    it). Returns only the fields whose values differ. Fields that are None are
+    ignored, as update_user would not send them anyway.
+    """
+    unknown_fields = set(fields) - set(USER_FIELDS)
+    if unknown_fields:
+        raise TypeError(f"Unknown user fields: {', '.join(sorted(unknown_fields))}")
+
+    return {
+        name: value
+        for name, value in fields.items()
+        if value is not None
+        and not _same_value(value, last_known.get(_USER_FIELD_NAMES.get(name, name)))
+    }
+
+
+def update_user_if_changed(
+    client: BaseSolutionClient,
+    user_id: int,
+    last_known: Optional[dict] = None,
+    fields_to_delete: Optional[List[str]] = None,
+    **request_kwargs,
+) -> Optional[Response]:
+    """
+    Updates a user, sending only the fields that differ from its last known state.
+    Returns None without making a request if nothing would change.
+
+    The desired values are given as update_user keyword arguments; any other keyword
+    arguments are passed on to the requests made, e.g. priority or timeout.
+
+    last_known is the user as returned by get_user_by_id, for instance from
+    SchoolMirror.get_user. If it is not given, the user is fetched from the API,
+    bypassing the cache, so that changes made in Blackbaud since are not missed.
+    fields_to_delete only counts as a change for fields that currently have a value.
+    """
+    fields = {
+        name: request_kwargs.pop(name) for name in USER_FIELDS if name in request_kwargs
+    }
+    if last_known is None:
+        response = get_user_by_id(
+            client, user_id, **dict(request_kwargs, force_refresh=True)
+        )
+        response.raise_for_status()
+        last_known = serialization.response_json(response)
+
+    changed = diff_user(last_known, **fields)
+    fields_to_delete = [
+        name
+        for name in fields_to_delete or []
+        if last_known.get(_USER_FIELD_NAMES.get(name, name)) not in (None, "")
+    ]
+    if not changed and not fields_to_delete:
+        return None
+
+    return update_user(
+        client,
+        user_id,
+        fields_to_delete=fields_to_delete or None,
+        **changed,
+        **request_kwargs,
+    )
+
+
+def _same_value(desired: Any, current: Any) -> bool:
+    if isinstance(desired, (datetime, date)):
+        # The API reports dates as ISO 8601 strings, with or without a time.
+        if current is None:
+            return False
+        desired_date = (
+            desired.date() if isinstance(desired, datetime) else desired
+        ).isoformat()
+        return str(current)[:10] == desired_date
+    return desired == current
 
 
 def get_user_address_types(client: BaseSolutionClient, **request_kwargs) -> Response:
@@ -348,7 +470,7 @@ def create_user_address(
     return client._make_request(
         "POST",
         f"users/{user_id}/addresses",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
         **request_kwargs,
     )
 
@@ -398,7 +520,7 @@ def update_user_address(
     return client._make_request(
         "PATCH",
         f"users/{user_id}/addresses/{address_id}",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
         **request_kwargs,
     )
 
@@ -822,7 +944,7 @@ def create_user_occupation(
     return client._make_request(
         "POST",
         f"users/{user_id}/occupations",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
         **request_kwargs,
     )
 
@@ -872,7 +994,7 @@ def update_user_occupation(
     return client._make_request(
         "PATCH",
         f"users/{user_id}/occupations/{occupation_id}",
-        data=json.dumps({k: v for k, v in data.items() if v is not None}),
+        data=serialization.dumps({k: v for k, v in data.items() if v is not None}),
     )
 
 
@@ -932,7 +1054,7 @@ def create_user_phone(
     return client._make_request(
         "POST",
         f"users/{user_id}/phones",
-        data=json.dumps({
+        data=serialization.dumps({
             "type_id": phone_type_id,
             "number": phone_number,
         }),
@@ -959,7 +1081,7 @@ def update_user_phone(
     return client._make_request(
         "PATCH",
         f"users/{user_id}/phones/{phone_id}",
-        data=json.dumps({
+        data=serialization.dumps({
             "type_id": phone_type_id,
             "number": phone_number,
         }),
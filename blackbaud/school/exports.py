@@ -0,0 +1,307 @@
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Any, Callable, List, Literal, Optional
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.jobs.protocols import CheckpointStore
+from blackbaud.jobs.stores import JSONFileCheckpointStore
+from blackbaud.school.endpoints import core
+
+ExportFormat = Literal["csv", "jsonl", "parquet"]
+ProgressCallback = Callable[[int, int], None]
+
+
+def export_list(
+    client: BaseSolutionClient,
+    list_id: int,
+    path: str,
+    file_format: ExportFormat = "csv",
+    page_size: int = 1000,
+    progress: Optional[ProgressCallback] = None,
+    resume: bool = False,
+    checkpoint_store: Optional[CheckpointStore] = None,
+    columns: Optional[List[str]] = None,
+    fsync_pages: bool = False,
+    **request_kwargs,
+) -> int:
+    """
+    Streams every row of a basic or advanced list to a CSV, JSON Lines or Parquet
+    file, and returns the number of rows written.
+
+    Pages are written as soon as they arrive and then discarded, so memory use stays
+    around one page whatever the size of the list. progress, if given, is called
+    with the number of pages and rows written so far after every page.
+
+    CSV and Parquet columns are the given columns, or else those of the first row;
+    columns that only appear in later rows are left out. A list without rows still
+    gets a file, with just the header if the columns are known. Parquet output
+    requires pyarrow. Parquet columns take the type the list declares for them,
+    and are strings otherwise; values that cannot be read as their column's type
+    are written as nulls.
+
+    With resume=True, progress is checkpointed after every page (by default in a
+    file next to the output), and an interrupted CSV or JSON Lines export picks up
+    at the first page that was not completely written. Parquet files cannot be
+    appended to, so Parquet exports always start over.
+
+    The file is synced to disk once, when it is closed. fsync_pages=True syncs it
+    after every page too, so that a checkpoint never gets ahead of the file even if
+    the machine loses power, at the cost of a slower export.
+    """
+    if file_format not in ("csv", "jsonl", "parquet"):
+        raise ValueError(f"Unknown format: {file_format!r}")
+    if resume and file_format == "parquet":
+        raise ValueError("Parquet exports cannot be resumed.")
+
+    job_id = f"export:{list_id}:{os.path.abspath(path)}"
+    state = {"page": 1, "pages": 0, "rows": 0, "offset": 0, "columns": columns}
+    default_checkpoint_path = None
+    if resume:
+        if checkpoint_store is None:
+            default_checkpoint_path = f"{path}.checkpoint"
+            checkpoint_store = JSONFileCheckpointStore(default_checkpoint_path)
+        state.update(checkpoint_store.load(job_id, "pages") or {})
+
+    if file_format == "parquet":
+        writer: _PageWriter = _ParquetPageWriter(path, columns)
+    else:
+        f = open(path, "r+b" if state["offset"] else "wb")
+        # Drop whatever was written after the last completed page.
+        f.seek(state["offset"])
+        f.truncate()
+        writer = (_CSVPageWriter if file_format == "csv" else _JSONLinesPageWriter)(
+            f, state["columns"], fsync_pages
+        )
+
+    try:
+        writer.start()
+        for page_number, page in core.iterate_list_pages(
+            client, list_id, state["page"], page_size, **request_kwargs
+        ):
+            rows = page["results"]["rows"]
+            writer.write_page(page)
+            state.update(
+                page=page_number + 1,
+                pages=state["pages"] + 1,
+                rows=state["rows"] + len(rows),
+                offset=writer.flush(),
+                columns=writer.columns,
+            )
+            if resume:
+                checkpoint_store.save(job_id, "pages", state)
+            if progress is not None:
+                progress(state["pages"], state["rows"])
+        writer.finish()
+    finally:
+        writer.close()
+
+    if resume:
+        checkpoint_store.clear(job_id)
+    if default_checkpoint_path is not None:
+        os.remove(default_checkpoint_path)
+
+    return state["rows"]
+
+
+class _PageWriter(ABC):
+    columns: Optional[List[str]] = None
+
+    def start(self) -> None:
+        """
+        Write whatever goes before the first page, such as a header.
+        """
+
+    @abstractmethod
+    def write_page(self, page: dict) -> None:
+        ...
+
+    def finish(self) -> None:
+        """
+        Write whatever goes after the last page.
+        """
+
+    @abstractmethod
+    def flush(self) -> int:
+        """
+        Hand everything written so far to the operating system, and return the file
+        size.
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Close the file, making sure everything written is on disk.
+        """
+        ...
+
+
+class _FilePageWriter(_PageWriter):
+    def __init__(
+        self, f: IO[bytes], columns: Optional[List[str]], fsync_pages: bool = False
+    ):
+        self._binary = f
+        self._file = _text(f)
+        self._fsync_pages = fsync_pages
+        self.columns = columns
+
+    def flush(self) -> int:
+        self._file.flush()
+        if self._fsync_pages:
+            os.fsync(self._binary.fileno())
+        return self._binary.tell()
+
+    def close(self) -> None:
+        try:
+            self._file.flush()
+            os.fsync(self._binary.fileno())
+        finally:
+            self._file.close()
+
+
+class _CSVPageWriter(_FilePageWriter):
+    def start(self) -> None:
+        # A resumed export has its header already.
+        if self.columns is not None and self._binary.tell() == 0:
+            csv.writer(self._file).writerow(self.columns)
+
+    def write_page(self, page: dict) -> None:
+        rows = page["results"]["rows"]
+        if self.columns is None:
+            if not rows:
+                return
+            self.columns = [column["name"] for column in rows[0]["columns"]]
+            csv.writer(self._file).writerow(self.columns)
+
+        writer = csv.writer(self._file)
+        positions = {name: position for position, name in enumerate(self.columns)}
+        for row in rows:
+            values: List[Any] = [None] * len(self.columns)
+            for column in row["columns"]:
+                position = positions.get(column["name"])
+                if position is not None:
+                    values[position] = column.get("value")
+            writer.writerow(values)
+
+
+class _JSONLinesPageWriter(_FilePageWriter):
+    def write_page(self, page: dict) -> None:
+        for row in page["results"]["rows"]:
+            self._file.write(
+                json.dumps(
+                    {column["name"]: column.get("value") for column in row["columns"]}
+                )
+            )
+            self._file.write("\n")
+
+
+# Arrow types for the value types advanced list columns declare, by lowercase name,
+# matching the values core.convert_advanced_list_to_columns converts them to.
+_ARROW_TYPES = {
+    **dict.fromkeys(["int", "int16", "int32", "int64", "long"], "int64"),
+    **dict.fromkeys(["decimal", "double", "single", "float", "money"], "float64"),
+    **dict.fromkeys(["bool", "boolean", "bit"], "bool_"),
+    **dict.fromkeys(["date", "datetime"], "timestamp"),
+}
+
+
+class _ParquetPageWriter(_PageWriter):
+    def __init__(self, path: str, columns: Optional[List[str]]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "pyarrow is required for Parquet exports, install it with "
+                "`pip install pyarrow`."
+            ) from e
+
+        self._path = path
+        self._pyarrow = pyarrow
+        self._writer = None
+        self.columns = columns
+
+    def _schema(self, first_row: Optional[dict]) -> Any:
+        """
+        One column per name in self.columns, or per column of first_row, typed as the
+        list declares it or as a string.
+        """
+        pa = self._pyarrow
+        declared = {
+            column["name"]: str(column.get("type")).lower()
+            for column in (first_row or {}).get("columns", [])
+        }
+        names = self.columns if self.columns is not None else list(declared)
+        fields = []
+        for name in names:
+            arrow_type = _ARROW_TYPES.get(declared.get(name, ""))
+            if arrow_type == "timestamp":
+                fields.append(pa.field(name, pa.timestamp("us")))
+            else:
+                fields.append(pa.field(name, getattr(pa, arrow_type or "string")()))
+        return pa.schema(fields)
+
+    def _array(self, values: list, field: Any) -> Any:
+        pa = self._pyarrow
+        if pa.types.is_string(field.type):
+            return pa.array(
+                [None if value is None else str(value) for value in values], pa.string()
+            )
+        try:
+            return pa.array(values, field.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            # Some values are not of the declared type, e.g. "N/A" in a column of
+            # numbers. They are left out rather than failing the whole export.
+            return pa.array(
+                [self._scalar(value, field.type) for value in values], field.type
+            )
+
+    def _scalar(self, value: Any, arrow_type: Any) -> Any:
+        pa = self._pyarrow
+        try:
+            return pa.scalar(value, arrow_type).as_py()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            return None
+
+    def write_page(self, page: dict) -> None:
+        pa = self._pyarrow
+        rows = page["results"]["rows"]
+        if not rows:
+            return
+        if self._writer is None:
+            schema = self._schema(rows[0])
+            self.columns = schema.names
+            self._writer = pa.parquet.ParquetWriter(self._path, schema)
+
+        data = core.convert_advanced_list_to_columns(page)
+        schema = self._writer.schema
+        table = pa.Table.from_arrays(
+            [
+                self._array(data[field.name], field)
+                if field.name in data
+                else pa.nulls(len(rows), field.type)
+                for field in schema
+            ],
+            schema=schema,
+        )
+        self._writer.write_table(table)
+
+    def flush(self) -> int:
+        return 0
+
+    def finish(self) -> None:
+        if self._writer is None:
+            # A list without rows still gets a file, with whatever columns are known.
+            schema = self._schema(None)
+            self._pyarrow.parquet.write_table(schema.empty_table(), self._path)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _text(f: IO[bytes]) -> IO[str]:
+    return io.TextIOWrapper(f, encoding="utf-8", newline="")
@@ -0,0 +1,472 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from blackbaud.client import BaseSolutionClient, collection_values, iterate_marker_pages
+from blackbaud.client.concurrency import DEFAULT_MAX_WORKERS, map_concurrently
+from blackbaud.client.serialization import response_json
+from blackbaud.school.endpoints import academics, core, users
+
+# get_changed_users_by_roles only looks this far ahead of its start_date.
+CHANGED_USERS_WINDOW = timedelta(days=7)
+
+REFERENCE_TABLES: Dict[str, Callable] = {
+    "school_levels": core.get_school_levels,
+    "grade_levels": core.get_grade_levels,
+    "roles": core.get_roles,
+    "offering_types": core.get_offering_types,
+    "school_years": core.get_school_years,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    grad_year TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_grad_year ON users (grad_year);
+
+CREATE TABLE IF NOT EXISTS sections (
+    section_id INTEGER PRIMARY KEY,
+    school_level_id INTEGER,
+    school_year TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_school_level_id ON sections (school_level_id);
+
+CREATE TABLE IF NOT EXISTS enrollments (
+    user_id INTEGER NOT NULL,
+    section_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, section_id)
+);
+CREATE INDEX IF NOT EXISTS enrollments_section_id ON enrollments (section_id);
+
+CREATE TABLE IF NOT EXISTS reference (
+    table_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (table_name, id)
+);
+
+CREATE TABLE IF NOT EXISTS schedule_days (
+    school_level_id INTEGER NOT NULL,
+    calendar_day TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedule_days_level_day
+    ON schedule_days (school_level_id, calendar_day);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+class SchoolMirror:
+    """
+    A local SQLite copy of the parts of the education management dataset that
+    reporting queries read most: users, sections, enrollments, reference tables and
+    the master schedule.
+
+    The first sync() downloads everything. Later calls only fetch what changed since
+    the previous sync: users reported by get_changed_users_by_roles and the rosters
+    of sections that show up in the enrollment changes feed. Users who leave the
+    mirrored roles are only removed by a full sync. Syncs always fetch from the API
+    rather than the client's cache. Queries then run against the local database
+    through the helper methods or the connection attribute.
+    """
+
+    def __init__(
+        self,
+        client: BaseSolutionClient,
+        role_ids: Iterable[int],
+        database: str = "blackbaud_mirror.sqlite",
+        school_year: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Construct a new SchoolMirror object.
+
+        :param client: The solution client to fetch data with.
+        :type client: BaseSolutionClient
+        :param role_ids: The base role IDs of the users to mirror.
+        :type role_ids: Iterable[int]
+        :param database: The path of the SQLite database, created if missing.
+        :type database: str
+        :param school_year: The school year to mirror sections for, defaults to the
+        current one.
+        :type school_year: str, optional
+        :param max_workers: How many requests to keep in flight at once.
+        :type max_workers: int
+        """
+        self._client = client
+        self._role_ids = list(role_ids)
+        self._school_year = school_year
+        self._max_workers = max_workers
+        self.connection = sqlite3.connect(database)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SchoolMirror":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(
+        self,
+        full: bool = False,
+        schedule_start: Optional[datetime] = None,
+        schedule_end: Optional[datetime] = None,
+    ) -> None:
+        """
+        Bring the mirror up to date. Anything that has never been synced, or
+        everything if full is True, is downloaded from scratch; the rest is refreshed
+        incrementally. The master schedule is only synced when a date range is given.
+        """
+        self.sync_reference_tables()
+        self.sync_users(full=full)
+        self.sync_sections()
+        self.sync_enrollments(full=full)
+        if schedule_start is not None and schedule_end is not None:
+            self.sync_schedules(schedule_start, schedule_end)
+
+    def sync_reference_tables(self) -> None:
+        """
+        Replace the contents of every reference table (levels, grade levels, roles,
+        offering types and school years).
+        """
+        started_at = _now()
+        for table_name, func in REFERENCE_TABLES.items():
+            response = func(self._client, force_refresh=True)
+            response.raise_for_status()
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM reference WHERE table_name = ?", (table_name,)
+                )
+                self.connection.executemany(
+                    "INSERT INTO reference (table_name, id, data) VALUES (?, ?, ?)",
+                    (
+                        (table_name, str(row.get("id")), json.dumps(row))
+                        for row in collection_values(response_json(response))
+                    ),
+                )
+        self._set_synced_at("reference", started_at)
+
+    def sync_users(self, full: bool = False) -> None:
+        """
+        Mirror users with the configured roles. A full sync pages through
+        get_users_by_roles_detailed and removes mirrored users it did not return; an
+        incremental one re-fetches the details of the users
+        get_changed_users_by_roles reports since the last sync.
+
+        get_changed_users_by_roles only reports users who have one of the roles, so
+        an incremental sync cannot tell that a user has left them: such users stay
+        in the mirror, as they were, until the next full sync.
+        """
+        started_at = _now()
+        last_synced_at = None if full else self._get_synced_at("users")
+
+        if last_synced_at is None:
+            seen_ids = set()
+            for page in iterate_marker_pages(
+                users.get_users_by_roles_detailed,
+                self._client,
+                self._role_ids,
+                force_refresh=True,
+            ):
+                seen_ids.update(self._upsert_users(page))
+            self._delete_users_except(seen_ids)
+        else:
+            changed_ids = sorted(set(self._iterate_changed_user_ids(last_synced_at)))
+
+            def fetch_user(user_id):
+                response = users.get_user_by_id_details(
+                    self._client, user_id, force_refresh=True
+                )
+                response.raise_for_status()
+                return response_json(response)
+
+            self._upsert_users(
+                map_concurrently(
+                    fetch_user, changed_ids, max_workers=self._max_workers
+                )
+            )
+
+        self._set_synced_at("users", started_at)
+
+    def sync_sections(self) -> None:
+        """
+        Replace the mirrored sections with the current sections of every school
+        level.
+        """
+        started_at = _now()
+        level_ids = [row["id"] for row in self.reference_rows("school_levels")]
+
+        def fetch_sections(level_id):
+            response = academics.get_sections_by_level(
+                self._client,
+                level_id,
+                school_year=self._school_year,
+                force_refresh=True,
+            )
+            response.raise_for_status()
+            return level_id, collection_values(response_json(response))
+
+        with self.connection:
+            self.connection.execute("DELETE FROM sections")
+            for level_id, sections in map_concurrently(
+                fetch_sections, level_ids, max_workers=self._max_workers
+            ):
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO sections "
+                    "(section_id, school_level_id, school_year, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        (
+                            section["id"],
+                            level_id,
+                            section.get("school_year", self._school_year),
+                            json.dumps(section),
+                        )
+                        for section in sections
+                    ),
+                )
+        self._set_synced_at("sections", started_at)
+
+    def sync_enrollments(self, full: bool = False) -> None:
+        """
+        Mirror section rosters. A full sync fetches the roster of every mirrored
+        section; an incremental one only re-fetches sections that appear in the
+        enrollment changes since the last sync.
+        """
+        started_at = _now()
+        last_synced_at = None if full else self._get_synced_at("enrollments")
+
+        if last_synced_at is None:
+            section_ids = [
+                row["section_id"]
+                for row in self.connection.execute("SELECT section_id FROM sections")
+            ]
+        else:
+            section_ids = sorted(
+                {
+                    change["section_id"]
+                    for change in academics.scan_enrollment_changes(
+                        self._client,
+                        last_synced_at,
+                        max_workers=self._max_workers,
+                        force_refresh=True,
+                    )
+                    if change.get("section_id") is not None
+                }
+            )
+
+        def fetch_roster(section_id):
+            response = academics.get_students_by_section(
+                self._client, section_id, force_refresh=True
+            )
+            response.raise_for_status()
+            return section_id, collection_values(response_json(response))
+
+        for section_id, students in map_concurrently(
+            fetch_roster, section_ids, max_workers=self._max_workers
+        ):
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM enrollments WHERE section_id = ?", (section_id,)
+                )
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO enrollments (user_id, section_id, data) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        (student["id"], section_id, json.dumps(student))
+                        for student in students
+                    ),
+                )
+        self._set_synced_at("enrollments", started_at)
+
+    def sync_schedules(self, start_date: datetime, end_date: datetime) -> None:
+        """
+        Replace the mirrored master schedule of every school level between
+        start_date and end_date.
+        """
+        started_at = _now()
+        level_ids = [row["id"] for row in self.reference_rows("school_levels")]
+
+        def fetch_schedule(level_id):
+            response = academics.get_master_schedule(
+                self._client, level_id, start_date, end_date, force_refresh=True
+            )
+            response.raise_for_status()
+            return level_id, collection_values(response_json(response))
+
+        for level_id, days in map_concurrently(
+            fetch_schedule, level_ids, max_workers=self._max_workers
+        ):
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM schedule_days WHERE school_level_id = ? "
+                    "AND calendar_day BETWEEN ? AND ?",
+                    (level_id, _day(start_date), _day(end_date)),
+                )
+                self.connection.executemany(
+                    "INSERT INTO schedule_days (school_level_id, calendar_day, data) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        (level_id, _day(day.get("calendar_day", "")), json.dumps(day))
+                        for day in days
+                    ),
+                )
+        self._set_synced_at("schedules", started_at)
+
+    def get_user(self, user_id: int) -> Optional[dict]:
+        """
+        Returns the mirrored record of a user, or None if the user is not mirrored.
+        """
+        row = self.connection.execute(
+            "SELECT data FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_users_by_grad_year(self, grad_year: str) -> List[dict]:
+        return self._load(
+            "SELECT data FROM users WHERE grad_year = ? ORDER BY user_id",
+            (grad_year,),
+        )
+
+    def get_sections_by_level(self, school_level_id: int) -> List[dict]:
+        return self._load(
+            "SELECT data FROM sections WHERE school_level_id = ? ORDER BY section_id",
+            (school_level_id,),
+        )
+
+    def get_students_by_section(self, section_id: int) -> List[dict]:
+        return self._load(
+            "SELECT data FROM enrollments WHERE section_id = ? ORDER BY user_id",
+            (section_id,),
+        )
+
+    def get_sections_by_student(self, user_id: int) -> List[dict]:
+        return self._load(
+            "SELECT sections.data FROM enrollments JOIN sections "
+            "USING (section_id) WHERE enrollments.user_id = ? ORDER BY section_id",
+            (user_id,),
+        )
+
+    def get_schedule_days(
+        self, school_level_id: int, start_date: datetime, end_date: datetime
+    ) -> List[dict]:
+        return self._load(
+            "SELECT data FROM schedule_days WHERE school_level_id = ? "
+            "AND calendar_day BETWEEN ? AND ? ORDER BY calendar_day",
+            (school_level_id, _day(start_date), _day(end_date)),
+        )
+
+    def reference_rows(self, table_name: str) -> List[dict]:
+        return self._load(
+            "SELECT data FROM reference WHERE table_name = ?", (table_name,)
+        )
+
+    def last_synced_at(self, name: str) -> Optional[datetime]:
+        """
+        Returns when the named part of the mirror ("users", "sections",
+        "enrollments", "reference" or "schedules") last finished syncing.
+        """
+        return self._get_synced_at(name)
+
+    def _load(self, query: str, parameters: tuple) -> List[dict]:
+        return [
+            json.loads(row["data"])
+            for row in self.connection.execute(query, parameters)
+        ]
+
+    def _upsert_users(self, records: Iterable[dict]) -> List[int]:
+        """
+        Insert or replace the records and return the IDs of the users written.
+        """
+        user_ids = []
+
+        def rows():
+            for record in records:
+                user_ids.append(record["id"])
+                yield record["id"], _grad_year(record), json.dumps(record)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO users (user_id, grad_year, data) "
+                "VALUES (?, ?, ?)",
+                rows(),
+            )
+        return user_ids
+
+    def _delete_users_except(self, user_ids: Set[int]) -> None:
+        stale_ids = [
+            row["user_id"]
+            for row in self.connection.execute("SELECT user_id FROM users")
+            if row["user_id"] not in user_ids
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM users WHERE user_id = ?",
+                ((user_id,) for user_id in stale_ids),
+            )
+
+    def _iterate_changed_user_ids(self, since: datetime) -> Iterator[int]:
+        window_start = since
+        now = _now()
+        while window_start < now:
+            response = users.get_changed_users_by_roles(
+                self._client,
+                self._role_ids,
+                start_date=window_start,
+                force_refresh=True,
+            )
+            while True:
+                response.raise_for_status()
+                payload = response_json(response)
+                for record in collection_values(payload):
+                    yield record["id"]
+                # A busy week can span several pages.
+                if not isinstance(payload, dict) or not payload.get("next_link"):
+                    break
+                response = self._client._make_request(
+                    "GET", payload["next_link"], force_refresh=True
+                )
+            window_start += CHANGED_USERS_WINDOW
+
+    def _get_synced_at(self, name: str) -> Optional[datetime]:
+        row = self.connection.execute(
+            "SELECT synced_at FROM sync_state WHERE name = ?", (name,)
+        ).fetchone()
+        return datetime.fromisoformat(row["synced_at"]) if row else None
+
+    def _set_synced_at(self, name: str, synced_at: datetime) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (name, synced_at) VALUES (?, ?)",
+                (name, synced_at.isoformat()),
+            )
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+def _day(value) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+def _grad_year(record: dict) -> Optional[str]:
+    grad_year = record.get("grad_year") or (record.get("student_info") or {}).get(
+        "grad_year"
+    )
+    return str(grad_year) if grad_year else None
@@ -0,0 +1,14 @@
+from .data import SchoolData
+from .recording import RecordingTransport, ReplayTransport, UnrecordedRequestError
+from .server import MockAPIError, MockSKYAPI
+from .transport import MockTransport
+
+__all__ = [
+    "MockAPIError",
+    "MockSKYAPI",
+    "MockTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "SchoolData",
+    "UnrecordedRequestError",
+]
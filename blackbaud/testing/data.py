@@ -0,0 +1,552 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+FIRST_NAMES = [
+    "Ava",
+    "Liam",
+    "Noah",
+    "Émilie",
+    "Zoë",
+    "Mateo",
+    "Chloé",
+    "Arjun",
+    "Olivia",
+    "Ethan",
+    "Mei",
+    "Lucas",
+    "Amara",
+    "Félix",
+    "Sofia",
+    "Kai",
+]
+LAST_NAMES = [
+    "Tremblay",
+    "Gagnon",
+    "Roy",
+    "Côté",
+    "Bouchard",
+    "Singh",
+    "Nguyen",
+    "Chen",
+    "Martin",
+    "Wilson",
+    "Okafor",
+    "Lee",
+    "Patel",
+    "Kim",
+]
+DEPARTMENTS = {
+    "Mathematics": ["Mathematics", "Calculus", "Statistics"],
+    "English": ["English", "Literature", "Creative Writing"],
+    "Science": ["Biology", "Chemistry", "Physics"],
+    "Social Studies": ["History", "Geography", "Economics"],
+    "Languages": ["French", "Spanish", "Mandarin"],
+    "Arts": ["Visual Arts", "Music", "Drama"],
+}
+BLOCKS = "ABCDEFGH"
+# When each block of the master schedule starts, and how long it lasts.
+BLOCK_START = datetime(2000, 1, 1, 8, 0)
+BLOCK_LENGTH = timedelta(minutes=50)
+
+ROLES = [
+    {"id": 1, "name": "Student", "base_role_id": 14},
+    {"id": 2, "name": "Teacher", "base_role_id": 15},
+    {"id": 3, "name": "Parent", "base_role_id": 16},
+]
+STUDENT, TEACHER, PARENT = (role["base_role_id"] for role in ROLES)
+
+OFFERING_TYPES = [
+    {"id": 1, "description": "Academics"},
+    {"id": 2, "description": "Activities"},
+    {"id": 3, "description": "Advisory"},
+    {"id": 9, "description": "Athletics"},
+]
+EXCUSE_TYPES = [
+    {"id": 1, "description": "Absent", "excused": False},
+    {"id": 2, "description": "Late", "excused": False},
+    {"id": 3, "description": "Illness", "excused": True},
+    {"id": 4, "description": "Appointment", "excused": True},
+]
+# The share of the students of a level who are on the attendance sheet each day.
+ABSENCE_RATE = 0.03
+
+LEVELS = [
+    {"id": 1, "abbreviation": "MS", "name": "Middle School", "grades": range(6, 9)},
+    {"id": 2, "abbreviation": "US", "name": "Upper School", "grades": range(9, 13)},
+]
+
+
+class SchoolData:
+    """
+    A synthetic school for the mock SKY API: school levels, years, roles and
+    offering types, and students, teachers and parents, with sections, enrollments,
+    lists, attendance and a master schedule, shaped like the responses of the real
+    API.
+
+    The same seed always makes the same school. It starts with no change history;
+    change_user, enroll and drop make changes that the users/changed and
+    academics/enrollments/changes routes then report.
+
+    :param students: The number of students.
+    :param teachers: The number of teachers.
+    :param sections_per_student: How many sections each student is enrolled in.
+    :param seed: The seed for the random choices.
+    """
+
+    def __init__(
+        self,
+        students: int = 600,
+        teachers: int = 50,
+        sections_per_student: int = 8,
+        school_year: str = "2024 - 2025",
+        seed: int = 0,
+    ):
+        self._random = random.Random(seed)
+        self._seed = seed
+        self.school_year = school_year
+        self.roles = [dict(role) for role in ROLES]
+        self.levels = [
+            {key: value for key, value in level.items() if key != "grades"}
+            for level in LEVELS
+        ]
+        self.grade_levels = [
+            {
+                "id": grade,
+                "abbreviation": str(grade),
+                "description": f"Grade {grade}",
+                "school_level_id": level["id"],
+            }
+            for level in LEVELS
+            for grade in level["grades"]
+        ]
+        self.years = [
+            {
+                "id": index + 1,
+                "school_year_label": f"{start} - {start + 1}",
+                "current_year": start == 2024,
+                "begin_date": f"{start}-09-01T00:00:00",
+                "end_date": f"{start + 1}-06-30T00:00:00",
+            }
+            for index, start in enumerate(range(2020, 2026))
+        ]
+
+        self.offering_types = [dict(offering_type) for offering_type in OFFERING_TYPES]
+        self.users: Dict[int, dict] = {}
+        # When each user was last changed, and every enrollment change.
+        self.user_changes: Dict[int, datetime] = {}
+        self.enrollment_changes: List[dict] = []
+        self.teachers = [self._add_user(TEACHER) for _ in range(teachers)]
+        self.students = [self._add_user(STUDENT) for _ in range(students)]
+        self.parents = [self._add_user(PARENT) for _ in range(students // 2)]
+        self.sections = self._make_sections(students, sections_per_student)
+        self.enrollments = self._enroll(sections_per_student)
+        self.lists = self._make_lists()
+
+    def _add_user(self, base_role_id: int) -> dict:
+        user_id = 3000001 + len(self.users)
+        first = self._random.choice(FIRST_NAMES)
+        last = self._random.choice(LAST_NAMES)
+        role = next(role for role in ROLES if role["base_role_id"] == base_role_id)
+        user = {
+            "id": user_id,
+            "host_id": f"H{user_id}",
+            "first_name": first,
+            "preferred_name": first,
+            "last_name": last,
+            "gender": self._random.choice(["M", "F", "X"]),
+            "email": f"{first}.{last}{user_id}@example.org".lower(),
+            "email_active": True,
+            "deceased": False,
+            "lost": False,
+            "display": f"{first} {last}",
+            "roles": [{"id": role["id"], "name": role["name"]}],
+            "phones": [
+                {
+                    "id": user_id,
+                    "number": f"(604) 555-{user_id % 10000:04}",
+                    "type": "Cell",
+                    "primary": True,
+                }
+            ],
+            "addresses": [
+                {
+                    "id": user_id,
+                    "type": "Home",
+                    "line_one": f"{user_id % 9000 + 100} Main St",
+                    "city": "Vancouver",
+                    "state": "BC",
+                    "postal_code": "V6B 1A1",
+                    "country": "Canada",
+                    "primary": True,
+                    "shared": base_role_id != TEACHER,
+                }
+            ],
+            "base_role_id": base_role_id,
+        }
+        if base_role_id == STUDENT:
+            level = self._random.choice(LEVELS)
+            grade = self._random.choice(level["grades"])
+            birth = date(2024 - grade - 6, 1, 1) + timedelta(
+                days=self._random.randrange(365)
+            )
+            user["birth_date"] = f"{birth.isoformat()}T00:00:00"
+            user["student_info"] = {
+                "grade_level": f"Grade {grade}",
+                "grad_year": str(2025 + 12 - grade),
+                "student_id": f"S{user_id}",
+            }
+            user["school_level_id"] = level["id"]
+        self.users[user_id] = user
+        return user
+
+    def _make_sections(self, students: int, sections_per_student: int) -> List[dict]:
+        # Sections of about 25 students, covering every block.
+        count = max(students * sections_per_student // 25, len(BLOCKS))
+        courses = [
+            (department, title)
+            for department, titles in DEPARTMENTS.items()
+            for title in titles
+        ]
+        sections = []
+        for index in range(count):
+            department, title = courses[index % len(courses)]
+            level = LEVELS[index % len(LEVELS)]
+            teacher = self.teachers[index % len(self.teachers)]
+            grade = level["grades"][index % len(level["grades"])]
+            section_id = 80001 + index
+            sections.append(
+                {
+                    "id": section_id,
+                    "name": f"{title} {grade} - {BLOCKS[index % len(BLOCKS)]}",
+                    "section_identifier": str(index % 5 + 1),
+                    "course_id": 1000 + index % len(courses),
+                    "course_code": f"{title[:4].upper()}{grade:02}",
+                    "course_title": f"{title} {grade}",
+                    "department": department,
+                    "school_year": self.school_year,
+                    "block": BLOCKS[index % len(BLOCKS)],
+                    "room": f"{department[0]}{100 + index % 60}",
+                    "duration": {"id": 1, "name": "Full Year"},
+                    "offering": {"id": 1, "name": "Academics"},
+                    "current_enrollment": 0,
+                    "max_enrollment": 30,
+                    "teachers": [
+                        {
+                            "id": teacher["id"],
+                            "name": teacher["display"],
+                            "first_name": teacher["first_name"],
+                            "last_name": teacher["last_name"],
+                            "head": True,
+                            "coordinator": False,
+                        }
+                    ],
+                    "school_level_id": level["id"],
+                }
+            )
+        return sections
+
+    def _enroll(self, sections_per_student: int) -> Dict[int, List[dict]]:
+        by_level: Dict[int, List[dict]] = {}
+        for section in self.sections:
+            by_level.setdefault(section["school_level_id"], []).append(section)
+
+        enrollments: Dict[int, List[dict]] = {}
+        for student in self.students:
+            candidates = by_level[student["school_level_id"]]
+            chosen = self._random.sample(
+                candidates, min(sections_per_student, len(candidates))
+            )
+            enrollments[student["id"]] = []
+            for section in chosen:
+                section["current_enrollment"] += 1
+                enrollments[student["id"]].append(
+                    self._enrollment(section, "2024-09-03T00:00:00")
+                )
+        return enrollments
+
+    def _enrollment(self, section: dict, enrollment_date: str) -> dict:
+        return {
+            "id": section["id"],
+            "section_id": section["id"],
+            "course_code": section["course_code"],
+            "course_title": section["course_title"],
+            "block": section["block"],
+            "room": section["room"],
+            "school_year": self.school_year,
+            "dropped": False,
+            "enrollment_date": enrollment_date,
+        }
+
+    def _make_lists(self) -> Dict[int, dict]:
+        enrollment_rows = [
+            [
+                ("user_id", str(student["id"])),
+                ("first_name", student["first_name"]),
+                ("last_name", student["last_name"]),
+                ("grad_year", student["student_info"]["grad_year"]),
+                ("section_id", str(enrollment["section_id"])),
+                ("course_title", enrollment["course_title"]),
+                ("block", enrollment["block"]),
+                ("room", enrollment["room"]),
+            ]
+            for student in self.students
+            for enrollment in self.enrollments[student["id"]]
+        ]
+        directory_rows = [
+            [
+                ("user_id", str(user["id"])),
+                ("name", user["display"]),
+                ("email", user["email"]),
+                ("role", user["roles"][0]["name"]),
+            ]
+            for user in self.users.values()
+        ]
+        lists = {}
+        for list_id, (name, category, rows) in enumerate(
+            [
+                ("Student Enrollments", "Academics", enrollment_rows),
+                ("Community Directory", "Users", directory_rows),
+            ],
+            start=1,
+        ):
+            lists[list_id] = {
+                "id": list_id,
+                "name": name,
+                "type": "Advanced",
+                "description": f"{name} for {self.school_year}",
+                "category": category,
+                "created_by": "Mock Administrator",
+                "created": "2024-08-15T00:00:00Z",
+                "last_modified": "2024-08-15T00:00:00Z",
+                "rows": rows,
+            }
+        return lists
+
+    def add_list(self, name: str, rows: List[list], category: str = "Custom") -> int:
+        """
+        Add an advanced list and return its ID. Each row is a list of (name, value)
+        columns, or (name, value, type) for columns that declare a type.
+        """
+        list_id = max(self.lists) + 1
+        self.lists[list_id] = dict(
+            self.lists[1],
+            id=list_id,
+            name=name,
+            description=name,
+            category=category,
+            rows=rows,
+        )
+        return list_id
+
+    @staticmethod
+    def public(record: dict) -> dict:
+        """
+        A record without the fields kept for looking it up, as the API returns it.
+        """
+        return {
+            key: value
+            for key, value in record.items()
+            if key not in ("base_role_id", "school_level_id", "rows")
+        }
+
+    def users_with_roles(self, base_role_ids: List[int]) -> List[dict]:
+        return [
+            user
+            for user in self.users.values()
+            if user["base_role_id"] in base_role_ids
+        ]
+
+    def sections_for_level(self, school_level_id: Optional[int]) -> List[dict]:
+        return [
+            section
+            for section in self.sections
+            if school_level_id in (None, section["school_level_id"])
+        ]
+
+    def section_students(self, section_id: int) -> List[dict]:
+        return [
+            self.users[user_id]
+            for user_id, enrollments in self.enrollments.items()
+            if any(enrollment["section_id"] == section_id for enrollment in enrollments)
+        ]
+
+    def change_user(
+        self, user_id: int, changed_at: Optional[datetime] = None, **fields
+    ) -> dict:
+        """
+        Update the fields of a user and record the change, at changed_at or now.
+        """
+        user = self.users[user_id]
+        user.update(fields)
+        self.user_changes[user_id] = _utc(changed_at)
+        return user
+
+    def changed_users(
+        self, base_role_ids: List[int], start: datetime, end: datetime
+    ) -> List[dict]:
+        """
+        The users with the roles who were last changed between start and end.
+        """
+        start, end = _utc(start), _utc(end)
+        return [
+            user
+            for user in self.users_with_roles(base_role_ids)
+            if start <= self.user_changes.get(user["id"], _NEVER) <= end
+        ]
+
+    def enroll(
+        self, user_id: int, section_id: int, changed_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Enroll a student in a section and record the change, at changed_at or now.
+        """
+        section = self._section(section_id)
+        changed_at = _utc(changed_at)
+        section["current_enrollment"] += 1
+        self.enrollments.setdefault(user_id, []).append(
+            self._enrollment(section, changed_at.strftime("%Y-%m-%dT%H:%M:%S"))
+        )
+        self._record_enrollment_change(user_id, section, "Add", changed_at)
+
+    def drop(
+        self, user_id: int, section_id: int, changed_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Drop a student from a section and record the change, at changed_at or now.
+        """
+        section = self._section(section_id)
+        self.enrollments[user_id] = [
+            enrollment
+            for enrollment in self.enrollments.get(user_id, [])
+            if enrollment["section_id"] != section_id
+        ]
+        section["current_enrollment"] -= 1
+        self._record_enrollment_change(user_id, section, "Drop", _utc(changed_at))
+
+    def _section(self, section_id: int) -> dict:
+        return next(section for section in self.sections if section["id"] == section_id)
+
+    def _record_enrollment_change(
+        self, user_id: int, section: dict, action: str, changed_at: datetime
+    ) -> None:
+        user = self.users[user_id]
+        self.enrollment_changes.append(
+            {
+                "user_id": user_id,
+                "first_name": user["first_name"],
+                "last_name": user["last_name"],
+                "section_id": section["id"],
+                "section_name": section["name"],
+                "course_title": section["course_title"],
+                "school_year": self.school_year,
+                "action": action,
+                "change_date": changed_at.isoformat().replace("+00:00", "Z"),
+            }
+        )
+
+    def changed_enrollments(self, start: datetime, end: datetime) -> List[dict]:
+        """
+        The enrollment changes made between start and end, oldest first.
+        """
+        start, end = _utc(start), _utc(end)
+        return [
+            change
+            for change in self.enrollment_changes
+            if start <= _utc(_parse(change["change_date"])) <= end
+        ]
+
+    def attendance(
+        self, school_level_id: int, day: date, offering_type: int
+    ) -> List[dict]:
+        """
+        The attendance records of the students of a level for a day: a few of them
+        on school days, none at weekends. The same day always has the same records.
+        """
+        if day.weekday() >= 5:
+            return []
+        students = [
+            student
+            for student in self.students
+            if student["school_level_id"] == school_level_id
+        ]
+        day_random = random.Random(
+            f"{self._seed}-{school_level_id}-{day.isoformat()}-{offering_type}"
+        )
+        absent = day_random.sample(
+            students, min(round(len(students) * ABSENCE_RATE), len(students))
+        )
+        records = []
+        for student in sorted(absent, key=lambda student: student["id"]):
+            excuse_type = day_random.choice(EXCUSE_TYPES)
+            records.append(
+                {
+                    "id": day.toordinal() * 100000 + student["id"] % 100000,
+                    "student_user_id": student["id"],
+                    "first_name": student["first_name"],
+                    "last_name": student["last_name"],
+                    "grad_year": student["student_info"]["grad_year"],
+                    "offering_type": offering_type,
+                    "excuse_type": {
+                        "id": excuse_type["id"],
+                        "description": excuse_type["description"],
+                    },
+                    "excused": excuse_type["excused"],
+                    "begin_date": f"{day.isoformat()}T00:00:00",
+                    "end_date": f"{day.isoformat()}T23:59:59",
+                }
+            )
+        return records
+
+    def schedule_days(self, school_level_id: int, start: date, end: date) -> List[dict]:
+        """
+        The master schedule of a level between start and end: every weekday, with
+        each block in turn, and the blocks rotating from one day to the next.
+        """
+        days = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                rotation = day.toordinal() % len(BLOCKS)
+                blocks = BLOCKS[rotation:] + BLOCKS[:rotation]
+                days.append(
+                    {
+                        "calendar_day": f"{day.isoformat()}T00:00:00",
+                        "schedule_day": f"Day {rotation + 1}",
+                        "blocks": [
+                            {
+                                "block": block,
+                                "start_time": _block_time(position),
+                                "end_time": _block_time(position, BLOCK_LENGTH),
+                                "offering_type": 1,
+                            }
+                            for position, block in enumerate(blocks[:6])
+                        ],
+                    }
+                )
+            day += timedelta(days=1)
+        return days
+
+
+_NEVER = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _utc(value: Optional[datetime]) -> datetime:
+    """
+    value as an aware datetime in UTC, taking naive ones to be in UTC, or now.
+    """
+    if value is None:
+        return datetime.now(tz=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse(value: str) -> datetime:
+    # fromisoformat only reads the Z suffix from Python 3.11.
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _block_time(position: int, offset: timedelta = timedelta()) -> str:
+    start = BLOCK_START + position * (BLOCK_LENGTH + timedelta(minutes=10))
+    return (start + offset).strftime("%H:%M")
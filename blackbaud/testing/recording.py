@@ -0,0 +1,246 @@
+import base64
+import gzip
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from blackbaud.client import serialization
+from blackbaud.testing.transport import build_response
+
+REDACTED = "REDACTED"
+
+# Query string, form and JSON fields whose values are replaced with REDACTED.
+SECRET_FIELDS = frozenset(
+    {
+        "access_token",
+        "refresh_token",
+        "id_token",
+        "client_secret",
+        "code",
+        "code_verifier",
+        "password",
+    }
+)
+
+# Response headers that are left out of recordings. The body is stored decoded, so
+# its encoding and length are worked out again when it is replayed.
+DROPPED_HEADERS = frozenset(
+    {"set-cookie", "content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+class UnrecordedRequestError(Exception):
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        super().__init__(f"No response was recorded for {method} {url}")
+
+
+def scrub_url(url: str) -> str:
+    """
+    A URL with the values of secret query string fields redacted.
+    """
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (key, REDACTED if key in SECRET_FIELDS else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _scrub_json(content: bytes) -> bytes:
+    if not content.lstrip().startswith(b"{"):
+        return content
+    try:
+        document = serialization.loads(content)
+    except ValueError:
+        return content
+    if not SECRET_FIELDS.intersection(document):
+        return content
+    return serialization.dumps(
+        {
+            key: REDACTED if key in SECRET_FIELDS else value
+            for key, value in document.items()
+        }
+    )
+
+
+def scrub_body(content_type: str, body: bytes) -> bytes:
+    """
+    A request or response body with the values of secret form or JSON fields
+    redacted, e.g. the client secret and authorization code sent to the token
+    endpoint and the tokens it returns.
+    """
+    if "application/x-www-form-urlencoded" in content_type:
+        form = [
+            (key, REDACTED if key in SECRET_FIELDS else value)
+            for key, value in parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+        ]
+        return urlencode(form).encode("utf-8")
+    if "json" in content_type:
+        return _scrub_json(body)
+    return body
+
+
+def _request_body(request: PreparedRequest) -> bytes:
+    body = request.body
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, bytes):
+        # Streamed bodies are not recorded.
+        return b""
+    return scrub_body(request.headers.get("Content-Type", ""), body)
+
+
+def _encode_content(content: bytes) -> Tuple[str, str]:
+    try:
+        return "text", content.decode("utf-8")
+    except UnicodeDecodeError:
+        return "base64", base64.b64encode(content).decode("ascii")
+
+
+def _decode_content(exchange: dict) -> bytes:
+    if "base64" in exchange:
+        return base64.b64decode(exchange["base64"])
+    return exchange.get("text", "").encode("utf-8")
+
+
+def _key(method: str, url: str, body: bytes) -> Tuple[str, str, bytes]:
+    return method, scrub_url(url), body
+
+
+def read_recording(path: str) -> Iterator[dict]:
+    """
+    The exchanges in a recording, in the order their requests were sent.
+    """
+    with gzip.open(path, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield serialization.loads(line)
+
+
+class RecordingTransport(HTTPAdapter):
+    """
+    A transport adapter that sends requests like the default one and records every
+    request and response, to be served back by ReplayTransport. Recordings are
+    gzipped JSON lines, one exchange per line: the method, URL and body of the
+    request, the status, headers and body of the response, and how long the
+    response took.
+
+    Request headers are not recorded, so neither is the Authorization header with
+    the access token nor the Bb-Api-Subscription-Key header. Access and refresh
+    tokens, client secrets and authorization codes in URLs, form bodies and JSON
+    bodies are replaced with REDACTED, and so are cookies. Responses are otherwise
+    kept as they are, so a recording holds whatever school data was fetched.
+
+    >>> transport = RecordingTransport("sync.jsonl.gz")
+    >>> client = SKYAPIClient(..., adapter=transport)
+    >>> ...
+    >>> transport.close()
+
+    Responses are read in full as they are recorded, so stream=True has no effect.
+    Requests that fail without a response, e.g. with a timeout, are not recorded.
+
+    :param path: The file to record to. An existing file is replaced.
+    :param kwargs: Passed on to HTTPAdapter, e.g. pool_maxsize.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = gzip.open(path, "wb")
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:
+        started = time.monotonic()
+        response = super().send(request, *args, **kwargs)
+        content = response.content
+        elapsed = time.monotonic() - started
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in DROPPED_HEADERS
+        }
+        content = scrub_body(headers.get("Content-Type", ""), content)
+        encoding, encoded = _encode_content(content)
+        body_encoding, body = _encode_content(_request_body(request))
+        with self._lock:
+            if self._started is None:
+                self._started = started
+            exchange = {
+                "at": round(started - self._started, 6),
+                "elapsed": round(elapsed, 6),
+                "method": request.method,
+                "url": scrub_url(request.url),
+                "body": {body_encoding: body} if body else {},
+                "status": response.status_code,
+                "headers": headers,
+                encoding: encoded,
+            }
+            if not self._file.closed:
+                self._file.write(serialization.dumps(exchange) + b"\n")
+        return response
+
+    def close(self) -> None:
+        """
+        Close the connection pool and finish writing the recording.
+        """
+        super().close()
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport(HTTPAdapter):
+    """
+    A transport adapter that serves the responses in a recording made by
+    RecordingTransport, without a network, so that a recorded workload can be
+    profiled and benchmarked offline and on identical traffic across versions.
+
+    Requests are matched to exchanges by method, URL and body, with secrets redacted
+    the same way as they were recorded. Requests that were recorded more than once
+    get their responses in the order they were recorded, then the last one again.
+
+    >>> client = SKYAPIClient(..., adapter=ReplayTransport("sync.jsonl.gz"))
+
+    :param path: The recording to serve.
+    :param speed: How many times faster than recorded to respond, e.g. 1 to take as
+        long as each response did when it was recorded, 10 to take a tenth of that,
+        or None to respond at once.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self._exchanges: Dict[Tuple[str, str, bytes], List[dict]] = {}
+        for exchange in read_recording(path):
+            key = _key(
+                exchange["method"], exchange["url"], _decode_content(exchange["body"])
+            )
+            self._exchanges.setdefault(key, []).append(exchange)
+        self._served: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:
+        key = _key(request.method, request.url, _request_body(request))
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise UnrecordedRequestError(request.method, request.url)
+            exchange = exchanges[min(self._served[key], len(exchanges) - 1)]
+            self._served[key] += 1
+
+        if self.speed:
+            time.sleep(exchange["elapsed"] / self.speed)
+        content = _decode_content(exchange)
+        headers = dict(exchange["headers"], **{"Content-Length": str(len(content))})
+        return build_response(self, request, exchange["status"], headers, content)
@@ -0,0 +1,561 @@
+import argparse
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from blackbaud.client import serialization
+from blackbaud.school.settings import API_VERSION, SLUG
+from blackbaud.testing.data import SchoolData
+
+# Page sizes of the real API.
+USERS_PAGE_SIZE = 100
+EXTENDED_USERS_PAGE_SIZE = 1000
+MAX_LIST_PAGE_SIZE = 1000
+# How far past their start dates users/changed and academics/enrollments/changes
+# look.
+CHANGED_USERS_WINDOW = timedelta(days=7)
+ENROLLMENT_CHANGES_WINDOW = timedelta(days=30)
+
+
+class MockAPIError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[dict] = None):
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+        super().__init__(message)
+
+
+Route = Tuple[str, "re.Pattern[str]", Callable[..., object]]
+
+
+class MockSKYAPI:
+    """
+    A local stand-in for the SKY API, serving a synthetic school (SchoolData) from
+    the school/v1 routes, with next_link, marker and list page pagination, and the
+    OAuth authorize and token endpoints. It runs on a ThreadingHTTPServer in a
+    background thread, bound when it is started: used through MockTransport, it
+    never opens a socket.
+
+    Latency, server errors, 429s and the daily quota can be set up to see how a
+    client copes, or to benchmark it without using up the real quota:
+
+    >>> with MockSKYAPI(latency=0.05, error_rate=0.01, rate_limit=10) as api:
+    ...     client = SKYAPIClient(..., **api.client_kwargs())
+
+    The server speaks plain HTTP, so starting it sets OAUTHLIB_INSECURE_TRANSPORT
+    for OAuth sessions to accept it. Any bearer token is accepted unless
+    verify_tokens is set, in which case only tokens issued by its token endpoint are.
+    Write requests are not supported.
+
+    :param data: The school to serve. Defaults to SchoolData().
+    :param host: The address to listen on.
+    :param port: The port to listen on, 0 for any free port.
+    :param latency: Seconds to wait before responding.
+    :param jitter: Up to this many more seconds to wait, at random.
+    :param error_rate: The share of requests that get a server error.
+    :param error_statuses: The status codes server errors are chosen from.
+    :param rate_limit: Requests allowed per second per subscription key, beyond which
+        requests get a 429 with a Retry-After header. None for no limit.
+    :param daily_quota: Requests allowed per subscription key before requests get
+        a 403, like the real API once the quota runs out. None for no quota.
+    :param token_lifetime: The expires_in of issued tokens, in seconds.
+    :param verify_tokens: Whether to only accept tokens issued by this server.
+    :param seed: The seed for latency jitter and errors.
+    """
+
+    def __init__(
+        self,
+        data: Optional[SchoolData] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Iterable[int] = (500, 503),
+        rate_limit: Optional[int] = None,
+        daily_quota: Optional[int] = None,
+        token_lifetime: int = 3600,
+        verify_tokens: bool = False,
+        seed: int = 0,
+    ):
+        self.data = data if data is not None else SchoolData()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.rate_limit = rate_limit
+        self.daily_quota = daily_quota
+        self.token_lifetime = token_lifetime
+        self.verify_tokens = verify_tokens
+        self.statuses: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent: Dict[str, Deque[float]] = {}
+        self._used: Counter = Counter()
+        self._tokens: Dict[str, str] = {}
+        self._codes: set = set()
+        self._routes = self._make_routes()
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("The mock server has not been started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.url}/token"
+
+    @property
+    def authorization_url(self) -> str:
+        return f"{self.url}/authorize"
+
+    def client_kwargs(self) -> dict:
+        """
+        The SKYAPIClient arguments that point it at this server.
+        """
+        return {"base_url": self.url, "token_url": self.token_url}
+
+    def start(self) -> "MockSKYAPI":
+        """
+        Bind the server and serve requests in a background thread.
+        """
+        if self._server is not None:
+            return self
+        os.environ.setdefault("OAUTHLIB_INSECURE_TRANSPORT", "1")
+        self._server = ThreadingHTTPServer(self._address, _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockSKYAPI":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.statuses.clear()
+            self._used.clear()
+            self._recent.clear()
+
+    def _make_routes(self) -> List[Route]:
+        prefix = f"/{SLUG}/{API_VERSION}/"
+        routes = [
+            ("users/me", self._get_me),
+            ("users", self._get_users),
+            ("users/extended", self._get_extended_users),
+            ("users/changed", self._get_changed_users),
+            (r"users/extended/(\d+)", self._get_user),
+            (r"users/(\d+)", self._get_user),
+            (r"users/(\d+)/phones", self._get_user_phones),
+            (r"users/(\d+)/addresses", self._get_user_addresses),
+            ("roles", lambda query: _collection(self.data.roles)),
+            ("levels", lambda query: _collection(self.data.levels)),
+            ("gradelevels", lambda query: _collection(self.data.grade_levels)),
+            ("years", lambda query: _collection(self.data.years)),
+            ("offeringtypes", lambda query: _collection(self.data.offering_types)),
+            ("attendance", self._get_attendance),
+            ("academics/sections", self._get_sections),
+            (r"academics/sections/(\d+)/students", self._get_section_students),
+            (r"academics/student/(\d+)/sections", self._get_student_sections),
+            (r"academics/teachers/(\d+)/sections", self._get_teacher_sections),
+            ("academics/enrollments/changes", self._get_enrollment_changes),
+            (r"academics/enrollments/(\d+)", self._get_enrollments),
+            ("academics/schedules/master", self._get_master_schedule),
+            ("lists", self._get_lists),
+            (r"lists/advanced/(\d+)", self._get_list_page),
+        ]
+        return [
+            ("GET", re.compile(f"^{prefix}{pattern}/?$"), handler)
+            for pattern, handler in routes
+        ]
+
+    def handle(
+        self, method: str, url: str, headers: Mapping[str, str], body: bytes
+    ) -> Tuple[int, dict, object]:
+        """
+        Work out the response to a request: its status, headers and JSON payload.
+        """
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        try:
+            if parts.path == "/token" and method == "POST":
+                try:
+                    return 200, {}, self._issue_token(body)
+                except MockAPIError as error:
+                    # OAuth errors have a body of their own.
+                    return error.status, {}, {"error": error.message}
+            if parts.path == "/authorize" and method == "GET":
+                return self._authorize(query)
+
+            self._check_access(headers)
+            for route_method, pattern, handler in self._routes:
+                match = pattern.match(parts.path)
+                if match and route_method == method:
+                    return 200, {}, handler(*match.groups(), query)
+            raise MockAPIError(404, "Resource not found")
+        except MockAPIError as error:
+            payload = {"statusCode": error.status, "message": error.message}
+            return error.status, error.headers, payload
+
+    def _check_access(self, headers: Mapping[str, str]) -> None:
+        key = headers.get("Bb-Api-Subscription-Key")
+        if not key:
+            raise MockAPIError(
+                401,
+                "Access denied due to missing subscription key. Make sure to "
+                "include subscription key when making requests to an API.",
+            )
+        authorization = headers.get("Authorization", "")
+        token = authorization[len("Bearer ") :] if authorization else ""
+        if not token or (self.verify_tokens and token not in self._tokens):
+            raise MockAPIError(401, "Authorization has been denied for this request.")
+
+        now = time.monotonic()
+        with self._lock:
+            if self.rate_limit is not None:
+                recent = self._recent.setdefault(key, deque())
+                while recent and recent[0] <= now - 1:
+                    recent.popleft()
+                if len(recent) >= self.rate_limit:
+                    retry_after = max(int(recent[0] + 1 - now + 0.999), 1)
+                    raise MockAPIError(
+                        429,
+                        f"Rate limit is exceeded. Try again in {retry_after} seconds.",
+                        {"Retry-After": str(retry_after)},
+                    )
+                recent.append(now)
+            if self.daily_quota is not None and self._used[key] >= self.daily_quota:
+                raise MockAPIError(
+                    403,
+                    "Out of call volume quota. Quota will be replenished in 23:59:59.",
+                )
+            self._used[key] += 1
+            failed = self._random.random() < self.error_rate
+            status = self._random.choice(self.error_statuses) if failed else None
+            delay = self.latency + self._random.random() * self.jitter
+        if delay:
+            time.sleep(delay)
+        if status is not None:
+            raise MockAPIError(status, "The service is unavailable.")
+
+    def _issue_token(self, body: bytes) -> dict:
+        form = {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+        grant_type = form.get("grant_type")
+        if grant_type == "authorization_code":
+            if self.verify_tokens and form.get("code") not in self._codes:
+                raise MockAPIError(400, "invalid_grant")
+        elif grant_type == "refresh_token":
+            refresh_token = form.get("refresh_token")
+            if self.verify_tokens and refresh_token not in self._tokens.values():
+                raise MockAPIError(400, "invalid_grant")
+        else:
+            raise MockAPIError(400, "unsupported_grant_type")
+        access_token, refresh_token = secrets.token_hex(16), secrets.token_hex(16)
+        with self._lock:
+            self._tokens[access_token] = refresh_token
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": self.token_lifetime,
+            "refresh_token_expires_in": 365 * 24 * 3600,
+            "environment_id": "p-mock",
+            "environment_name": "Mock School",
+            "legal_entity_id": "p-mock",
+            "legal_entity_name": "Mock School",
+            "user_id": "mock-user",
+        }
+
+    def _authorize(self, query: dict) -> Tuple[int, dict, object]:
+        redirect_uri = query.get("redirect_uri")
+        if not redirect_uri:
+            raise MockAPIError(400, "redirect_uri is required")
+        code = secrets.token_hex(8)
+        with self._lock:
+            self._codes.add(code)
+        params = {"code": code}
+        if "state" in query:
+            params["state"] = query["state"]
+        separator = "&" if "?" in redirect_uri else "?"
+        location = f"{redirect_uri}{separator}{urlencode(params)}"
+        return 302, {"Location": location}, None
+
+    def _user(self, user_id: str) -> dict:
+        user = self.data.users.get(int(user_id))
+        if user is None:
+            raise MockAPIError(404, f"User {user_id} was not found.")
+        return user
+
+    def _get_me(self, query: dict) -> dict:
+        return self.data.public(self.data.teachers[0])
+
+    def _get_user(self, user_id: str, query: dict) -> dict:
+        return self.data.public(self._user(user_id))
+
+    def _get_user_phones(self, user_id: str, query: dict) -> dict:
+        return _collection(self._user(user_id)["phones"])
+
+    def _get_user_addresses(self, user_id: str, query: dict) -> dict:
+        return _collection(self._user(user_id)["addresses"])
+
+    def _users_after_marker(self, role_ids: str, query: dict, size: int) -> list:
+        if not role_ids:
+            raise MockAPIError(400, "At least one role is required.")
+        users = self.data.users_with_roles([int(id) for id in role_ids.split(",")])
+        marker = int(query.get("marker") or 0)
+        return [user for user in users if user["id"] > marker][:size]
+
+    def _get_users(self, query: dict) -> dict:
+        roles = query.get("roles", "")
+        page = self._users_after_marker(roles, query, USERS_PAGE_SIZE + 1)
+        payload = _collection(page[:USERS_PAGE_SIZE], self.data.public)
+        if len(page) > USERS_PAGE_SIZE:
+            marker = page[USERS_PAGE_SIZE - 1]["id"]
+            payload["next_link"] = "users?" + urlencode(
+                {"roles": roles, "marker": marker}
+            )
+        return payload
+
+    def _get_extended_users(self, query: dict) -> dict:
+        page = self._users_after_marker(
+            query.get("base_role_ids", ""), query, EXTENDED_USERS_PAGE_SIZE
+        )
+        return _collection(page, self.data.public)
+
+    def _get_changed_users(self, query: dict) -> dict:
+        role_ids = query.get("base_role_ids", "")
+        if not role_ids:
+            raise MockAPIError(400, "At least one role is required.")
+        start = _query_date(query, "start_date")
+        users = self.data.changed_users(
+            [int(id) for id in role_ids.split(",")],
+            start,
+            start + CHANGED_USERS_WINDOW,
+        )
+        marker = int(query.get("marker") or 0)
+        page = [user for user in users if user["id"] > marker][: USERS_PAGE_SIZE + 1]
+        payload = _collection(page[:USERS_PAGE_SIZE], self.data.public)
+        if len(page) > USERS_PAGE_SIZE:
+            payload["next_link"] = "users/changed?" + urlencode(
+                {
+                    "base_role_ids": role_ids,
+                    "start_date": query["start_date"],
+                    "marker": page[USERS_PAGE_SIZE - 1]["id"],
+                }
+            )
+        return payload
+
+    def _get_attendance(self, query: dict) -> dict:
+        if "level_id" not in query or "offering_type" not in query:
+            raise MockAPIError(400, "level_id and offering_type are required.")
+        records = self.data.attendance(
+            int(query["level_id"]),
+            _query_date(query, "day").date(),
+            int(query["offering_type"]),
+        )
+        return _collection(records)
+
+    def _get_enrollment_changes(self, query: dict) -> dict:
+        start = _query_date(query, "start_date")
+        latest = start + ENROLLMENT_CHANGES_WINDOW
+        end = _query_date(query, "end_date") if query.get("end_date") else latest
+        # Like the real API, anything past 30 days is left out without a word.
+        changes = self.data.changed_enrollments(start, min(end, latest))
+        return _collection(changes)
+
+    def _get_master_schedule(self, query: dict) -> dict:
+        if "level_num" not in query:
+            raise MockAPIError(400, "level_num is required.")
+        days = self.data.schedule_days(
+            int(query["level_num"]),
+            _query_date(query, "start_date").date(),
+            _query_date(query, "end_date").date(),
+        )
+        return _collection(days)
+
+    def _get_sections(self, query: dict) -> dict:
+        level = query.get("level_num")
+        if level is None:
+            raise MockAPIError(400, "level_num is required.")
+        return _collection(self.data.sections_for_level(int(level)), self.data.public)
+
+    def _get_section_students(self, section_id: str, query: dict) -> dict:
+        students = self.data.section_students(int(section_id))
+        return _collection(students, self.data.public)
+
+    def _get_student_sections(self, student_id: str, query: dict) -> dict:
+        self._user(student_id)
+        section_ids = {
+            enrollment["section_id"]
+            for enrollment in self.data.enrollments.get(int(student_id), [])
+        }
+        sections = [
+            section for section in self.data.sections if section["id"] in section_ids
+        ]
+        return _collection(sections, self.data.public)
+
+    def _get_teacher_sections(self, teacher_id: str, query: dict) -> dict:
+        self._user(teacher_id)
+        sections = [
+            section
+            for section in self.data.sections
+            if section["teachers"][0]["id"] == int(teacher_id)
+        ]
+        return _collection(sections, self.data.public)
+
+    def _get_enrollments(self, user_id: str, query: dict) -> dict:
+        self._user(user_id)
+        return _collection(self.data.enrollments.get(int(user_id), []))
+
+    def _get_lists(self, query: dict) -> dict:
+        return _collection(list(self.data.lists.values()), self.data.public)
+
+    def _get_list_page(self, list_id: str, query: dict) -> dict:
+        advanced_list = self.data.lists.get(int(list_id))
+        if advanced_list is None:
+            raise MockAPIError(404, f"List {list_id} was not found.")
+        page = max(int(query.get("page") or 1), 1)
+        page_size = min(int(query.get("page_size") or 1000), MAX_LIST_PAGE_SIZE)
+        start = (page - 1) * page_size
+        rows = [
+            {"columns": [_list_column(*column) for column in row]}
+            for row in advanced_list["rows"][start : start + page_size]
+        ]
+        return {"count": len(rows), "page": page, "results": {"rows": rows}}
+
+
+def encode_payload(headers: dict, payload: object) -> Tuple[dict, bytes]:
+    """
+    The headers and body of a response with a JSON payload, or none if payload is
+    None.
+    """
+    headers = dict(headers)
+    content = b""
+    if payload is not None:
+        content = serialization.dumps(payload)
+        headers["Content-Type"] = "application/json; charset=utf-8"
+    headers["Content-Length"] = str(len(content))
+    return headers, content
+
+
+def _query_date(query: dict, name: str) -> datetime:
+    value = query.get(name)
+    if not value:
+        raise MockAPIError(400, f"{name} is required.")
+    try:
+        # fromisoformat only reads the Z suffix from Python 3.11.
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise MockAPIError(400, f"{name} is not a valid date.") from None
+
+
+def _list_column(name: str, value: object, type: Optional[str] = None) -> dict:
+    column = {"name": name, "value": value}
+    if type is not None:
+        column["type"] = type
+    return column
+
+
+def _collection(items: list, transform: Callable[[dict], dict] = dict) -> dict:
+    return {"count": len(items), "value": [transform(item) for item in items]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockSKYAPI"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        mock: MockSKYAPI = self.server.mock
+        status, headers, payload = mock.handle(
+            self.command, self.path, self.headers, body
+        )
+        with mock._lock:
+            mock.statuses[status] += 1
+
+        headers, content = encode_payload(headers, payload)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a mock SKY API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--daily-quota", type=int, default=None)
+    parser.add_argument("--students", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    api = MockSKYAPI(
+        SchoolData(students=args.students, seed=args.seed),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        daily_quota=args.daily_quota,
+        seed=args.seed,
+    )
+    api.start()
+    print(f"Serving the mock SKY API on {api.url}")
+    try:
+        api._thread.join()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
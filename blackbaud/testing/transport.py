@@ -0,0 +1,62 @@
+from http import HTTPStatus
+from io import BytesIO
+from typing import Mapping, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from blackbaud.testing.server import MockSKYAPI, encode_payload
+
+
+def build_response(
+    adapter: HTTPAdapter,
+    request: PreparedRequest,
+    status: int,
+    headers: Mapping[str, str],
+    content: bytes,
+) -> Response:
+    """
+    A requests Response for a request, as the adapter would have built it had the
+    response come over the network.
+    """
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    raw = HTTPResponse(
+        body=BytesIO(content),
+        headers=dict(headers),
+        status=status,
+        reason=reason,
+        preload_content=False,
+        decode_content=False,
+    )
+    return adapter.build_response(request, raw)
+
+
+class MockTransport(HTTPAdapter):
+    """
+    A transport adapter that serves requests from a MockSKYAPI in-process, without
+    a server or sockets, so that benchmarks measure the client rather than the
+    network. The mock's latency, errors and limits still apply.
+
+    >>> api = MockSKYAPI()
+    >>> client = SKYAPIClient(..., adapter=MockTransport(api))
+
+    :param api: The mock to serve requests from. Defaults to MockSKYAPI().
+    """
+
+    def __init__(self, api: Optional[MockSKYAPI] = None):
+        super().__init__()
+        self.api = api if api is not None else MockSKYAPI()
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        status, headers, payload = self.api.handle(
+            request.method, request.path_url, request.headers, body
+        )
+        headers, content = encode_payload(headers, payload)
+        return build_response(self, request, status, headers, content)
@@ -22,6 +22,7 @@ setuptools.setup(
         "limits",
         "lxml",
     ],
+    extras_require={"fast": ["orjson"]},
     classifiers=[
         "License :: OSI Approved :: GNU Affero General Public License v3",
         "Development Status :: 3 - Alpha",
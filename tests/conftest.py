@@ -0,0 +1,49 @@
+import pytest
+
+from blackbaud.authentication.managers import MemoryCredentialManager
+from blackbaud.client import BaseSolutionClient, SKYAPIClient
+from blackbaud.testing import MockSKYAPI, MockTransport, SchoolData
+
+
+@pytest.fixture
+def api() -> MockSKYAPI:
+    return MockSKYAPI(SchoolData(students=300, teachers=20))
+
+
+@pytest.fixture
+def make_client(api, tmp_path):
+    """
+    Make a client served in-process by the mock, with no rate limits and an
+    in-memory cache unless the arguments say otherwise.
+    """
+
+    def make(**kwargs) -> SKYAPIClient:
+        credential_manager = MemoryCredentialManager()
+        credential_manager.update_token(
+            {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+        )
+        kwargs.setdefault("rate_limits", ())
+        kwargs.setdefault("cache_backend", "memory")
+        kwargs.setdefault("cache_name", str(tmp_path / "cache"))
+        kwargs.setdefault("adapter", MockTransport(api))
+        return SKYAPIClient(
+            "client id",
+            "client secret",
+            "subscription key",
+            "http://localhost/callback",
+            credential_manager=credential_manager,
+            token_refresh_disabled=True,
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def client(make_client) -> SKYAPIClient:
+    return make_client()
+
+
+@pytest.fixture
+def school(client) -> BaseSolutionClient:
+    return BaseSolutionClient(client, "school", "v1")
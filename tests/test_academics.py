@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from blackbaud.school.endpoints import academics
+
+
+class _ChangesAPI:
+    """
+    Stands in for academics/enrollments/changes on top of the mock, returning the
+    changes made in each window newest first, after any undated ones.
+    """
+
+    def __init__(self, api, changes, undated=()):
+        self.handle = api.handle
+        self.changes = changes
+        self.undated = list(undated)
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        parts = urlsplit(url)
+        if not parts.path.endswith("academics/enrollments/changes"):
+            return self.handle(method, url, headers, body)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        start = datetime.fromisoformat(query["start_date"])
+        end = datetime.fromisoformat(query["end_date"])
+        value = [
+            change
+            for change in self.changes
+            if start <= _parse(change["change_date"]) <= end
+        ]
+        value.sort(key=lambda change: change["change_date"], reverse=True)
+        value = self.undated + value
+        return 200, {}, {"count": len(value), "value": value}
+
+
+def _parse(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def test_changes_are_yielded_in_chronological_order(api, school):
+    start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    changes = [
+        {
+            "user_id": index,
+            "section_id": index % 7,
+            "change_date": (start + timedelta(hours=17 * index)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+        }
+        for index in range(100)
+    ]
+    _ChangesAPI(api, changes)
+
+    scanned = list(
+        academics.scan_enrollment_changes(
+            school, start, start + timedelta(days=80), max_workers=3
+        )
+    )
+
+    assert scanned == changes
+
+
+def test_changes_without_a_date_come_last_in_their_window(api, school):
+    start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    changes = [
+        {"user_id": 1, "change_date": "2024-09-03T00:00:00Z"},
+        {"user_id": 2, "change_date": "2024-09-02T00:00:00+00:00"},
+    ]
+    _ChangesAPI(api, changes, undated=[{"user_id": 3, "change_date": None}])
+
+    scanned = list(
+        academics.scan_enrollment_changes(school, start, start + timedelta(days=5))
+    )
+
+    assert [change["user_id"] for change in scanned] == [2, 1, 3]
+
+
+def test_changes_are_read_from_every_window(api, school):
+    start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    student = api.data.students[0]
+    section_ids = [section["id"] for section in api.data.sections[:4]]
+    for weeks, section_id in enumerate(section_ids):
+        api.data.enroll(student["id"], section_id, start + timedelta(weeks=5 * weeks))
+
+    changes = list(
+        academics.scan_enrollment_changes(school, start, start + timedelta(days=120))
+    )
+
+    assert [change["section_id"] for change in changes] == section_ids
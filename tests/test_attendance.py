@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+from blackbaud.school.endpoints import attendance
+
+
+class _RequestCount:
+    def __init__(self, api):
+        self.handle = api.handle
+        self.count = 0
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        self.count += 1
+        return self.handle(method, url, headers, body)
+
+
+def _week(start=date(2024, 9, 2)):
+    return [start + timedelta(days=offset) for offset in range(7)]
+
+
+def test_records_come_in_query_order(api, school):
+    days = _week()
+
+    records = list(
+        attendance.iterate_attendance_records(school, [1, 2], days, [1], max_workers=4)
+    )
+
+    expected = [
+        (level, day, record)
+        for level in (1, 2)
+        for day in days
+        for record in api.data.attendance(level, day, 1)
+    ]
+    assert [(q.school_level_id, q.date, r) for q, r in records] == expected
+    assert {query.date.weekday() for query, _ in records} == {0, 1, 2, 3, 4}
+
+
+def test_past_days_are_served_from_the_cache(api, school):
+    days = _week()
+    first = list(attendance.iterate_attendance_records(school, [1], days, [1]))
+    requests = _RequestCount(api)
+
+    again = list(attendance.iterate_attendance_records(school, [1], days, [1]))
+
+    assert again == first
+    assert requests.count == 0
@@ -0,0 +1,266 @@
+import threading
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.school.bulk import (
+    DUPLICATE,
+    FAILED,
+    SKIPPED,
+    SUCCEEDED,
+    GroupResult,
+    WriteOperation,
+    enroll_students_in_bulk,
+    submit_attendance_records,
+    write_in_bulk,
+)
+from blackbaud.testing import MockTransport
+
+
+def _get(client, path="levels", **request_kwargs):
+    return client._make_request("GET", path, **request_kwargs)
+
+
+def _wait_then_get(client, event):
+    if not event.wait(5):
+        raise TimeoutError("the event was never set")
+    return _get(client)
+
+
+def _set_then_get(client, event):
+    event.set()
+    return _get(client)
+
+
+def test_results_are_reported_in_input_order(school):
+    operations = [WriteOperation(_get, group=index % 3) for index in range(20)]
+
+    report = write_in_bulk(school, operations, max_workers=4)
+
+    assert [result.index for result in report.results] == list(range(20))
+    assert all(result.status == SUCCEEDED for result in report.results)
+
+
+def test_failure_skips_the_rest_of_its_group(school):
+    operations = [
+        WriteOperation(_get, {"path": "no/such/route"}, group="a"),
+        WriteOperation(_get, group="a"),
+        WriteOperation(_get, group="b"),
+    ]
+
+    report = write_in_bulk(school, operations)
+
+    assert [result.status for result in report.results] == [FAILED, SKIPPED, SUCCEEDED]
+
+
+def test_later_operations_get_earlier_results(school):
+    path = GroupResult(transform=lambda levels: f"levels?n={levels['count']}")
+    operations = [
+        WriteOperation(_get, group=1),
+        WriteOperation(_get, {"path": path}, group=1),
+    ]
+
+    report = write_in_bulk(school, operations)
+
+    assert report.results[1].status == SUCCEEDED
+    assert report.results[1].response.url.endswith("levels?n=2")
+
+
+def test_waiting_groups_do_not_hold_worker_threads(school):
+    # The second operation of the group must not take the pool's other thread while
+    # the first waits, or the operation it waits for could never run.
+    event = threading.Event()
+    operations = [
+        WriteOperation(_wait_then_get, {"event": event}, group="slow"),
+        WriteOperation(_get, group="slow"),
+        WriteOperation(_set_then_get, {"event": event}),
+    ]
+
+    report = write_in_bulk(school, operations, max_workers=2)
+
+    assert [result.status for result in report.results] == [SUCCEEDED] * 3
+
+
+class _TimeoutLog(MockTransport):
+    """
+    Records the method, path and timeout of every request sent.
+    """
+
+    def __init__(self, api):
+        super().__init__(api)
+        self.sent = []
+
+    def send(self, request, *args, **kwargs):
+        path = urlsplit(request.url).path.split("/v1/", 1)[-1]
+        self.sent.append((request.method, path, kwargs.get("timeout")))
+        return super().send(request, *args, **kwargs)
+
+
+def test_request_kwargs_are_passed_to_every_operation(api, make_client):
+    transport = _TimeoutLog(api)
+    school = BaseSolutionClient(make_client(adapter=transport), "school", "v1")
+    operations = [
+        WriteOperation(_get, {"path": "levels"}, group=1),
+        WriteOperation(_get, {"path": "offeringtypes"}, group=1),
+        WriteOperation(_get, {"path": "roles", "timeout": 3}),
+    ]
+
+    report = write_in_bulk(school, operations, timeout=7)
+
+    assert [result.status for result in report.results] == [SUCCEEDED] * 3
+    assert sorted(transport.sent) == [
+        ("GET", "levels", 7),
+        ("GET", "offeringtypes", 7),
+        ("GET", "roles", 3),
+    ]
+
+
+class _EnrollmentAPI:
+    """
+    Stands in for academics/sections/students on top of the mock: rejects any block
+    that contains a bad user, and fails the first few requests with a given status.
+    """
+
+    def __init__(self, api, bad_users=(), failures=0, status=503):
+        self.api = api
+        self.handle = api.handle
+        self.bad_users = set(bad_users)
+        self.failures = failures
+        self.status = status
+        self.requests = 0
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        if not url.endswith("academics/sections/students"):
+            return self.handle(method, url, headers, body)
+        self.requests += 1
+        if self.failures:
+            self.failures -= 1
+            return self.status, {"Retry-After": "0"}, {"message": "Try again later."}
+        form = parse_qs(body.decode())
+        users = {int(user) for user in form["user_ids"][0].split(",")}
+        if users & self.bad_users:
+            return 400, {}, {"message": "Invalid user."}
+        return 200, {}, None
+
+
+def _enroll(school, sections, users, **kwargs):
+    kwargs.setdefault("retry_backoff", 0)
+    return enroll_students_in_bulk(
+        school, 1, datetime(2024, 9, 3), sections, users, **kwargs
+    )
+
+
+def test_enrollment_bisects_rejected_blocks(api, school):
+    enrollments = _EnrollmentAPI(api, bad_users={7})
+
+    report = _enroll(school, [1, 2], range(1, 17), max_enrollments_per_request=32)
+
+    assert set(report.failed) == {(1, 7), (2, 7)}
+    assert len(report.enrolled) == 30
+    assert enrollments.requests == report.requests
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_enrollment_retries_transient_failures_without_bisecting(api, school, status):
+    enrollments = _EnrollmentAPI(api, failures=2, status=status)
+
+    report = _enroll(school, [1, 2], range(1, 17), max_enrollments_per_request=32)
+
+    assert len(report.enrolled) == 32
+    assert not report.failed
+    assert enrollments.requests == 3
+
+
+def test_enrollment_gives_up_after_max_retries(api, school):
+    enrollments = _EnrollmentAPI(api, failures=10)
+
+    report = _enroll(school, [1], range(1, 9), max_retries=2)
+
+    assert len(report.failed) == 8
+    assert enrollments.requests == 3
+
+
+def test_enrollment_passes_request_kwargs_to_every_request(api, make_client):
+    enrollments = _EnrollmentAPI(api, bad_users={7}, failures=1)
+    transport = _TimeoutLog(api)
+    school = BaseSolutionClient(make_client(adapter=transport), "school", "v1")
+
+    report = _enroll(
+        school, [1, 2], range(1, 17), max_enrollments_per_request=32, timeout=7
+    )
+
+    assert len(report.enrolled) == 30
+    assert len(transport.sent) == enrollments.requests > 1
+    assert {timeout for _, _, timeout in transport.sent} == {7}
+
+
+class _AttendanceAPI:
+    """
+    Accepts attendance records posted to the mock, and adds a row without a student
+    to the records it returns.
+    """
+
+    def __init__(self, api):
+        self.handle = api.handle
+        self.posted = []
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        if not urlsplit(url).path.endswith("/attendance"):
+            return self.handle(method, url, headers, body)
+        if method == "POST":
+            form = parse_qs(body.decode())
+            self.posted.append(int(form["student_user_id"][0]))
+            return 200, {}, None
+        status, response_headers, payload = self.handle(method, url, headers, body)
+        payload["value"].append({"id": 1, "excuse_type": {"id": 1}})
+        return status, response_headers, payload
+
+
+def test_attendance_rows_without_a_student_are_ignored(api, school):
+    attendance_api = _AttendanceAPI(api)
+    day = datetime(2024, 9, 3)
+    present = next(
+        student
+        for student in api.data.students
+        if student["school_level_id"] == 1
+        and student["id"]
+        not in {r["student_user_id"] for r in api.data.attendance(1, day.date(), 1)}
+    )
+    absent = api.data.attendance(1, day.date(), 1)[0]["student_user_id"]
+
+    report = submit_attendance_records(
+        school,
+        [
+            {"user_id": present["id"], "start_date": day},
+            {"user_id": absent, "start_date": day},
+        ],
+        school_level_id=1,
+        offering_type=1,
+    )
+
+    assert [result.status for result in report.results] == [SUCCEEDED, DUPLICATE]
+    assert attendance_api.posted == [present["id"]]
+
+
+def test_attendance_passes_request_kwargs_to_every_request(api, make_client):
+    _AttendanceAPI(api)
+    transport = _TimeoutLog(api)
+    school = BaseSolutionClient(make_client(adapter=transport), "school", "v1")
+    records = [
+        {"user_id": student["id"], "start_date": datetime(2024, 9, day)}
+        for student in api.data.students[:2]
+        for day in (3, 4)
+    ]
+
+    report = submit_attendance_records(
+        school, records, school_level_id=1, offering_type=1, timeout=7
+    )
+
+    assert [result.status for result in report.results] == [SUCCEEDED] * 4
+    methods = sorted(method for method, _, _ in transport.sent)
+    assert methods == ["GET", "GET", "POST", "POST", "POST", "POST"]
+    assert {timeout for _, _, timeout in transport.sent} == {7}
@@ -0,0 +1,100 @@
+import pytest
+
+from blackbaud.client import CircuitBreaker
+from blackbaud.client.exceptions import CircuitOpenError
+from blackbaud.client.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+
+URL = "https://api.sky.blackbaud.com/school/v1/levels"
+
+
+def _levels_url(client) -> str:
+    return f"{client.base_url}/school/v1/levels"
+
+
+def test_opens_once_enough_requests_fail():
+    breaker = CircuitBreaker(minimum_requests=4, window_size=4)
+    for success in (True, True, False):
+        assert breaker.allow(URL)
+        breaker.record(URL, success)
+    assert breaker.allow(URL)
+    breaker.record(URL, False)
+
+    assert not breaker.allow(URL)
+    assert OPEN in breaker.states().values()
+    assert 0 < breaker.retry_after(URL) <= breaker.reset_timeout
+
+
+def test_half_open_probe_closes_the_circuit(monkeypatch):
+    breaker = CircuitBreaker(minimum_requests=1, reset_timeout=10)
+    now = [1000.0]
+    monkeypatch.setattr(
+        "blackbaud.client.circuit_breaker.time.monotonic", lambda: now[0]
+    )
+    breaker.allow(URL)
+    breaker.record(URL, False)
+    assert not breaker.allow(URL)
+
+    now[0] += 10
+    assert breaker.allow(URL)
+    assert set(breaker.states().values()) == {HALF_OPEN}
+    # Only one probe at a time.
+    assert not breaker.allow(URL)
+    breaker.record(URL, True)
+
+    assert set(breaker.states().values()) == {CLOSED}
+    assert breaker.allow(URL)
+
+
+def test_unknown_outcomes_do_not_count():
+    breaker = CircuitBreaker(minimum_requests=1)
+    breaker.allow(URL)
+    breaker.record(URL, None)
+    assert set(breaker.states().values()) == {CLOSED}
+
+
+def test_client_fails_fast_while_open(api, make_client):
+    api.error_rate = 1.0
+    client = make_client(
+        cache_default_expiry=0,
+        circuit_breaker=CircuitBreaker(minimum_requests=2, window_size=2),
+    )
+    url = _levels_url(client)
+    for _ in range(2):
+        assert client.request("GET", url).status_code >= 500
+
+    with pytest.raises(CircuitOpenError):
+        client.request("GET", url)
+
+
+def test_client_serves_cached_responses_while_open(api, make_client):
+    client = make_client(
+        cache_default_expiry=1,
+        circuit_breaker=CircuitBreaker(minimum_requests=1, window_size=1),
+    )
+    url = _levels_url(client)
+    fresh = client.request("GET", url)
+    breaker = client.circuit_breaker
+    breaker.allow(url)
+    breaker.record(url, False)
+
+    cached = client.request("GET", url)
+
+    assert cached.json() == fresh.json()
+
+
+def test_client_does_not_count_429s(api, make_client):
+    statuses = iter([500, 429, 429, 500])
+    api.handle = lambda *args: (next(statuses), {}, None)
+    breaker = CircuitBreaker(failure_threshold=0.9, minimum_requests=2)
+    client = make_client(cache_default_expiry=0, circuit_breaker=breaker)
+    url = _levels_url(client)
+
+    # Had the 429s counted as successes, two failures in four would not open it.
+    assert [client.request("GET", url).status_code for _ in range(4)] == [
+        500,
+        429,
+        429,
+        500,
+    ]
+    with pytest.raises(CircuitOpenError):
+        client.request("GET", url)
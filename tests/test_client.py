@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from blackbaud.client.settings import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+)
+from blackbaud.testing import MockTransport
+
+BASE_URL = "https://api.sky.blackbaud.com/school/v1/"
+
+
+class _TimeoutLog(MockTransport):
+    """
+    Records the timeout every request is sent with.
+    """
+
+    def __init__(self, api):
+        super().__init__(api)
+        self.timeouts = []
+
+    def send(self, request, *args, **kwargs):
+        self.timeouts.append(kwargs.get("timeout"))
+        return super().send(request, *args, **kwargs)
+
+
+def test_default_timeout_reaches_the_adapter(api, make_client):
+    transport = _TimeoutLog(api)
+    client = make_client(adapter=transport)
+
+    client.request("GET", BASE_URL + "levels")
+
+    assert transport.timeouts == [(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)]
+
+
+def test_timeout_can_be_set_per_client_and_per_request(api, make_client):
+    transport = _TimeoutLog(api)
+    client = make_client(adapter=transport, timeout=12.5)
+
+    client.request("GET", BASE_URL + "levels")
+    client.request("GET", BASE_URL + "offeringtypes", timeout=(1, 2))
+
+    assert transport.timeouts == [12.5, (1, 2)]
+
+
+def test_slow_responses_time_out(api, make_client):
+    api.latency = 0.5
+    with api:
+        client = make_client(adapter=None, timeout=0.05, **api.client_kwargs())
+        with pytest.raises(requests.Timeout):
+            client.request("GET", api.url + "/school/v1/levels")
+
+
+@pytest.mark.parametrize("url", ["https://api.sky.blackbaud.com/", "http://localhost/"])
+def test_connection_pool_is_sized_on_the_mounted_adapter(make_client, url):
+    client = make_client(adapter=None, pool_connections=3, pool_maxsize=7)
+
+    adapter = client._session.get_adapter(url)
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 7
+
+
+def test_default_connection_pool(make_client):
+    client = make_client(adapter=None)
+
+    adapter = client._session.get_adapter(BASE_URL)
+
+    assert adapter._pool_connections == DEFAULT_POOL_CONNECTIONS
+    assert adapter._pool_maxsize == DEFAULT_POOL_MAXSIZE
+
+
+def test_custom_adapter_is_mounted(api, make_client):
+    transport = MockTransport(api)
+    client = make_client(adapter=transport)
+
+    assert client._session.get_adapter(BASE_URL) is transport
+    assert client._session.get_adapter("http://localhost/") is transport
+
+
+def test_keep_alive(make_client):
+    assert make_client()._session.headers["Connection"] == "keep-alive"
+    assert make_client(keep_alive=False)._session.headers["Connection"] == "close"
@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.client.concurrency import SingleFlight
+from blackbaud.school.endpoints import users
+
+STUDENT = 14
+CALLERS = 4
+
+
+def _concurrently(func, callers=CALLERS):
+    barrier = threading.Barrier(callers)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(callers) as executor:
+        return list(executor.map(call, range(callers)))
+
+
+def test_single_flight_shares_one_call():
+    calls = []
+    release = threading.Event()
+    flight = SingleFlight()
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    def do():
+        return flight.do("key", slow)
+
+    with ThreadPoolExecutor(CALLERS) as executor:
+        futures = [executor.submit(do) for _ in range(CALLERS)]
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        # Let the other callers join the call in flight.
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["result"] * CALLERS
+    assert sorted(shared for _, shared in results) == [False] + [True] * (CALLERS - 1)
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("no")
+
+    for _ in range(2):
+        try:
+            flight.do("key", fail)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("the exception was not raised")
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_gets_make_one_request(api, make_client):
+    api.latency = 0.05
+    client = make_client(cache_default_expiry=0)
+    url = f"{client.base_url}/school/v1/levels"
+    sent = []
+    send = client._session.get_adapter(url).send
+
+    def counting_send(request, *args, **kwargs):
+        sent.append(request.url)
+        return send(request, *args, **kwargs)
+
+    client._session.get_adapter(url).send = counting_send
+    responses = _concurrently(lambda: client.request("GET", url))
+
+    assert len(sent) == 1
+    assert all(response.status_code == 200 for response in responses)
+    # Each caller has a response object of its own.
+    assert len({id(response) for response in responses}) == CALLERS
+
+
+def test_concurrent_paginated_calls_do_not_share_pages(api, make_client):
+    api.latency = 0.02
+    school = BaseSolutionClient(make_client(), "school", "v1")
+    expected = len(api.data.students)
+
+    responses = _concurrently(lambda: users.get_users_by_roles(school, [STUDENT]))
+
+    for response in responses:
+        assert response.full_json["count"] == expected
+        assert len(response.full_json["value"]) == expected
+        assert len({user["id"] for user in response.full_json["value"]}) == expected
+
+
+def test_paginated_calls_leave_cached_response_alone(school, api):
+    first = users.get_users_by_roles(school, [STUDENT])
+    second = users.get_users_by_roles(school, [STUDENT])
+
+    assert second.from_cache
+    assert second.full_json["count"] == first.full_json["count"]
+    assert len(second.pages[0]["value"]) < second.full_json["count"]
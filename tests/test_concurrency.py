@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from blackbaud.client import AdaptiveConcurrencyLimiter
+from blackbaud.client.hooks import ON_CONCURRENCY_LIMIT_CHANGE
+
+
+def _round_trip(limiter, latency=0.01, status_code=200) -> int:
+    limiter.acquire()
+    return limiter.release(latency, status_code)
+
+
+def test_limit_grows_by_about_one_per_round_trip():
+    limiter = AdaptiveConcurrencyLimiter(initial=4)
+    for _ in range(5):
+        _round_trip(limiter)
+    assert limiter.limit == 5
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503, None])
+def test_limit_backs_off_on_trouble(status_code):
+    limiter = AdaptiveConcurrencyLimiter(initial=8)
+    assert _round_trip(limiter, status_code=status_code) == 4
+
+
+def test_limit_backs_off_on_latency_spikes():
+    limiter = AdaptiveConcurrencyLimiter(initial=8)
+    for _ in range(20):
+        _round_trip(limiter, latency=0.01)
+    before = limiter.limit
+    for _ in range(5):
+        _round_trip(limiter, latency=1.0)
+    assert limiter.limit < before
+
+
+def test_limit_stays_within_bounds():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=2, maximum=3)
+    _round_trip(limiter, status_code=503)
+    assert limiter.limit == 2
+    for _ in range(20):
+        _round_trip(limiter)
+    assert limiter.limit == 3
+
+
+def test_acquire_waits_for_a_free_slot():
+    limiter = AdaptiveConcurrencyLimiter(initial=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    threading.Thread(target=acquire, daemon=True).start()
+    assert not acquired.wait(0.1)
+    limiter.release(0.01, 200)
+    assert acquired.wait(5)
+
+
+def test_client_reports_limit_changes(api, make_client):
+    api.error_rate = 1.0
+    limiter = AdaptiveConcurrencyLimiter(initial=8)
+    client = make_client(cache_default_expiry=0, concurrency_limiter=limiter)
+    changes = []
+    client.hooks.register(
+        ON_CONCURRENCY_LIMIT_CHANGE, lambda **kwargs: changes.append(kwargs)
+    )
+
+    client.request("GET", f"{client.base_url}/school/v1/levels")
+
+    assert changes == [{"limit": 4, "previous": 8, "in_flight": 0}]
+
+
+def test_client_gives_the_slot_back_when_waiting_fails(make_client, monkeypatch):
+    limiter = AdaptiveConcurrencyLimiter(initial=2)
+    client = make_client(cache_default_expiry=0, concurrency_limiter=limiter)
+
+    def fail(priority):
+        raise RuntimeError("rate limit storage is down")
+
+    monkeypatch.setattr(client, "_wait_for_rate_limits", fail)
+    with pytest.raises(RuntimeError):
+        client.request("GET", f"{client.base_url}/school/v1/levels")
+
+    assert limiter.in_flight == 0
+    assert limiter.limit == 2
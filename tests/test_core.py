@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from blackbaud.school.endpoints.core import convert_advanced_list_to_columns
+
+
+def _list(*rows):
+    return {
+        "results": {
+            "rows": [
+                {
+                    "columns": [
+                        {"name": name, "value": value, "type": type}
+                        for name, value, type in row
+                    ]
+                }
+                for row in rows
+            ]
+        }
+    }
+
+
+ADVANCED_LIST = _list(
+    [("id", "1", "Int32"), ("score", "9.5", "Decimal"), ("seen", "2024-09-03Z", None)],
+    [("id", "", "Int32"), ("score", None, "Decimal"), ("seen", "", None)],
+    [("id", "x", "Int32"), ("score", "n/a", "Decimal"), ("seen", "later", None)],
+    [("id", "3", "Int32"), ("score", "1", "Decimal"), ("seen", None, None)],
+)
+
+
+def test_typed_columns_hold_one_type():
+    columns = convert_advanced_list_to_columns(ADVANCED_LIST)
+
+    assert columns["id"] == [1, None, None, 3]
+    assert columns["score"] == [9.5, None, None, 1.0]
+    # Untyped columns keep what the API returned.
+    assert columns["seen"] == ["2024-09-03Z", "", "later", None]
+
+
+def test_dates_with_a_z_suffix_are_parsed():
+    advanced_list = _list(
+        [("at", "2024-09-03T08:00:00Z", "DateTime")],
+        [("at", "2024-09-04T08:00:00", "DateTime")],
+        [("at", "", "DateTime")],
+    )
+
+    columns = convert_advanced_list_to_columns(advanced_list)
+
+    assert columns["at"] == [
+        datetime(2024, 9, 3, 8, tzinfo=timezone.utc),
+        datetime(2024, 9, 4, 8),
+        None,
+    ]
+
+
+def test_rows_with_a_different_layout_are_converted_too():
+    advanced_list = _list(
+        [("id", "1", "Int32")],
+        [("name", "Ava", None), ("id", "", "Int32")],
+    )
+
+    columns = convert_advanced_list_to_columns(advanced_list)
+
+    assert columns == {"id": [1, None], "name": [None, "Ava"]}
+
+
+def test_numpy_output_keeps_numeric_columns_numeric():
+    np = pytest.importorskip("numpy")
+
+    columns = convert_advanced_list_to_columns(ADVANCED_LIST, output="numpy")
+
+    assert columns["id"].dtype == np.float64
+    assert np.isnan(columns["id"][1]) and columns["id"][3] == 3
+    assert columns["score"].dtype == np.float64
+
+
+def test_arrow_output_types_the_columns():
+    pa = pytest.importorskip("pyarrow")
+
+    table = convert_advanced_list_to_columns(ADVANCED_LIST, output="arrow")
+
+    assert table.schema.field("id").type == pa.int64()
+    assert table.column("id").to_pylist() == [1, None, None, 3]
+    assert table.schema.field("score").type == pa.float64()
+    assert table.num_rows == 4
+
+
+def test_unknown_output_raises():
+    with pytest.raises(ValueError):
+        convert_advanced_list_to_columns(ADVANCED_LIST, output="csv")
+
+
+def test_values_of_the_wrong_kind_become_none():
+    advanced_list = _list([("id", ["1"], "Int32"), ("at", 20240903, "Date")])
+
+    assert convert_advanced_list_to_columns(advanced_list) == {
+        "id": [None],
+        "at": [None],
+    }
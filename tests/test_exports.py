@@ -0,0 +1,111 @@
+import csv
+import json
+
+import pytest
+
+from blackbaud.school import exports
+from blackbaud.school.exports import export_list
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_export_writes_every_row(api, school, tmp_path):
+    path = tmp_path / "enrollments.csv"
+    rows = api.data.lists[1]["rows"]
+
+    written = export_list(school, 1, str(path), page_size=500)
+
+    lines = _read_csv(path)
+    assert written == len(rows) == len(lines) - 1
+    assert lines[0] == [name for name, _ in rows[0]]
+
+
+def test_jsonl_export_writes_every_row(api, school, tmp_path):
+    path = tmp_path / "directory.jsonl"
+
+    written = export_list(school, 2, str(path), file_format="jsonl", page_size=100)
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert written == len(records) == len(api.data.users)
+
+
+def test_empty_csv_export_writes_the_header(api, school, tmp_path):
+    list_id = api.data.add_list("Nobody", [])
+    path = tmp_path / "empty.csv"
+
+    assert export_list(school, list_id, str(path), columns=["id", "name"]) == 0
+    assert _read_csv(path) == [["id", "name"]]
+
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl", "parquet"])
+def test_empty_export_writes_a_file(api, school, tmp_path, file_format):
+    list_id = api.data.add_list("Nobody", [])
+    path = tmp_path / f"empty.{file_format}"
+
+    assert export_list(school, list_id, str(path), file_format=file_format) == 0
+    assert path.exists()
+
+
+class _FsyncCount:
+    def __init__(self, monkeypatch):
+        self.count = 0
+        monkeypatch.setattr(exports.os, "fsync", self)
+
+    def __call__(self, fd):
+        self.count += 1
+
+
+@pytest.mark.parametrize("fsync_pages, expected", [(False, 1), (True, 6)])
+def test_export_syncs_the_file_once_unless_asked(
+    school, tmp_path, monkeypatch, fsync_pages, expected
+):
+    fsyncs = _FsyncCount(monkeypatch)
+
+    # 470 rows make five pages.
+    path = tmp_path / "directory.csv"
+    export_list(school, 2, str(path), page_size=100, fsync_pages=fsync_pages)
+
+    assert fsyncs.count == expected
+
+
+def test_empty_parquet_export_has_the_columns(api, school, tmp_path):
+    list_id = api.data.add_list("Nobody", [])
+    path = tmp_path / "empty.parquet"
+
+    export_list(
+        school, list_id, str(path), file_format="parquet", columns=["id", "name"]
+    )
+
+    table = pq.read_table(path)
+    assert table.num_rows == 0
+    assert table.column_names == ["id", "name"]
+
+
+def test_parquet_export_copes_with_mixed_types(api, school, tmp_path):
+    rows = [
+        [("id", "1", "int"), ("score", "90", "decimal"), ("note", 5)],
+        [("id", "2", "int"), ("score", "N/A", "decimal"), ("note", "absent")],
+        [("id", "3", "int"), ("score", "75.5", "decimal"), ("note", None)],
+        [("id", "x", "int"), ("score", "80", "decimal"), ("note", True)],
+    ]
+    list_id = api.data.add_list("Scores", rows)
+    path = tmp_path / "scores.parquet"
+
+    # One row per page, so that pages disagree with the first one too.
+    written = export_list(
+        school, list_id, str(path), file_format="parquet", page_size=1
+    )
+
+    table = pq.read_table(path)
+    assert written == table.num_rows == 4
+    assert table.schema.field("id").type == pa.int64()
+    assert table.column("id").to_pylist() == [1, 2, 3, None]
+    assert table.column("score").to_pylist() == [90.0, None, 75.5, 80.0]
+    assert table.column("note").to_pylist() == ["5", "absent", None, "True"]
@@ -0,0 +1,100 @@
+import logging
+
+import pytest
+
+from blackbaud.client import hooks
+from blackbaud.client.hooks import Hooks, endpoint_template
+
+
+def _record(events, name):
+    def hook(**kwargs):
+        events.append((name, kwargs))
+
+    return hook
+
+
+def _fail(**kwargs):
+    raise RuntimeError("broken hook")
+
+
+def test_hooks_follow_the_request_lifecycle(client, school):
+    events = []
+    for event in (hooks.BEFORE_REQUEST, hooks.ON_CACHE_HIT, hooks.AFTER_RESPONSE):
+        client.hooks.register(event, _record(events, event))
+
+    school._make_request("GET", "levels")
+    school._make_request("GET", "levels")
+
+    assert [name for name, _ in events] == [
+        hooks.BEFORE_REQUEST,
+        hooks.AFTER_RESPONSE,
+        hooks.BEFORE_REQUEST,
+        hooks.ON_CACHE_HIT,
+        hooks.AFTER_RESPONSE,
+    ]
+    assert {kwargs["endpoint"] for _, kwargs in events} == {"school/v1/levels"}
+    from_cache = [kwargs["from_cache"] for _, kwargs in events if "from_cache" in kwargs]
+    assert from_cache == [False, True]
+
+
+def test_hooks_are_called_in_registration_order(client, school):
+    events = []
+    for name in ("first", "second", "third"):
+        client.hooks.register(hooks.AFTER_RESPONSE, _record(events, name))
+
+    school._make_request("GET", "levels")
+
+    assert [name for name, _ in events] == ["first", "second", "third"]
+
+
+def test_failing_hook_does_not_affect_the_request_or_other_hooks(
+    client, school, caplog
+):
+    events = []
+    client.hooks.register(hooks.BEFORE_REQUEST, _fail)
+    client.hooks.register(hooks.BEFORE_REQUEST, _record(events, "before"))
+    client.hooks.register(hooks.AFTER_RESPONSE, _fail)
+    client.hooks.register(hooks.AFTER_RESPONSE, _record(events, "after"))
+
+    with caplog.at_level(logging.ERROR, logger=hooks.__name__):
+        response = school._make_request("GET", "levels")
+
+    assert response.status_code == 200
+    assert [name for name, _ in events] == ["before", "after"]
+    assert len(caplog.records) == 2
+
+
+def test_unregistered_hooks_are_not_called(client, school):
+    events = []
+    hook = client.hooks.register(hooks.AFTER_RESPONSE, _record(events, "after"))
+    client.hooks.unregister(hooks.AFTER_RESPONSE, hook)
+
+    school._make_request("GET", "levels")
+
+    assert events == []
+    assert not client.hooks
+
+
+def test_unknown_events_are_rejected():
+    with pytest.raises(ValueError):
+        Hooks().register("on_everything", _fail)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://api.sky.blackbaud.com/school/v1/users/123", "school/v1/users/{id}"),
+        (
+            "https://api.sky.blackbaud.com/school/v1/users/123/addresses?x=1",
+            "school/v1/users/{id}/addresses",
+        ),
+        (
+            "https://api.sky.blackbaud.com/school/v1/lists/advanced/"
+            "0a1b2c3d-4e5f-6a7b-8c9d-0e1f2a3b4c5d",
+            "school/v1/lists/advanced/{id}",
+        ),
+        ("https://api.sky.blackbaud.com/school/v1/levels", "school/v1/levels"),
+    ],
+)
+def test_endpoint_template(url, expected):
+    assert endpoint_template(url) == expected
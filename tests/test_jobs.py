@@ -0,0 +1,127 @@
+import itertools
+from urllib.parse import urlsplit
+
+import pytest
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.jobs import (
+    JSONFileCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    SyncJob,
+)
+from blackbaud.school.endpoints import users
+from blackbaud.testing.data import STUDENT
+
+
+class _RequestLog:
+    """
+    Records the path of every request the mock serves.
+    """
+
+    def __init__(self, api):
+        self.handle = api.handle
+        self.paths = []
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        self.paths.append(urlsplit(url).path)
+        return self.handle(method, url, headers, body)
+
+
+@pytest.fixture(params=["memory", "json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryCheckpointStore()
+    elif request.param == "json":
+        yield JSONFileCheckpointStore(str(tmp_path / "checkpoints.json"))
+    else:
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+        yield store
+        store.close()
+
+
+@pytest.fixture
+def restart(make_client):
+    """
+    A fresh client, as a job that is run again after a crash would have.
+    """
+    return lambda: BaseSolutionClient(make_client(), "school", "v1")
+
+
+def _fetch_user(school):
+    def fetch(user_id):
+        return school._make_request("GET", f"users/{user_id}").json()["id"]
+
+    return fetch
+
+
+def test_run_units_skips_finished_units(api, store, restart):
+    user_ids = [student["id"] for student in api.data.students[:10]]
+    job = SyncJob(restart(), "users", store)
+    first_run = job.run_units(user_ids, _fetch_user(job.client), max_workers=2)
+    done = [user_id for user_id, _ in itertools.islice(first_run, 4)]
+    first_run.close()
+
+    log = _RequestLog(api)
+    job = SyncJob(restart(), "users", store)
+    fetch = _fetch_user(job.client)
+    resumed = [user_id for user_id, _ in job.run_units(user_ids, fetch)]
+
+    assert done == user_ids[:4]
+    # The last unit handed over was still being processed, so it runs again.
+    assert resumed == user_ids[3:]
+    assert len(log.paths) == 7
+
+
+def test_run_unit_returns_the_saved_result(store, restart):
+    job = SyncJob(restart(), "levels", store)
+    calls = []
+
+    def count_levels():
+        calls.append(1)
+        return job.client._make_request("GET", "levels").json()["count"]
+
+    first = job.run_unit("count", count_levels)
+    again = SyncJob(restart(), "levels", store).run_unit("count", count_levels)
+
+    assert first == again == 2
+    assert len(calls) == 1
+
+
+def test_paginate_resumes_from_the_saved_next_link(api, store, restart):
+    job = SyncJob(restart(), "directory", store)
+    pages = job.paginate("students", users.get_users_by_roles, [STUDENT])
+    first_page = next(pages)
+    next(pages)
+    # The process dies while the second page is being processed.
+    pages.close()
+
+    log = _RequestLog(api)
+    job = SyncJob(restart(), "directory", store)
+    resumed = list(job.paginate("students", users.get_users_by_roles, [STUDENT]))
+
+    user_ids = [user["id"] for page in [first_page, *resumed] for user in page]
+    assert user_ids == [student["id"] for student in api.data.students]
+    assert len(log.paths) == len(resumed) == 2
+    assert list(job.paginate("students", users.get_users_by_roles, [STUDENT])) == []
+
+
+def test_reset_forgets_progress(store, restart):
+    job = SyncJob(restart(), "levels", store)
+    job.mark_done("count", 2)
+
+    job.reset()
+
+    assert not job.is_done("count")
+    assert job.get_result("count") is None
+
+
+def test_json_file_store_survives_reopening(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    JSONFileCheckpointStore(path).save("job", "unit", {"done": True, "result": [1]})
+
+    assert JSONFileCheckpointStore(path).load("job", "unit") == {
+        "done": True,
+        "result": [1],
+    }
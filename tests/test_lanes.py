@@ -0,0 +1,80 @@
+import threading
+import time
+
+from blackbaud.client import BaseSolutionClient
+from blackbaud.client.rate_limiters.lanes import PriorityLanes
+from blackbaud.client.settings import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("the condition was never met")
+        time.sleep(0.001)
+
+
+def _serve(lanes, requests):
+    """
+    Queue up the requests, then hand out slots one at a time and return the order
+    the priorities got them in.
+    """
+    slots = threading.Semaphore(0)
+    order = []
+
+    def take_slot():
+        return 0 if slots.acquire(blocking=False) else 0.001
+
+    def request(priority):
+        lanes.acquire(priority, take_slot)
+        order.append(priority)
+
+    threads = [threading.Thread(target=request, args=(p,)) for p in requests]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: sum(lanes.waiting().values()) == len(requests))
+    for served in range(1, len(requests) + 1):
+        slots.release()
+        _wait_until(lambda: len(order) == served)
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_interactive_requests_go_first():
+    lanes = PriorityLanes(min_batch_share=0.2)
+
+    order = _serve(lanes, [PRIORITY_BATCH] * 10 + [PRIORITY_INTERACTIVE] * 10)
+
+    first = order[:10]
+    assert first.count(PRIORITY_INTERACTIVE) >= 7
+    assert order[-5:] == [PRIORITY_BATCH] * 5
+
+
+def test_batch_requests_are_not_starved():
+    lanes = PriorityLanes(min_batch_share=0.25)
+
+    order = _serve(lanes, [PRIORITY_BATCH] * 10 + [PRIORITY_INTERACTIVE] * 20)
+
+    assert order[:20].count(PRIORITY_BATCH) >= 4
+
+
+def test_a_lone_lane_gets_every_slot():
+    lanes = PriorityLanes(min_batch_share=0.0)
+
+    order = _serve(lanes, [PRIORITY_BATCH] * 5)
+
+    assert order == [PRIORITY_BATCH] * 5
+    assert lanes.stats()[PRIORITY_BATCH]["requests"] == 5
+
+
+def test_client_requests_use_its_lanes(make_client):
+    lanes = PriorityLanes()
+    school = BaseSolutionClient(make_client(priority_lanes=lanes), "school", "v1")
+
+    school._make_request("GET", "levels")
+    school._make_request("GET", "roles", priority=PRIORITY_BATCH)
+
+    stats = lanes.stats()
+    assert stats[PRIORITY_INTERACTIVE]["requests"] == 1
+    assert stats[PRIORITY_BATCH]["requests"] == 1
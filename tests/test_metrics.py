@@ -0,0 +1,142 @@
+import pytest
+
+from blackbaud.client import hooks
+from blackbaud.client.metrics import LatencyHistogram, MetricsCollector
+
+LEVELS = "school/v1/levels"
+
+
+@pytest.fixture
+def metrics(client) -> MetricsCollector:
+    metrics = MetricsCollector()
+    metrics.register(client.hooks)
+    return metrics
+
+
+def test_requests_are_counted_by_endpoint_status_and_cache(metrics, school):
+    school._make_request("GET", "levels")
+    school._make_request("GET", "levels")
+    school._make_request("GET", "no/such/route")
+
+    counters = metrics.counters()
+    assert counters["requests_total"] == {
+        (("endpoint", LEVELS), ("method", "GET"), ("status", "200")): 2,
+        (
+            ("endpoint", "school/v1/no/such/route"),
+            ("method", "GET"),
+            ("status", "404"),
+        ): 1,
+    }
+    assert counters["cache_misses_total"][(("endpoint", LEVELS),)] == 1
+    assert counters["cache_hits_total"] == {(("endpoint", LEVELS),): 1}
+    assert counters["response_bytes_total"][(("endpoint", LEVELS),)] > 0
+
+
+def test_events_without_a_response_are_counted(client, metrics):
+    client.hooks.emit(hooks.ON_RETRY, endpoint=LEVELS, reason="429")
+    client.hooks.emit(hooks.ON_TOKEN_REFRESH, token={})
+    client.hooks.emit(
+        hooks.ON_RATE_LIMIT_WAIT,
+        endpoint=LEVELS,
+        duration=0.5,
+        reason="quota",
+        priority="batch",
+    )
+    client.hooks.emit(hooks.ON_CONCURRENCY_LIMIT_CHANGE, limit=6, previous=8)
+    client.hooks.emit(hooks.ON_CIRCUIT_OPEN, endpoint=LEVELS, stale=True)
+
+    counters = metrics.counters()
+    wait = (("endpoint", LEVELS), ("priority", "batch"), ("reason", "quota"))
+    assert counters["retries_total"] == {(("endpoint", LEVELS), ("reason", "429")): 1}
+    assert counters["token_refreshes_total"] == {(): 1}
+    assert counters["rate_limit_waits_total"] == {wait: 1}
+    assert counters["rate_limit_wait_seconds_total"] == {wait: 0.5}
+    assert counters["circuit_open_total"] == {
+        (("endpoint", LEVELS), ("stale", "true")): 1
+    }
+    assert metrics.gauges() == {"concurrency_limit": {(): 6}}
+
+
+def test_unregistered_collector_stops_counting(client, metrics, school):
+    metrics.unregister(client.hooks)
+
+    school._make_request("GET", "levels")
+
+    assert metrics.counters() == {}
+
+
+def test_latency_percentiles():
+    metrics = MetricsCollector()
+    for duration in range(1, 101):
+        metrics.observe(LEVELS, "GET", duration / 100)
+
+    assert metrics.latency_percentiles() == {
+        (LEVELS, "GET"): {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+    }
+
+
+def test_percentiles_come_from_recent_samples():
+    histogram = LatencyHistogram(sample_size=10)
+    for duration in [10.0] * 10 + [1.0] * 10:
+        histogram.observe(duration)
+
+    assert histogram.percentile(99) == 1.0
+    assert histogram.count == 20
+    assert histogram.sum == 110.0
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_slowest_endpoints():
+    metrics = MetricsCollector()
+    metrics.observe("fast", "GET", 0.01)
+    metrics.observe("slow", "GET", 2.0)
+    metrics.observe("middle", "POST", 0.5)
+
+    assert metrics.slowest_endpoints(limit=2) == [
+        ("slow", "GET", 2.0),
+        ("middle", "POST", 0.5),
+    ]
+
+
+def test_to_prometheus():
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    metrics.observe(LEVELS, "GET", 0.05)
+    metrics.observe(LEVELS, "GET", 0.5)
+    metrics.observe(LEVELS, "GET", 5.0)
+    metrics.increment("retries_total", endpoint='say "hi"\n', reason="429")
+    metrics.increment("response_bytes_total", 1.5, endpoint=LEVELS)
+    metrics.set_gauge("concurrency_limit", 4)
+
+    assert metrics.to_prometheus().splitlines() == [
+        "# HELP blackbaud_request_duration_seconds Duration of SKY API requests.",
+        "# TYPE blackbaud_request_duration_seconds histogram",
+        'blackbaud_request_duration_seconds_bucket{endpoint="school/v1/levels",'
+        'method="GET",le="0.1"} 1',
+        'blackbaud_request_duration_seconds_bucket{endpoint="school/v1/levels",'
+        'method="GET",le="1"} 2',
+        'blackbaud_request_duration_seconds_bucket{endpoint="school/v1/levels",'
+        'method="GET",le="+Inf"} 3',
+        'blackbaud_request_duration_seconds_sum{endpoint="school/v1/levels",'
+        'method="GET"} 5.55',
+        'blackbaud_request_duration_seconds_count{endpoint="school/v1/levels",'
+        'method="GET"} 3',
+        "# TYPE blackbaud_response_bytes_total counter",
+        'blackbaud_response_bytes_total{endpoint="school/v1/levels"} 1.5',
+        "# TYPE blackbaud_retries_total counter",
+        'blackbaud_retries_total{endpoint="say \\"hi\\"\\n",reason="429"} 1',
+        "# TYPE blackbaud_concurrency_limit gauge",
+        "blackbaud_concurrency_limit 4",
+    ]
+
+
+def test_reset():
+    metrics = MetricsCollector()
+    metrics.observe(LEVELS, "GET", 0.1)
+    metrics.increment("retries_total")
+    metrics.set_gauge("concurrency_limit", 4)
+
+    metrics.reset()
+
+    assert metrics.counters() == {}
+    assert metrics.gauges() == {}
+    assert metrics.latency_percentiles() == {}
@@ -0,0 +1,151 @@
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from blackbaud.school.mirror import SchoolMirror
+from blackbaud.testing.data import STUDENT
+
+
+class _ChangedUsersAPI:
+    """
+    Stands in for users/changed on top of the mock, reporting the given users a few
+    to a page.
+    """
+
+    def __init__(self, api, user_ids, page_size=2):
+        self.handle = api.handle
+        self.user_ids = list(user_ids)
+        self.page_size = page_size
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        parts = urlsplit(url)
+        if not parts.path.endswith("users/changed"):
+            return self.handle(method, url, headers, body)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        page = int(query.get("page", 1))
+        start = (page - 1) * self.page_size
+        user_ids = self.user_ids[start : start + self.page_size]
+        payload = {"count": len(user_ids), "value": [{"id": id} for id in user_ids]}
+        if start + self.page_size < len(self.user_ids):
+            payload["next_link"] = f"users/changed?{parts.query}&page={page + 1}"
+        return 200, {}, payload
+
+
+@pytest.fixture
+def mirror(school, tmp_path):
+    with SchoolMirror(school, [STUDENT], str(tmp_path / "mirror.sqlite")) as mirror:
+        yield mirror
+
+
+def _user_count(mirror):
+    return mirror.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+def test_incremental_sync_reads_every_page_of_changes(api, mirror):
+    mirror.sync_users()
+    changed = api.data.students[:5]
+    for student in changed:
+        student["first_name"] = "Changed"
+    _ChangedUsersAPI(api, [student["id"] for student in changed])
+
+    mirror.sync_users()
+
+    assert all(
+        mirror.get_user(student["id"])["first_name"] == "Changed"
+        for student in changed
+    )
+
+
+def test_incremental_sync_does_not_read_from_the_cache(api, mirror):
+    mirror.sync_users()
+    student = api.data.students[0]
+    _ChangedUsersAPI(api, [student["id"]])
+    mirror.sync_users()
+
+    student["first_name"] = "Changed again"
+    mirror.sync_users()
+
+    assert mirror.get_user(student["id"])["first_name"] == "Changed again"
+
+
+def test_full_sync_removes_users_who_left_the_roles(api, mirror):
+    mirror.sync_users()
+    assert _user_count(mirror) == len(api.data.students)
+    departed = api.data.students[0]
+    departed["base_role_id"] = 0
+
+    mirror.sync_users(full=True)
+
+    assert mirror.get_user(departed["id"]) is None
+    assert _user_count(mirror) == len(api.data.students) - 1
+
+
+def test_sync_does_not_read_rosters_from_the_cache(api, mirror):
+    student = api.data.students[0]
+    section_id = api.data.enrollments[student["id"]][-1]["section_id"]
+    with mirror.connection:
+        mirror.connection.execute(
+            "INSERT INTO sections (section_id, data) VALUES (?, '{}')", (section_id,)
+        )
+    mirror.sync_enrollments()
+    api.data.enrollments[student["id"]].pop()
+
+    mirror.sync_enrollments(full=True)
+
+    students = mirror.get_students_by_section(section_id)
+    assert student["id"] not in {record["id"] for record in students}
+
+
+def test_sync_mirrors_the_school(api, mirror):
+    start, end = datetime(2024, 9, 2), datetime(2024, 9, 13)
+
+    mirror.sync(schedule_start=start, schedule_end=end)
+
+    assert _user_count(mirror) == len(api.data.students)
+    offering_types = mirror.reference_rows("offering_types")
+    assert len(offering_types) == len(api.data.offering_types)
+    section_id = api.data.sections[0]["id"]
+    roster = mirror.get_students_by_section(section_id)
+    expected = api.data.section_students(section_id)
+    assert {user["id"] for user in roster} == {user["id"] for user in expected}
+    days = mirror.get_schedule_days(1, start, end)
+    assert [day["calendar_day"][:10] for day in days] == [
+        f"2024-09-{day:02}" for day in (2, 3, 4, 5, 6, 9, 10, 11, 12, 13)
+    ]
+
+
+def test_incremental_sync_picks_up_changes(api, mirror):
+    mirror.sync()
+    student = api.data.students[0]
+    enrolled = {e["section_id"] for e in api.data.enrollments[student["id"]]}
+    dropped = min(enrolled)
+    added = next(
+        section["id"]
+        for section in api.data.sections_for_level(student["school_level_id"])
+        if section["id"] not in enrolled
+    )
+    api.data.change_user(student["id"], last_name="Renamed")
+    api.data.drop(student["id"], dropped)
+    api.data.enroll(student["id"], added)
+
+    mirror.sync()
+
+    assert mirror.get_user(student["id"])["last_name"] == "Renamed"
+    sections = mirror.get_sections_by_student(student["id"])
+    assert {section["id"] for section in sections} == enrolled - {dropped} | {added}
+
+
+def test_incremental_sync_follows_the_mock_next_link(api, mirror):
+    mirror.sync_users()
+    changed = api.data.students[:150]
+    for student in changed:
+        api.data.change_user(student["id"], first_name="Changed")
+
+    mirror.sync_users()
+
+    assert all(
+        mirror.get_user(student["id"])["first_name"] == "Changed"
+        for student in changed
+    )
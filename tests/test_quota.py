@@ -0,0 +1,130 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+import requests
+
+from blackbaud.client import (
+    AdaptiveConcurrencyLimiter,
+    BaseSolutionClient,
+    QuotaTracker,
+)
+from blackbaud.client.exceptions import QuotaReservedError
+from blackbaud.client.settings import PRIORITY_BATCH
+from blackbaud.testing import MockTransport
+
+KEY = "subscription key"
+
+
+@pytest.fixture
+def tracker():
+    return QuotaTracker(limit=10, reserve=4, max_wait=0)
+
+
+@pytest.fixture
+def tracked_school(make_client, tracker):
+    return BaseSolutionClient(make_client(quota_tracker=tracker), "school", "v1")
+
+
+def test_requests_are_counted_by_tag(tracked_school, tracker):
+    tracked_school._make_request("GET", "levels", tag="levels")
+    tracked_school._make_request("GET", "roles", tag="roles")
+    tracked_school._make_request("GET", "years")
+
+    assert tracker.used(KEY) == 3
+    assert tracker.used_by_tag(KEY) == {"levels": 1, "roles": 1, None: 1}
+
+
+def test_cached_responses_do_not_use_the_quota(tracked_school, tracker):
+    for _ in range(3):
+        tracked_school._make_request("GET", "levels")
+
+    assert tracker.used(KEY) == 1
+
+
+def test_batch_requests_leave_the_reserve_alone(api, tracked_school, tracker):
+    students = api.data.students
+    for student in students[:6]:
+        tracked_school._make_request(
+            "GET", f"users/{student['id']}", priority=PRIORITY_BATCH
+        )
+
+    with pytest.raises(QuotaReservedError):
+        tracked_school._make_request(
+            "GET", f"users/{students[6]['id']}", priority=PRIORITY_BATCH
+        )
+    response = tracked_school._make_request("GET", f"users/{students[6]['id']}")
+
+    assert response.ok
+    assert tracker.used(KEY) == 7
+
+
+def test_status_forecasts_exhaustion(tracker):
+    for _ in range(5):
+        tracker.record(KEY, "sync")
+
+    status = tracker.status(KEY, over=timedelta(minutes=1))
+
+    assert (status.used, status.remaining, status.reserve) == (5, 5, 4)
+    assert status.burn_rate > 0
+    assert status.exhausted_at is not None
+    assert status.used_by_tag == {"sync": 5}
+
+
+def test_concurrent_batch_requests_cannot_overdraw_the_budget(api, make_client):
+    tracker = QuotaTracker(limit=10, reserve=4, max_wait=0)
+    # Requests queue up for the one slot after the quota has let them through.
+    limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=1)
+    client = make_client(quota_tracker=tracker, concurrency_limiter=limiter)
+    school = BaseSolutionClient(client, "school", "v1")
+    api.latency = 0.01
+    callers = 12
+    barrier = threading.Barrier(callers)
+
+    def get(student):
+        barrier.wait()
+        try:
+            return school._make_request(
+                "GET", f"users/{student['id']}", priority=PRIORITY_BATCH
+            )
+        except QuotaReservedError:
+            return None
+
+    with ThreadPoolExecutor(callers) as executor:
+        responses = list(executor.map(get, api.data.students[:callers]))
+
+    assert sum(response is not None for response in responses) == 6
+    assert tracker.used(KEY) == 6
+
+
+def test_reservations_are_counted_by_tag(tracker):
+    reservations = [tracker.acquire(KEY, PRIORITY_BATCH, "sync") for _ in range(6)]
+
+    with pytest.raises(QuotaReservedError):
+        tracker.acquire(KEY, PRIORITY_BATCH, "sync")
+    assert tracker.used_by_tag(KEY) == {"sync": 6}
+    assert all(reservation.waited == 0 for reservation in reservations)
+
+    tracker.release(reservations[0])
+
+    assert tracker.used(KEY) == 5
+    assert tracker.acquire(KEY, PRIORITY_BATCH, "other").tag == "other"
+    assert tracker.used_by_tag(KEY) == {"sync": 5, "other": 1}
+
+
+class _Unreachable(MockTransport):
+    def send(self, request, *args, **kwargs):
+        raise requests.ConnectionError("The API is unreachable.")
+
+
+def test_failed_requests_give_the_quota_back(api, make_client, tracker):
+    school = BaseSolutionClient(
+        make_client(quota_tracker=tracker, adapter=_Unreachable(api)), "school", "v1"
+    )
+
+    with pytest.raises(requests.ConnectionError):
+        school._make_request("GET", "levels", tag="levels")
+
+    assert tracker.used(KEY) == 0
+    assert tracker.used_by_tag(KEY) == {}
@@ -0,0 +1,85 @@
+import pytest
+
+from blackbaud.client import BaseSolutionClient, serialization
+from blackbaud.school.endpoints import core, users
+from blackbaud.testing import (
+    MockSKYAPI,
+    RecordingTransport,
+    ReplayTransport,
+    UnrecordedRequestError,
+)
+from blackbaud.testing.data import STUDENT
+from blackbaud.testing.recording import read_recording, scrub_body, scrub_url
+
+
+def _sync(school):
+    students = users.get_users_by_roles(school, [STUDENT]).full_json["value"]
+    levels = core.get_school_levels(school).json()["value"]
+    return students, levels
+
+
+@pytest.fixture
+def recording(api, make_client, tmp_path):
+    path = str(tmp_path / "sync.jsonl.gz")
+    transport = RecordingTransport(path)
+    with MockSKYAPI(api.data) as server:
+        client_kwargs = server.client_kwargs()
+        client = make_client(adapter=transport, **client_kwargs)
+        recorded = _sync(BaseSolutionClient(client, "school", "v1"))
+    transport.close()
+    return path, client_kwargs, recorded
+
+
+def test_replay_serves_what_was_recorded(make_client, recording):
+    path, client_kwargs, recorded = recording
+    client = make_client(adapter=ReplayTransport(path, speed=None), **client_kwargs)
+
+    assert _sync(BaseSolutionClient(client, "school", "v1")) == recorded
+
+
+def test_recording_keeps_every_exchange_in_order(recording):
+    path, _, _ = recording
+
+    exchanges = list(read_recording(path))
+
+    # Three pages of students, then the levels.
+    assert [exchange["url"].split("/v1/")[1][:5] for exchange in exchanges] == [
+        "users",
+        "users",
+        "users",
+        "level",
+    ]
+    assert all(exchange["status"] == 200 for exchange in exchanges)
+    assert all("Authorization" not in exchange["headers"] for exchange in exchanges)
+
+
+def test_replay_raises_for_unrecorded_requests(make_client, recording):
+    path, client_kwargs, _ = recording
+    client = make_client(adapter=ReplayTransport(path, speed=None), **client_kwargs)
+
+    with pytest.raises(UnrecordedRequestError):
+        BaseSolutionClient(client, "school", "v1")._make_request("GET", "roles")
+
+
+def test_secrets_are_redacted():
+    url = scrub_url("https://example.org/token?code=abc&state=xyz")
+    form = scrub_body(
+        "application/x-www-form-urlencoded",
+        b"grant_type=refresh_token&refresh_token=hunter2",
+    )
+    document = scrub_body("application/json", b'{"access_token": "hunter2", "a": 1}')
+
+    assert url == "https://example.org/token?code=REDACTED&state=xyz"
+    assert form == b"grant_type=refresh_token&refresh_token=REDACTED"
+    assert serialization.loads(document) == {"access_token": "REDACTED", "a": 1}
+
+def test_mock_only_binds_when_started():
+    api = MockSKYAPI()
+    with pytest.raises(RuntimeError):
+        api.url
+
+    with api:
+        assert api.url.startswith("http://127.0.0.1:")
+
+    with pytest.raises(RuntimeError):
+        api.client_kwargs()
@@ -0,0 +1,228 @@
+import pytest
+from requests_cache import DO_NOT_CACHE
+
+from blackbaud.client import (
+    BaseSolutionClient,
+    BlackbaudCollection,
+    BlackbaudList,
+    ListRow,
+    User,
+)
+from blackbaud.client.streaming import LIST_ROW_ITEMS
+from blackbaud.school.endpoints import core, users
+
+STUDENT = 14
+DIRECTORY = 2
+
+
+def test_list_results_yield_every_row(api, school):
+    lists = core.get_lists(school).json()["value"]
+    advanced_list = BlackbaudList.from_json(lists[0]).bind(school, page_size=50)
+    expected = api.data.lists[advanced_list.id]["rows"]
+
+    assert advanced_list.columns == []
+    rows = list(advanced_list.results)
+
+    assert len(rows) == len(expected)
+    assert all(isinstance(row, ListRow) for row in rows)
+    assert advanced_list.columns == [name for name, _ in expected[0]]
+    assert rows[0].to_dict() == dict(expected[0])
+
+
+def test_list_columns_are_set_by_the_first_row(school):
+    advanced_list = BlackbaudList(id=2, name="Directory").bind(school)
+
+    first = next(advanced_list.results)
+
+    assert advanced_list.columns == list(first)
+    assert advanced_list.to_dict() == {"id": 2, "name": "Directory"}
+
+
+class _RequestCount:
+    def __init__(self, api):
+        self.handle = api.handle
+        self.count = 0
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        self.count += 1
+        return self.handle(method, url, headers, body)
+
+
+@pytest.fixture
+def requests_made(api):
+    return _RequestCount(api)
+
+
+@pytest.fixture
+def uncached_school(make_client):
+    # Pages fetched again must come from the API, not the HTTP cache.
+    return BaseSolutionClient(
+        make_client(cache_default_expiry=DO_NOT_CACHE), "school", "v1"
+    )
+
+
+def _students(school, **kwargs):
+    return BlackbaudCollection(
+        users.get_users_by_roles, school, [STUDENT], item_type=User, **kwargs
+    )
+
+
+def _student_ids(api):
+    return [user["id"] for user in api.data.users_with_roles([STUDENT])]
+
+
+def _directory(school, page_size=100):
+    return BlackbaudCollection(
+        core.get_list_page,
+        school,
+        DIRECTORY,
+        paging="page",
+        item_type=ListRow,
+        item_path=LIST_ROW_ITEMS,
+        page_size=page_size,
+    )
+
+
+def test_collection_fetches_pages_only_when_needed(api, school, requests_made):
+    students = _students(school)
+    assert requests_made.count == 0
+
+    assert students[0].id == _student_ids(api)[0]
+    assert requests_made.count == 1
+    assert students[99].id == _student_ids(api)[99]
+    assert requests_made.count == 1
+    # next_link paging has to go through page 1 to reach page 2.
+    assert students[250].id == _student_ids(api)[250]
+    assert requests_made.count == 3
+
+
+def test_collection_iterates_a_page_at_a_time(api, school, requests_made):
+    students = iter(_students(school))
+
+    assert next(students).id == _student_ids(api)[0]
+    assert requests_made.count == 1
+    assert [student.id for student in students] == _student_ids(api)[1:]
+    assert requests_made.count == 3
+
+
+def test_collection_evicts_least_recently_used_pages(
+    api, uncached_school, requests_made
+):
+    students = _students(uncached_school, cache_size=2)
+    expected = _student_ids(api)
+
+    assert [students[index].id for index in (0, 100, 200)] == expected[::100]
+    assert requests_made.count == 3
+    # Page 0 was evicted to make room for page 2; page 1 is still in memory, and
+    # page 0 is fetched again directly from its next_link rather than from the start.
+    assert students[150].id == expected[150]
+    assert requests_made.count == 3
+    assert students[0].id == expected[0]
+    assert requests_made.count == 4
+    assert students[200].id == expected[200]
+    assert requests_made.count == 5
+
+
+def test_collection_length_fetches_the_remaining_pages(api, school, requests_made):
+    students = _students(school)
+
+    assert students.count is None
+    assert len(students) == len(_student_ids(api))
+    assert students.count == len(students)
+    assert requests_made.count == 3
+    len(students)
+    assert requests_made.count == 3
+
+
+def test_collection_length_from_the_total_count(api, school, requests_made):
+    def detailed(**kwargs):
+        return BlackbaudCollection(
+            users.get_users_by_roles_detailed,
+            school,
+            [STUDENT],
+            paging="marker",
+            item_type=User,
+            **kwargs,
+        )
+
+    students = detailed(count_is_total=True)
+    students[0]
+    assert students.count == len(_student_ids(api))
+    assert len(students) == len(_student_ids(api))
+    assert requests_made.count == 1
+
+    # Without it, the end is only found by fetching the empty page after it.
+    students = detailed(count_is_total=False, force_refresh=True)
+    assert len(students) == len(_student_ids(api))
+    assert requests_made.count == 3
+
+
+def test_collection_negative_indexes_and_slices(api, school):
+    students = _students(school)
+    expected = _student_ids(api)
+
+    assert students[-1].id == expected[-1]
+    assert students[-len(expected)].id == expected[0]
+    with pytest.raises(IndexError):
+        students[-len(expected) - 1]
+    with pytest.raises(IndexError):
+        students[len(expected)]
+    assert [student.id for student in students[-5:]] == expected[-5:]
+    assert [student.id for student in students[::-50]] == expected[::-50]
+    assert students.get_page(-1)[-1].id == expected[-1]
+
+
+def test_collection_slices_across_pages(api, school, requests_made):
+    students = _students(school)
+    expected = _student_ids(api)
+
+    assert [student.id for student in students[90:210:3]] == expected[90:210:3]
+    assert requests_made.count == 3
+    assert [student.id for student in students[250:1000]] == expected[250:]
+    assert students[400:] == []
+    assert requests_made.count == 3
+
+
+def test_collection_marker_paging(api, school, requests_made):
+    students = BlackbaudCollection(
+        users.get_users_by_roles_detailed,
+        school,
+        [STUDENT],
+        paging="marker",
+        item_type=User,
+    )
+    expected = _student_ids(api)
+
+    assert [student.id for student in students] == expected
+    with pytest.raises(IndexError):
+        students.get_page(1)
+    assert requests_made.count == 2
+
+
+def test_collection_page_number_paging(api, school, requests_made):
+    directory = _directory(school)
+    expected = api.data.lists[DIRECTORY]["rows"]
+
+    # Any page can be requested directly.
+    assert directory[450].to_dict() == dict(expected[450])
+    assert requests_made.count == 1
+    # The last page is not full, so it gives the length away.
+    assert len(directory) == len(expected)
+    assert requests_made.count == 1
+    assert [row.to_dict() for row in directory[95:105]] == [
+        dict(row) for row in expected[95:105]
+    ]
+    assert requests_made.count == 3
+
+
+def test_collection_page_number_paging_ending_on_a_full_page(api, school):
+    expected = api.data.lists[DIRECTORY]["rows"]
+    page_size = len(expected) // 5
+    directory = _directory(school, page_size=page_size)
+
+    assert len(expected) % page_size == 0
+    assert len(directory) == len(expected)
+    assert len(list(directory)) == len(expected)
+    with pytest.raises(IndexError):
+        directory.get_page(5)
@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+from blackbaud.client import serialization
+
+
+class Color(Enum):
+    RED = "red"
+
+
+VALUE = {
+    "balance": Decimal("1234.10000000000000001"),
+    "born": date(2010, 5, 1),
+    "seen": datetime(2024, 9, 3, 8, 30),
+    "color": Color.RED,
+    1: "one",
+    "name": "Zoë",
+}
+
+
+def test_decimals_keep_their_exact_value():
+    encoded = serialization.loads(serialization.dumps(VALUE))
+    assert Decimal(encoded["balance"]) == VALUE["balance"]
+
+
+def test_orjson_and_stdlib_agree(monkeypatch):
+    if serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    fast = serialization.loads(serialization.dumps(VALUE))
+    monkeypatch.setattr(serialization, "orjson", None)
+    standard = json.loads(serialization.dumps(VALUE))
+
+    assert fast == standard
+    assert standard["1"] == "one"
+    assert standard["born"] == "2010-05-01"
+    assert standard["seen"] == "2024-09-03T08:30:00"
+    assert standard["color"] == "red"
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        serialization.dumps({"value": object()})
@@ -0,0 +1,116 @@
+import queue
+import threading
+
+import pytest
+from limits import parse_many
+
+from blackbaud.authentication.managers import FileCredentialManager
+from blackbaud.jobs import (
+    ShardedRunner,
+    WorkerClientFactory,
+    shard_by_user_hash,
+    sharding,
+)
+
+PROCESSES = 2
+
+
+def _no_client():
+    return None
+
+
+def _numbers(client, shard):
+    yield from shard
+
+
+def _make_factory(token_path="token.json", **kwargs) -> WorkerClientFactory:
+    return WorkerClientFactory(
+        "client id",
+        "client secret",
+        "subscription key",
+        "http://localhost/callback",
+        token_path,
+        **kwargs,
+    )
+
+
+def test_run_writes_every_record():
+    written = []
+    runner = ShardedRunner(_no_client, processes=PROCESSES, batch_size=10)
+
+    counts = runner.run(_numbers, shard_by_user_hash(range(100), 4), written.extend)
+
+    assert sorted(written) == list(range(100))
+    assert counts == {0: 25, 1: 25, 2: 25, 3: 25}
+
+
+def test_failing_writer_stops_the_workers():
+    runner = ShardedRunner(
+        _no_client, processes=PROCESSES, batch_size=1, max_queued_batches=2
+    )
+    shards = [range(1000) for _ in range(4)]
+    outcome = []
+
+    def writer(batch):
+        raise RuntimeError("disk full")
+
+    def run():
+        try:
+            runner.run(_numbers, shards, writer)
+        except RuntimeError as error:
+            outcome.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=60)
+
+    assert not thread.is_alive(), "the runner hung after its writer raised"
+    assert [str(error) for error in outcome] == ["disk full"]
+
+
+def test_rate_limits_too_small_to_split_are_rejected():
+    with pytest.raises(ValueError):
+        _make_factory(processes=8, rate_limits=parse_many("5/second"))
+
+
+def test_rate_limits_are_split_between_processes(tmp_path):
+    token_path = str(tmp_path / "token.json")
+    FileCredentialManager(token_path).update_token(
+        {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+    )
+    factory = _make_factory(
+        token_path,
+        processes=4,
+        rate_limits=parse_many("10/second"),
+        cache_backend="memory",
+    )
+
+    limits = factory()._client._rate_limits
+
+    assert [limit.amount for limit in limits] == [2]
+
+
+def test_runner_takes_processes_from_the_factory():
+    factory = _make_factory(processes=3, rate_limits=parse_many("10/second"))
+    assert ShardedRunner(factory)._processes == 3
+    with pytest.raises(ValueError):
+        ShardedRunner(factory, processes=4)
+
+
+class _CountingEvent:
+    def __init__(self):
+        self.checks = 0
+
+    def is_set(self):
+        self.checks += 1
+        return False
+
+
+def test_cancellation_is_checked_once_per_batch():
+    results = queue.Queue()
+    cancelled = _CountingEvent()
+
+    sharding._run_shard(_numbers, 0, range(100), results, 10, cancelled)
+
+    assert results.qsize() == 11
+    assert cancelled.checks == 11
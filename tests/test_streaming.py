@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from blackbaud.client.streaming import (
+    LIST_ROW_ITEMS,
+    iter_json_items,
+    stream_request,
+)
+
+STUDENT = 14
+
+ITEMS = [
+    {"id": 1, "name": "Zoë \"Zee\" O'Brien", "path": "C:\\students\\zoe"},
+    {"id": 2, "name": "\u00e9l\u00e8ve \u2603 \U0001f600", "gpa": 3.75e0},
+    {"id": 3, "note": "line\nbreak\ttab", "scores": [1, -2.5, 1.5e3], "ok": True},
+    {"id": 4, "nested": {"value": [{}, []]}, "empty": "", "missing": None},
+    12345678901234567890,
+    "just a string",
+]
+
+
+def _chunks(document: bytes, size: int):
+    return [document[start : start + size] for start in range(0, len(document), size)]
+
+
+def _document(items, ensure_ascii=False) -> bytes:
+    payload = {"count": len(items), "next_link": None, "value": items, "after": [1]}
+    return json.dumps(payload, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, 1 << 20])
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_items_split_across_chunks(size, ensure_ascii):
+    # Every chunk size cuts through keys, strings, escapes, numbers and, without
+    # ensure_ascii, multibyte characters somewhere.
+    document = _document(ITEMS, ensure_ascii)
+
+    assert list(iter_json_items(_chunks(document, size))) == ITEMS
+
+
+def test_numbers_split_across_chunks():
+    chunks = [b'{"value": [1', b"2.", b"5e", b"3, -", b"7]}"]
+
+    assert list(iter_json_items(chunks)) == [12.5e3, -7]
+
+
+def test_items_are_yielded_as_they_arrive():
+    received = []
+
+    def chunks():
+        received.append("first")
+        yield b'{"value": [{"id": 1}, '
+        received.append("second")
+        yield b'{"id": 2}]}'
+
+    items = iter_json_items(chunks())
+
+    assert next(items) == {"id": 1}
+    assert received == ["first"]
+    assert list(items) == [{"id": 2}]
+
+
+def test_nested_item_path():
+    document = json.dumps(
+        {"count": 2, "page": 1, "results": {"total": 2, "rows": [[1], [2]]}}
+    ).encode()
+
+    assert list(iter_json_items(_chunks(document, 3), LIST_ROW_ITEMS)) == [[1], [2]]
+
+
+@pytest.mark.parametrize(
+    "document",
+    [b"{}", b'{"count": 0}', b'{"value": null}', b'{"value": []}', b"  {  } "],
+)
+def test_documents_without_items(document):
+    assert list(iter_json_items(_chunks(document, 2))) == []
+
+
+def test_empty_path_reads_a_top_level_array():
+    assert list(iter_json_items([b"[1, ", b'"two"]'], ())) == [1, "two"]
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        b"",
+        b'{"value": [{"id": 1}',
+        b'{"value": [{"id": 1}, {"id"',
+        b'{"value": [{"id": 1}, {"name": "unterminated',
+        b'{"value": [{"name": "escape \\',
+        b'{"count": 1, "val',
+    ],
+)
+def test_truncated_documents_raise(document):
+    with pytest.raises(ValueError):
+        list(iter_json_items(_chunks(document, 4)))
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        b'["value"]',
+        b'{"value" [1]}',
+        b'{"value": [1 2]}',
+        b'{"value": [1,, 2]}',
+        b'{"value": [{"id": 1}}',
+        b'{"count": 1 "value": [1]}',
+        b'{"value": [tru]}',
+    ],
+)
+def test_malformed_documents_raise(document):
+    with pytest.raises(ValueError):
+        list(iter_json_items(_chunks(document, 3)))
+
+
+def test_invalid_utf8_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"value": ["\xff"]}']))
+
+
+def test_stream_request(api, school):
+    students = list(
+        stream_request(school, "users/extended", params={"base_role_ids": STUDENT})
+    )
+
+    assert [student["id"] for student in students] == [
+        user["id"] for user in api.data.users_with_roles([STUDENT])
+    ]
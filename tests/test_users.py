@@ -0,0 +1,124 @@
+from datetime import date
+
+import pytest
+
+from blackbaud.client import BaseSolutionClient, serialization
+from blackbaud.school.endpoints import users
+from blackbaud.testing import MockSKYAPI, MockTransport, SchoolData
+
+STUDENT = 14
+
+
+def test_stream_users_by_roles_detailed_accepts_an_iterator(make_client):
+    # More students than fit on one page of users/extended.
+    api = MockSKYAPI(SchoolData(students=1500, teachers=10))
+    school = BaseSolutionClient(make_client(adapter=MockTransport(api)), "school", "v1")
+
+    streamed = list(users.stream_users_by_roles_detailed(school, iter([STUDENT])))
+
+    assert len(streamed) == 1500
+    assert all(user["id"] in api.data.users for user in streamed)
+    assert len({user["id"] for user in streamed}) == 1500
+
+
+class _UserUpdates:
+    """
+    Accepts PATCH users on top of the mock, applying the update to its school.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.handle = api.handle
+        self.updates = []
+        api.handle = self
+
+    def __call__(self, method, url, headers, body):
+        if method != "PATCH":
+            return self.handle(method, url, headers, body)
+        update = serialization.loads(body)
+        self.updates.append(update)
+        self.api.data.users[update["id"]].update(update)
+        return 200, {}, None
+
+
+def test_diff_user_returns_only_changed_fields():
+    last_known = {"first_name": "Ava", "birth_date": "2010-05-01T00:00:00"}
+
+    changed = users.diff_user(
+        last_known, first_name="Ava", last_name="Roy", birth_date=date(2010, 5, 1)
+    )
+
+    assert changed == {"last_name": "Roy"}
+
+
+def test_diff_user_rejects_unknown_fields():
+    with pytest.raises(TypeError):
+        users.diff_user({}, nickname="Avi")
+
+
+def test_update_user_if_changed_skips_unchanged_users(api, school):
+    updates = _UserUpdates(api)
+    student = api.data.students[0]
+
+    response = users.update_user_if_changed(
+        school, student["id"], first_name=student["first_name"]
+    )
+
+    assert response is None
+    assert updates.updates == []
+
+
+def test_update_user_if_changed_sees_changes_made_elsewhere(api, school):
+    updates = _UserUpdates(api)
+    student = api.data.students[0]
+    # Cached as it is now...
+    users.get_user_by_id(school, student["id"])
+    original = student["email"]
+    # ...then changed in Blackbaud.
+    student["email"] = "changed@example.org"
+
+    response = users.update_user_if_changed(school, student["id"], email=original)
+
+    assert response.ok
+    assert updates.updates == [{"id": student["id"], "email": original}]
+
+
+class _TimeoutLog(MockTransport):
+    """
+    Records the method and timeout of every request sent.
+    """
+
+    def __init__(self, api):
+        super().__init__(api)
+        self.sent = []
+
+    def send(self, request, *args, **kwargs):
+        self.sent.append((request.method, kwargs.get("timeout")))
+        return super().send(request, *args, **kwargs)
+
+
+def test_update_user_if_changed_passes_request_kwargs_on(api, make_client):
+    _UserUpdates(api)
+    transport = _TimeoutLog(api)
+    school = BaseSolutionClient(make_client(adapter=transport), "school", "v1")
+    student = api.data.students[0]
+
+    response = users.update_user_if_changed(
+        school, student["id"], email="new@example.org", timeout=7
+    )
+
+    assert response.ok
+    assert transport.sent == [("GET", 7), ("PATCH", 7)]
+    assert student["email"] == "new@example.org"
+
+
+def test_update_user_drops_the_cached_user(api, school):
+    _UserUpdates(api)
+    student = api.data.students[0]
+    users.get_user_by_id(school, student["id"])
+
+    users.update_user(school, student["id"], email="new@example.org")
+    response = users.get_user_by_id(school, student["id"])
+
+    assert not response.from_cache
+    assert response.json()["email"] == "new@example.org"